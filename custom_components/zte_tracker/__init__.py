@@ -2,12 +2,22 @@
 
 from __future__ import annotations
 
+import asyncio
+from datetime import timedelta
+from fnmatch import fnmatch
 import logging
 import re
+import time
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_MODEL, CONF_PASSWORD, CONF_USERNAME
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr
@@ -16,18 +26,46 @@ from homeassistant.helpers.typing import ConfigType
 import voluptuous as vol
 
 from .const import (
+    CONF_ASYNC_TRANSPORT,
+    CONF_CACHE_INACTIVE_TTL,
+    CONF_CACHE_MAX_DEVICES,
+    CONF_CAPABILITIES,
+    CONF_CONNECTION_POOL_SIZE,
+    CONF_ISOLATE_COOKIES,
+    CONF_MAX_CONCURRENT_POLLS,
+    CONF_MAX_CONCURRENT_REQUESTS,
     CONF_MESH_TOPOLOGY,
+    CONF_PRESENCE_LISTENER,
+    CONF_PREWARM_LEAD,
     CONF_QUERY_ROUTER_DETAILS,
     CONF_QUERY_WAN_STATUS,
     CONF_SESSION_REUSE,
+    DEFAULT_ASYNC_TRANSPORT,
+    DEFAULT_CACHE_INACTIVE_TTL,
+    DEFAULT_CACHE_MAX_DEVICES,
+    DEFAULT_CONNECTION_POOL_SIZE,
+    DEFAULT_ISOLATE_COOKIES,
+    DEFAULT_MAX_CONCURRENT_POLLS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
     DEFAULT_MESH_TOPOLOGY,
+    DEFAULT_PRESENCE_LISTENER,
+    DEFAULT_PREWARM_LEAD,
     DEFAULT_QUERY_ROUTER_DETAILS,
     DEFAULT_QUERY_WAN_STATUS,
+    DEFAULT_REBOOT_CONCURRENCY,
+    DEFAULT_REBOOT_STAGGER,
     DEFAULT_SESSION_REUSE,
     DOMAIN,
+    EVENT_REBOOT_RESULT,
     PLATFORMS,
 )
-from .coordinator import ZteDataCoordinator
+from .coordinator import (
+    ZteDataCoordinator,
+    async_reboot_routers,
+    device_cache_store,
+)
+from .presence import async_get_presence_listener
+from .scheduler import async_get_scheduler
 from .zteclient.zte_client import zteClient
 
 _LOGGER = logging.getLogger(__name__)
@@ -87,9 +125,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _LOGGER.debug("Error migrating config entry options: %s", ex)
 
     coordinator = ZteDataCoordinator(hass, entry)
+    coordinator.async_start_cache_load()
+    entry.async_on_unload(async_get_scheduler(hass).register(coordinator))
+    if coordinator.presence_listener:
+        entry.async_on_unload(
+            async_get_presence_listener(hass).async_subscribe(
+                coordinator.async_handle_presence
+            )
+        )
 
     # Fetch initial data
     await coordinator.async_config_entry_first_refresh()
+    if CONF_CAPABILITIES not in entry.data:
+        # Entries set up before the capability probe existed: probe once
+        # now rather than waiting for a firmware change.
+        coordinator.async_schedule_probe()
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
@@ -101,13 +151,22 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     setup_services(hass)
 
     # Register an update listener to apply option changes at runtime
+    applied_settings = _entry_settings(entry)
+
     async def _async_options_updated(
         hass: HomeAssistant, updated_entry: ConfigEntry
     ) -> None:
         """Handle updated options for an entry."""
+        nonlocal applied_settings
         coordinator = hass.data.get(DOMAIN, {}).get(updated_entry.entry_id)
         if not coordinator:
             return
+        settings = _entry_settings(updated_entry)
+        if settings == applied_settings:
+            # Only the stored probe results changed, which the coordinator
+            # applied when it stored them.
+            return
+        applied_settings = settings
 
         # Resolve values with options overriding data
         query_wan = updated_entry.options.get(
@@ -127,13 +186,45 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             )
         )
 
-        # session_reuse is wired into the coordinator at __init__ time (it
-        # selects between two distinct fetch code paths). Toggling it at
-        # runtime requires a full reload so the new path is in effect.
-        if bool(getattr(coordinator, "_reuse_session", False)) != new_session_reuse:
+        new_async_transport = bool(
+            updated_entry.options.get(
+                CONF_ASYNC_TRANSPORT,
+                updated_entry.data.get(CONF_ASYNC_TRANSPORT, DEFAULT_ASYNC_TRANSPORT),
+            )
+        )
+        new_presence_listener = bool(
+            updated_entry.options.get(
+                CONF_PRESENCE_LISTENER, DEFAULT_PRESENCE_LISTENER
+            )
+        )
+        new_pool_size = int(
+            updated_entry.options.get(
+                CONF_CONNECTION_POOL_SIZE, DEFAULT_CONNECTION_POOL_SIZE
+            )
+        )
+
+        # session_reuse and async_transport are wired into the coordinator at
+        # __init__ time (they select the fetch code path and client class),
+        # the connection pool is sized when the client is created, and the
+        # presence listener is subscribed at setup. Changing them at runtime
+        # requires a full reload so the new setup is in effect.
+        client = getattr(coordinator, "client", None)
+        client_pool_size = getattr(client, "pool_size", None)
+        if (
+            bool(getattr(coordinator, "_reuse_session", False)) != new_session_reuse
+            or bool(getattr(coordinator, "_async_transport", False))
+            != new_async_transport
+            or bool(getattr(coordinator, "presence_listener", False))
+            != new_presence_listener
+            or (client_pool_size is not None and client_pool_size != new_pool_size)
+        ):
             _LOGGER.info(
-                "session_reuse changed to %s; scheduling reload of entry %s",
+                "session_reuse/async_transport/presence_listener/connection_pool_size "
+                "changed to %s/%s/%s/%s; scheduling reload of entry %s",
                 new_session_reuse,
+                new_async_transport,
+                new_presence_listener,
+                new_pool_size,
                 updated_entry.entry_id,
             )
             # Use HA's scheduler so the reload runs outside this update
@@ -152,11 +243,44 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
         coordinator._mesh_topology = new_mesh_topology
 
+        coordinator.set_polling_controller(updated_entry)
+
+        # Cache bounds apply from the next poll
+        coordinator._cache_max_devices = int(
+            updated_entry.options.get(CONF_CACHE_MAX_DEVICES, DEFAULT_CACHE_MAX_DEVICES)
+        )
+        coordinator._cache_inactive_ttl = timedelta(
+            hours=updated_entry.options.get(
+                CONF_CACHE_INACTIVE_TTL, DEFAULT_CACHE_INACTIVE_TTL
+            )
+        )
+        # Takes effect when the next pre-warm is scheduled
+        coordinator.prewarm_lead = int(
+            updated_entry.options.get(CONF_PREWARM_LEAD, DEFAULT_PREWARM_LEAD)
+        )
+        # The scheduler reads it when a fetch asks for a slot
+        coordinator.max_concurrent_polls = int(
+            updated_entry.options.get(
+                CONF_MAX_CONCURRENT_POLLS, DEFAULT_MAX_CONCURRENT_POLLS
+            )
+        )
+
         # Apply to existing client
         client = getattr(coordinator, "client", None)
         if client:
             client.query_wan_status = bool(query_wan)
             client.query_router_details = bool(query_router)
+            # Applies from the next login
+            client.isolate_cookies = bool(
+                updated_entry.options.get(CONF_ISOLATE_COOKIES, DEFAULT_ISOLATE_COOKIES)
+            )
+            planner = getattr(client, "planner", None)
+            if planner is not None:
+                planner.max_concurrency = int(
+                    updated_entry.options.get(
+                        CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+                    )
+                )
             if client.mesh_topology != new_mesh_topology:
                 # mesh_topology change requires session re-init (page load +
                 # headers differ). Force logout so next poll creates a fresh
@@ -164,7 +288,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 client.mesh_topology = new_mesh_topology
                 try:
                     async with coordinator._client_lock:
-                        await hass.async_add_executor_job(client.logout)
+                        await coordinator._async_client_call(client.logout)
                         coordinator._last_login_at = None
                 except Exception:
                     pass
@@ -186,35 +310,67 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+def _entry_settings(entry: ConfigEntry) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Return the options and data of an entry, without the probe results."""
+    data = {key: value for key, value in entry.data.items() if key != CONF_CAPABILITIES}
+    return dict(entry.options), data
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         coordinator = hass.data[DOMAIN].pop(entry.entry_id, None)
         # Best-effort: cleanly close the persistent router session so we don't
-        # leave a stale logged-in session on the device. Wrapped in timeout
+        # leave a stale logged-in session on the device, then close the
+        # pooled connections. Wrapped in timeout
         # and broad exception catch so a hung/dead router can never block or
         # fail HA unload/restart.
         if coordinator is not None and getattr(coordinator, "client", None):
-            import asyncio
 
             async def _safe_logout() -> None:
-                try:
-                    async with coordinator._client_lock:
+                async with coordinator._client_lock:
+                    try:
                         await asyncio.wait_for(
-                            hass.async_add_executor_job(coordinator.client.logout),
+                            coordinator._async_client_call(coordinator.client.logout),
                             timeout=3,
                         )
-                except Exception as ex:  # noqa: BLE001
-                    _LOGGER.debug("Ignoring logout error during unload: %s", ex)
+                    except Exception as ex:  # noqa: BLE001
+                        _LOGGER.debug("Ignoring logout error during unload: %s", ex)
+                    finally:
+                        # Close the pooled connections even if logout failed
+                        try:
+                            await coordinator._async_client_call(
+                                coordinator.client.close
+                            )
+                        except Exception as ex:  # noqa: BLE001
+                            _LOGGER.debug("Ignoring close error during unload: %s", ex)
 
             await _safe_logout()
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the persisted device cache of a deleted config entry."""
+    await device_cache_store(hass, entry.entry_id).async_remove()
+
+
 REBOOT_SERVICE_SCHEMA = vol.Schema(
     {
-        vol.Optional("host"): vol.Coerce(str),
+        # Host names, addresses or shell-style patterns (192.168.1.*)
+        vol.Optional("host"): vol.All(cv.ensure_list, [vol.Coerce(str)]),
+        vol.Optional(
+            "max_concurrency", default=DEFAULT_REBOOT_CONCURRENCY
+        ): vol.All(vol.Coerce(int), vol.Range(min=1, max=32)),
+        vol.Optional("stagger", default=DEFAULT_REBOOT_STAGGER): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=300)
+        ),
+    }
+)
+
+PROBE_SERVICE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("host"): vol.All(cv.ensure_list, [vol.Coerce(str)]),
     }
 )
 
@@ -227,32 +383,96 @@ REMOVE_TRACKED_ENTITY_SCHEMA = vol.Schema(
 REMOVE_UNIDENTIFIED_SERVICE_SCHEMA = vol.Schema({})
 
 
-async def async_reboot_service(call: ServiceCall):
-    """Reboot router(s) for the specified host, or all if not specified."""
-    hass = call.hass
-    host = call.data.get("host")
-    rebooted = []
-
+def _matching_coordinators(
+    hass: HomeAssistant, patterns: list[str] | None
+) -> list[ZteDataCoordinator]:
+    """Return the coordinators whose host matches patterns, or all of them."""
+    targets = []
     for entry_id, coordinator in hass.data[DOMAIN].items():
         if entry_id == "yaml_config":
             continue
         client = getattr(coordinator, "client", None)
         if not client:
             continue
-        if host:
-            if getattr(client, "host", None) == host:
-                # Use coordinator's async method to avoid blocking the event loop
-                if await coordinator.async_reboot_router():
-                    rebooted.append(host)
-        else:
-            if await coordinator.async_reboot_router():
-                rebooted.append(client.host)
+        host = getattr(client, "host", None) or ""
+        if not patterns or any(fnmatch(host, pattern) for pattern in patterns):
+            targets.append(coordinator)
+
+    if not targets:
+        raise HomeAssistantError(f"No routers match host: {patterns}")
+    return targets
+
+
+async def async_reboot_service(call: ServiceCall) -> ServiceResponse:
+    """Reboot the routers matching host, or all if not specified.
+
+    Routers are rebooted in parallel. An event is fired as each reboot
+    completes, and the per-host results are returned as the response.
+    """
+    hass = call.hass
+    patterns = call.data.get("host")
+    targets = _matching_coordinators(hass, patterns)
+
+    started = time.monotonic()
+    results: dict[str, dict[str, Any]] = {}
+
+    def _on_result(coordinator: ZteDataCoordinator, success: bool) -> None:
+        host = coordinator.client.host
+        results[host] = {
+            "success": success,
+            "message": coordinator.client.statusmsg,
+            "elapsed": round(time.monotonic() - started, 1),
+        }
+        hass.bus.async_fire(
+            EVENT_REBOOT_RESULT,
+            {
+                "host": host,
+                "entry_id": coordinator.entry.entry_id,
+                **results[host],
+                "completed": len(results),
+                "total": len(targets),
+            },
+        )
+
+    outcome = await async_reboot_routers(
+        targets,
+        max_concurrency=call.data.get("max_concurrency", DEFAULT_REBOOT_CONCURRENCY),
+        stagger=call.data.get("stagger", DEFAULT_REBOOT_STAGGER),
+        on_result=_on_result,
+    )
+    rebooted = [host for host, success in outcome.items() if success]
 
     if rebooted:
         _LOGGER.info("Rebooted routers: %s", ", ".join(rebooted))
     else:
-        _LOGGER.warning("No routers rebooted. Host: %s", host)
-        raise HomeAssistantError(f"No routers rebooted for host: {host}")
+        _LOGGER.warning("No routers rebooted. Host: %s", patterns)
+        if not call.return_response:
+            raise HomeAssistantError(f"No routers rebooted for host: {patterns}")
+    if call.return_response:
+        return {"results": results}
+    return None
+
+
+async def async_probe_service(call: ServiceCall) -> ServiceResponse:
+    """Probe the endpoints of the routers matching host, or all of them.
+
+    For after a firmware update the integration didn't notice, or a probe
+    that hit a router in trouble. The results are returned as the response.
+    """
+    patterns = call.data.get("host")
+    targets = _matching_coordinators(call.hass, patterns)
+    probed = await asyncio.gather(
+        *(coordinator.async_probe_capabilities() for coordinator in targets)
+    )
+    results = {
+        coordinator.client.host: capabilities
+        for coordinator, capabilities in zip(targets, probed)
+    }
+    if not any(probed) and not call.return_response:
+        raise HomeAssistantError(f"No routers probed for host: {patterns}")
+    if call.return_response:
+        return {"results": results}
+    return None
 
 
 async def async_remove_tracked_entity(call: ServiceCall):
@@ -343,6 +563,14 @@ def setup_services(hass):
         "reboot",
         async_reboot_service,
         schema=REBOOT_SERVICE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "probe_capabilities",
+        async_probe_service,
+        schema=PROBE_SERVICE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
     )
     hass.services.async_register(
         DOMAIN,
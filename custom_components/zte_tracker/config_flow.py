@@ -15,19 +15,46 @@ import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 
 from .const import (
+    CONF_ASYNC_TRANSPORT,
+    CONF_CACHE_INACTIVE_TTL,
+    CONF_CACHE_MAX_DEVICES,
+    CONF_CAPABILITIES,
+    CONF_CONNECTION_POOL_SIZE,
+    CONF_ISOLATE_COOKIES,
+    CONF_MAX_CONCURRENT_POLLS,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_POLL_INTERVAL,
     CONF_MESH_TOPOLOGY,
+    CONF_MIN_POLL_INTERVAL,
+    CONF_POLL_CONTROLLER,
+    CONF_PRESENCE_LISTENER,
+    CONF_PREWARM_LEAD,
     CONF_QUERY_ROUTER_DETAILS,
     CONF_QUERY_WAN_STATUS,
     CONF_SESSION_REUSE,
+    DEFAULT_ASYNC_TRANSPORT,
+    DEFAULT_CACHE_INACTIVE_TTL,
+    DEFAULT_CACHE_MAX_DEVICES,
+    DEFAULT_CONNECTION_POOL_SIZE,
     DEFAULT_HOST,
+    DEFAULT_ISOLATE_COOKIES,
+    DEFAULT_MAX_CONCURRENT_POLLS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_POLL_INTERVAL,
     DEFAULT_MESH_TOPOLOGY,
+    DEFAULT_MIN_POLL_INTERVAL,
     DEFAULT_PASSWORD,
+    DEFAULT_POLL_CONTROLLER,
+    DEFAULT_PRESENCE_LISTENER,
+    DEFAULT_PREWARM_LEAD,
     DEFAULT_QUERY_ROUTER_DETAILS,
     DEFAULT_QUERY_WAN_STATUS,
     DEFAULT_SESSION_REUSE,
     DEFAULT_USERNAME,
     DOMAIN,
 )
+from .polling import POLL_CONTROLLERS
+from .zteclient.capabilities import probe_capabilities
 from .zteclient.zte_client import zteClient
 
 _LOGGER = logging.getLogger(__name__)
@@ -98,6 +125,14 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
 )
 
 
+class WrongModel(ConnectionError):
+    """The device lists failed and the router reports another known model."""
+
+    def __init__(self, detected: str) -> None:
+        super().__init__(f"Router reports model {detected}")
+        self.detected = detected
+
+
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input allows us to connect."""
     # Additional validation
@@ -121,12 +156,22 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
         query_router_details=query_router_details,
     )
 
+    capabilities: dict[str, Any] = {}
+
     # Test the connection in a separate thread to avoid blocking
     def test_connection():
         try:
             success = client.login()
             statusmsg = client.statusmsg or "Unknown error"
             if success:
+                # Find the endpoints this firmware serves first, so polls
+                # skip the ones that would fail and the device lists are
+                # found even when another model was selected.
+                try:
+                    capabilities.update(probe_capabilities(client))
+                    client.apply_capabilities(capabilities)
+                except Exception as ex:  # pylint: disable=broad-except
+                    _LOGGER.warning("Capability probe failed: %s", ex)
                 # Verify we can actually get data
                 devices = client.get_devices_response()
                 if devices is not None:
@@ -143,15 +188,23 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
                 client.logout()
             except Exception:
                 pass
+            client.close()
 
     # Run connection test in executor to avoid blocking
     result, statusmsg = await hass.async_add_executor_job(test_connection)
 
     if not result:
+        reported = capabilities.get("reported_model")
+        if reported and reported != model and reported in zteClient.get_models():
+            raise WrongModel(reported)
         raise ConnectionError(statusmsg)
 
     # Return info that you want to store in the config entry
-    return {"title": f"ZTE Router {model} ({host})", "statusmsg": statusmsg}
+    return {
+        "title": f"ZTE Router {model} ({host})",
+        "statusmsg": statusmsg,
+        "capabilities": capabilities or None,
+    }
 
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -164,6 +217,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     ) -> FlowResult:
         """Handle the initial step."""
         errors: dict[str, str] = {}
+        placeholders: dict[str, str] = {}
 
         if user_input is not None:
             # Validación personalizada antes de llamar a validate_input
@@ -182,6 +236,11 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             if not errors:
                 try:
                     info = await validate_input(self.hass, user_input)
+                except WrongModel as ex:
+                    errors[CONF_MODEL] = "wrong_model"
+                    placeholders["detected_model"] = ex.detected
+                    # Preselect the model the router reports
+                    user_input[CONF_MODEL] = ex.detected
                 except ConnectionError as ex:
                     errors["base"] = str(ex)
                     # Optionally, add statusmsg to errors for display in UI if supported
@@ -198,6 +257,8 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     self._abort_if_unique_id_configured()
                     # Optionally, add statusmsg to entry data for diagnostics
                     user_input["statusmsg"] = info.get("statusmsg", "")
+                    if info.get("capabilities"):
+                        user_input[CONF_CAPABILITIES] = info["capabilities"]
                     return self.async_create_entry(title=info["title"], data=user_input)
 
         defaults = user_input or {}
@@ -236,7 +297,10 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             }
         )
         return self.async_show_form(
-            step_id="user", data_schema=data_schema, errors=errors
+            step_id="user",
+            data_schema=data_schema,
+            errors=errors,
+            description_placeholders=placeholders,
         )
 
     @staticmethod
@@ -291,6 +355,45 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 CONF_MESH_TOPOLOGY, DEFAULT_MESH_TOPOLOGY
             ),
         )
+        current_async_transport = self._config_entry.options.get(
+            CONF_ASYNC_TRANSPORT,
+            self._config_entry.data.get(
+                CONF_ASYNC_TRANSPORT, DEFAULT_ASYNC_TRANSPORT
+            ),
+        )
+        current_max_concurrent = self._config_entry.options.get(
+            CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+        )
+        current_cache_max = self._config_entry.options.get(
+            CONF_CACHE_MAX_DEVICES, DEFAULT_CACHE_MAX_DEVICES
+        )
+        current_cache_ttl = self._config_entry.options.get(
+            CONF_CACHE_INACTIVE_TTL, DEFAULT_CACHE_INACTIVE_TTL
+        )
+        current_presence = self._config_entry.options.get(
+            CONF_PRESENCE_LISTENER, DEFAULT_PRESENCE_LISTENER
+        )
+        current_poll_controller = self._config_entry.options.get(
+            CONF_POLL_CONTROLLER, DEFAULT_POLL_CONTROLLER
+        )
+        current_min_poll = self._config_entry.options.get(
+            CONF_MIN_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL
+        )
+        current_max_poll = self._config_entry.options.get(
+            CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL
+        )
+        current_prewarm_lead = self._config_entry.options.get(
+            CONF_PREWARM_LEAD, DEFAULT_PREWARM_LEAD
+        )
+        current_max_polls = self._config_entry.options.get(
+            CONF_MAX_CONCURRENT_POLLS, DEFAULT_MAX_CONCURRENT_POLLS
+        )
+        current_pool_size = self._config_entry.options.get(
+            CONF_CONNECTION_POOL_SIZE, DEFAULT_CONNECTION_POOL_SIZE
+        )
+        current_isolate_cookies = self._config_entry.options.get(
+            CONF_ISOLATE_COOKIES, DEFAULT_ISOLATE_COOKIES
+        )
 
         if user_input is not None:
             new_host = user_input.get(CONF_HOST, current_host)
@@ -319,9 +422,10 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             if not errors:
                 # Only test the router when credentials/host actually changed
                 # so toggling the boolean options alone never hits the network.
+                info: dict[str, Any] = {}
                 if credentials_changed:
                     try:
-                        await validate_input(
+                        info = await validate_input(
                             self.hass,
                             {
                                 CONF_HOST: new_host,
@@ -363,6 +467,10 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                             CONF_USERNAME: new_username,
                             CONF_PASSWORD: new_password,
                         }
+                        # A new host may be another router: use its probe
+                        new_data.pop(CONF_CAPABILITIES, None)
+                        if info.get("capabilities"):
+                            new_data[CONF_CAPABILITIES] = info["capabilities"]
                         self.hass.config_entries.async_update_entry(
                             self._config_entry, data=new_data
                         )
@@ -395,6 +503,48 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                                 CONF_MESH_TOPOLOGY, current_mesh_topology
                             )
                         ),
+                        CONF_ASYNC_TRANSPORT: bool(
+                            user_input.get(
+                                CONF_ASYNC_TRANSPORT, current_async_transport
+                            )
+                        ),
+                        CONF_MAX_CONCURRENT_REQUESTS: int(
+                            user_input.get(
+                                CONF_MAX_CONCURRENT_REQUESTS, current_max_concurrent
+                            )
+                        ),
+                        CONF_CACHE_MAX_DEVICES: int(
+                            user_input.get(CONF_CACHE_MAX_DEVICES, current_cache_max)
+                        ),
+                        CONF_CACHE_INACTIVE_TTL: int(
+                            user_input.get(CONF_CACHE_INACTIVE_TTL, current_cache_ttl)
+                        ),
+                        CONF_PRESENCE_LISTENER: bool(
+                            user_input.get(CONF_PRESENCE_LISTENER, current_presence)
+                        ),
+                        CONF_POLL_CONTROLLER: user_input.get(
+                            CONF_POLL_CONTROLLER, current_poll_controller
+                        ),
+                        CONF_MIN_POLL_INTERVAL: int(
+                            user_input.get(CONF_MIN_POLL_INTERVAL, current_min_poll)
+                        ),
+                        CONF_MAX_POLL_INTERVAL: int(
+                            user_input.get(CONF_MAX_POLL_INTERVAL, current_max_poll)
+                        ),
+                        CONF_PREWARM_LEAD: int(
+                            user_input.get(CONF_PREWARM_LEAD, current_prewarm_lead)
+                        ),
+                        CONF_MAX_CONCURRENT_POLLS: int(
+                            user_input.get(CONF_MAX_CONCURRENT_POLLS, current_max_polls)
+                        ),
+                        CONF_CONNECTION_POOL_SIZE: int(
+                            user_input.get(CONF_CONNECTION_POOL_SIZE, current_pool_size)
+                        ),
+                        CONF_ISOLATE_COOKIES: bool(
+                            user_input.get(
+                                CONF_ISOLATE_COOKIES, current_isolate_cookies
+                            )
+                        ),
                     }
                     return self.async_create_entry(title="", data=options_payload)
 
@@ -413,6 +563,42 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             current_mesh_topology = bool(
                 user_input.get(CONF_MESH_TOPOLOGY, current_mesh_topology)
             )
+            current_async_transport = bool(
+                user_input.get(CONF_ASYNC_TRANSPORT, current_async_transport)
+            )
+            current_max_concurrent = int(
+                user_input.get(CONF_MAX_CONCURRENT_REQUESTS, current_max_concurrent)
+            )
+            current_cache_max = int(
+                user_input.get(CONF_CACHE_MAX_DEVICES, current_cache_max)
+            )
+            current_cache_ttl = int(
+                user_input.get(CONF_CACHE_INACTIVE_TTL, current_cache_ttl)
+            )
+            current_presence = bool(
+                user_input.get(CONF_PRESENCE_LISTENER, current_presence)
+            )
+            current_poll_controller = user_input.get(
+                CONF_POLL_CONTROLLER, current_poll_controller
+            )
+            current_min_poll = int(
+                user_input.get(CONF_MIN_POLL_INTERVAL, current_min_poll)
+            )
+            current_max_poll = int(
+                user_input.get(CONF_MAX_POLL_INTERVAL, current_max_poll)
+            )
+            current_prewarm_lead = int(
+                user_input.get(CONF_PREWARM_LEAD, current_prewarm_lead)
+            )
+            current_max_polls = int(
+                user_input.get(CONF_MAX_CONCURRENT_POLLS, current_max_polls)
+            )
+            current_pool_size = int(
+                user_input.get(CONF_CONNECTION_POOL_SIZE, current_pool_size)
+            )
+            current_isolate_cookies = bool(
+                user_input.get(CONF_ISOLATE_COOKIES, current_isolate_cookies)
+            )
 
         data_schema = vol.Schema(
             {
@@ -429,6 +615,42 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 vol.Required(
                     CONF_MESH_TOPOLOGY, default=current_mesh_topology
                 ): cv.boolean,
+                vol.Required(
+                    CONF_ASYNC_TRANSPORT, default=current_async_transport
+                ): cv.boolean,
+                vol.Required(
+                    CONF_MAX_CONCURRENT_REQUESTS, default=current_max_concurrent
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=5)),
+                vol.Required(
+                    CONF_CACHE_MAX_DEVICES, default=current_cache_max
+                ): vol.All(vol.Coerce(int), vol.Range(min=16, max=4096)),
+                vol.Required(
+                    CONF_CACHE_INACTIVE_TTL, default=current_cache_ttl
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=720)),
+                vol.Required(
+                    CONF_PRESENCE_LISTENER, default=current_presence
+                ): cv.boolean,
+                vol.Required(
+                    CONF_POLL_CONTROLLER, default=current_poll_controller
+                ): vol.In(list(POLL_CONTROLLERS)),
+                vol.Required(
+                    CONF_MIN_POLL_INTERVAL, default=current_min_poll
+                ): vol.All(vol.Coerce(int), vol.Range(min=10, max=600)),
+                vol.Required(
+                    CONF_MAX_POLL_INTERVAL, default=current_max_poll
+                ): vol.All(vol.Coerce(int), vol.Range(min=10, max=3600)),
+                vol.Required(
+                    CONF_PREWARM_LEAD, default=current_prewarm_lead
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=30)),
+                vol.Required(
+                    CONF_MAX_CONCURRENT_POLLS, default=current_max_polls
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
+                vol.Required(
+                    CONF_CONNECTION_POOL_SIZE, default=current_pool_size
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=8)),
+                vol.Required(
+                    CONF_ISOLATE_COOKIES, default=current_isolate_cookies
+                ): cv.boolean,
             }
         )
 
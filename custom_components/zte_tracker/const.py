@@ -66,3 +66,71 @@ DEFAULT_SESSION_REUSE = False
 # HTTPS) to the router. Only effective on models with topo_data_tag config.
 CONF_MESH_TOPOLOGY = "mesh_topology"
 DEFAULT_MESH_TOPOLOGY = False
+
+# Opt-in flag: talk to the router with the aiohttp-based AsyncZteClient on the
+# event loop instead of running the blocking requests client in the executor.
+# Frees one executor thread per router per poll on multi-router installs.
+CONF_ASYNC_TRANSPORT = "async_transport"
+DEFAULT_ASYNC_TRANSPORT = False
+
+# Upper bound on endpoint chains (LAN, WLAN, WAN, details, topology) the async
+# transport runs concurrently within one poll. 1 disables parallel fetches.
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+DEFAULT_MAX_CONCURRENT_REQUESTS = 3
+
+# Bounds of the coordinator's device cache. Devices the router stopped
+# reporting are dropped once inactive for longer than the TTL (in hours)
+# unless they have a tracker entity, and the least recently seen ones are
+# dropped while the cache holds more than the maximum.
+CONF_CACHE_MAX_DEVICES = "cache_max_devices"
+DEFAULT_CACHE_MAX_DEVICES = 256
+CONF_CACHE_INACTIVE_TTL = "cache_inactive_ttl"
+DEFAULT_CACHE_INACTIVE_TTL = 24
+
+# Opt-in flag: listen for DHCP requests and gratuitous ARP on the Home
+# Assistant host and refresh as soon as a device joins, instead of waiting
+# for the next poll. Needs a raw socket (Linux, CAP_NET_RAW).
+CONF_PRESENCE_LISTENER = "presence_listener"
+DEFAULT_PRESENCE_LISTENER = False
+
+# Polling interval controller (see polling.py) and the bounds, in seconds,
+# it picks the interval between.
+CONF_POLL_CONTROLLER = "poll_controller"
+DEFAULT_POLL_CONTROLLER = "adaptive"
+CONF_MIN_POLL_INTERVAL = "min_poll_interval"
+DEFAULT_MIN_POLL_INTERVAL = 30
+CONF_MAX_POLL_INTERVAL = "max_poll_interval"
+DEFAULT_MAX_POLL_INTERVAL = 120
+
+# Seconds before the next scheduled poll at which the login/fetch/logout
+# path already connects and logs in, so the poll starts at the data
+# requests. 0 (the default) disables pre-warming.
+CONF_PREWARM_LEAD = "prewarm_lead"
+DEFAULT_PREWARM_LEAD = 0
+
+# Router fetches (login + device queries) allowed to run at the same time
+# across all config entries. Each holds an executor thread on the requests
+# transport, and routers behind the same uplink share its latency. The
+# scheduler is shared by all entries, so the lowest value of them applies.
+CONF_MAX_CONCURRENT_POLLS = "max_concurrent_polls"
+DEFAULT_MAX_CONCURRENT_POLLS = 4
+
+# Connections to the router are pooled per client and kept (with their TLS
+# sessions) across logout/login cycles. The pool holds at most this many
+# connections. With isolate_cookies each login starts with an empty cookie
+# jar; without it the router's SID cookie carries over to the next login.
+CONF_CONNECTION_POOL_SIZE = "connection_pool_size"
+DEFAULT_CONNECTION_POOL_SIZE = 2
+CONF_ISOLATE_COOKIES = "isolate_cookies"
+DEFAULT_ISOLATE_COOKIES = True
+
+# Routers rebooted at once by the reboot service, and the default seconds
+# between the starts of two reboots.
+DEFAULT_REBOOT_CONCURRENCY = 4
+DEFAULT_REBOOT_STAGGER = 0
+# Fired by the reboot service as each router's reboot completes.
+EVENT_REBOOT_RESULT = f"{DOMAIN}_reboot_result"
+
+# Endpoints the router was found to serve (zteclient/capabilities.py), kept
+# in the entry data. Probed at setup and again when the firmware changes.
+CONF_CAPABILITIES = "capabilities"
@@ -3,32 +3,85 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Callable, Iterable
+from contextlib import nullcontext
+from dataclasses import asdict
 from datetime import datetime, timedelta
 import logging
+import time
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_MODEL, CONF_PASSWORD, CONF_USERNAME
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .const import (
+    CONF_ASYNC_TRANSPORT,
+    CONF_CACHE_INACTIVE_TTL,
+    CONF_CACHE_MAX_DEVICES,
+    CONF_CAPABILITIES,
+    CONF_CONNECTION_POOL_SIZE,
+    CONF_ISOLATE_COOKIES,
+    CONF_MAX_CONCURRENT_POLLS,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_POLL_INTERVAL,
     CONF_MESH_TOPOLOGY,
+    CONF_MIN_POLL_INTERVAL,
+    CONF_POLL_CONTROLLER,
+    CONF_PRESENCE_LISTENER,
+    CONF_PREWARM_LEAD,
     CONF_QUERY_ROUTER_DETAILS,
     CONF_QUERY_WAN_STATUS,
     CONF_REGISTER_NEW_DEVICES,
     CONF_SESSION_REUSE,
+    DEFAULT_ASYNC_TRANSPORT,
+    DEFAULT_CACHE_INACTIVE_TTL,
+    DEFAULT_CACHE_MAX_DEVICES,
+    DEFAULT_CONNECTION_POOL_SIZE,
+    DEFAULT_ISOLATE_COOKIES,
+    DEFAULT_MAX_CONCURRENT_POLLS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_POLL_INTERVAL,
     DEFAULT_MESH_TOPOLOGY,
+    DEFAULT_MIN_POLL_INTERVAL,
+    DEFAULT_POLL_CONTROLLER,
+    DEFAULT_PRESENCE_LISTENER,
+    DEFAULT_PREWARM_LEAD,
+    DEFAULT_REBOOT_CONCURRENCY,
+    DEFAULT_REBOOT_STAGGER,
     DEFAULT_SESSION_REUSE,
     DOMAIN,
 )
-from .zteclient.zte_client import zteClient
+from .models import build_views, compute_delta
+from .polling import PollDecision, PollingController, PollSample, create_controller
+from .scheduler import ZtePollScheduler
+from .zteclient.async_zte_client import AsyncZteClient
+from .zteclient.capabilities import merge_capabilities, probe_capabilities
+from .zteclient.device_record import DeviceRecord
+from .zteclient.instrumentation import Instrumentation
+from .zteclient.zte_client import UNCHANGED, zteClient
 
 _LOGGER = logging.getLogger(__name__)
 
 DEFAULT_UPDATE_INTERVAL = timedelta(seconds=60)
-FAST_UPDATE_INTERVAL = timedelta(seconds=30)
-SLOW_UPDATE_INTERVAL = timedelta(seconds=120)
+# Default bounds of the polling controller (see polling.py)
+FAST_UPDATE_INTERVAL = timedelta(seconds=DEFAULT_MIN_POLL_INTERVAL)
+SLOW_UPDATE_INTERVAL = timedelta(seconds=DEFAULT_MAX_POLL_INTERVAL)
+
+# Refresh cadence of the query groups that change on a slow timescale
+# (WAN lease/uptime, PowerOnTime). Devices are fetched on every poll; in
+# between, the last good result of each group is merged into router_info.
+QUERY_GROUP_INTERVALS = {
+    "wan": timedelta(minutes=5),
+    "details": timedelta(minutes=15),
+}
+# A cached group result is dropped once it is this many intervals old, so a
+# group that keeps failing stops reporting values from long ago.
+QUERY_GROUP_MAX_AGE_INTERVALS = 3
 
 # Force a fresh login if our cached session is older than this. Polling every
 # 30-120s keeps the session active so the router shouldn't naturally idle-time
@@ -38,6 +91,79 @@ SLOW_UPDATE_INTERVAL = timedelta(seconds=120)
 # The retry-once path below catches sessions that die earlier.
 SESSION_MAX_AGE = timedelta(minutes=30)
 
+# The device cache is persisted so a restart starts from the last known
+# devices. Writes are delayed so the polls within STORAGE_SAVE_DELAY seconds
+# share one write.
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 30
+
+# A device announcing itself (DHCP/ARP, see presence.py) triggers a refresh
+# PRESENCE_REFRESH_DELAY seconds later, giving the router time to list it;
+# announcements in between share that refresh. Each MAC triggers at most
+# one refresh per PRESENCE_COOLDOWN seconds.
+PRESENCE_REFRESH_DELAY = 3
+PRESENCE_COOLDOWN = 60
+PRESENCE_TRACKED_LIMIT = 256
+
+# A pre-warmed login older than this when the poll runs (the poll was
+# delayed, or ran early and logged out) is not trusted; the poll logs in
+# afresh.
+PREWARM_MAX_AGE = 30
+
+# Cached devices are served on a failed poll only if this recent.
+CACHE_MAX_AGE = timedelta(minutes=10)
+
+# Polls whose device replies are unchanged reuse the published records
+# as they are; last_seen of the active ones is moved on only once it is
+# this old. Far below the cache's inactive TTL (at least an hour), so a
+# device that disconnects is never evicted for a stale last_seen.
+LAST_SEEN_MAX_AGE = timedelta(minutes=5)
+
+# The router's endpoints are probed again after a firmware change, after
+# CAPABILITY_REPROBE_INTERVAL, or after CAPABILITY_RETRY_INTERVAL if the
+# last probe left groups unknown. Automatic probes are at least
+# CAPABILITY_RETRY_INTERVAL apart.
+CAPABILITY_REPROBE_INTERVAL = timedelta(days=7)
+CAPABILITY_RETRY_INTERVAL = timedelta(hours=1)
+
+
+def device_cache_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the store holding the device cache of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.devices")
+
+
+async def async_reboot_routers(
+    coordinators: Iterable[ZteDataCoordinator],
+    max_concurrency: int = DEFAULT_REBOOT_CONCURRENCY,
+    stagger: float = DEFAULT_REBOOT_STAGGER,
+    on_result: Callable[[ZteDataCoordinator, bool], None] | None = None,
+) -> dict[str, bool]:
+    """Reboot several routers concurrently; return the result per host.
+
+    At most max_concurrency reboots (login, restart request, logout) are
+    in flight at once, and two reboots start at least stagger seconds
+    apart. on_result is called as each reboot completes.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    coordinators = list(coordinators)
+    next_start = 0.0
+
+    async def _reboot(coordinator: ZteDataCoordinator) -> bool:
+        nonlocal next_start
+        async with semaphore:
+            if stagger > 0:
+                now = asyncio.get_running_loop().time()
+                start = max(now, next_start)
+                next_start = start + stagger
+                await asyncio.sleep(start - now)
+            result = await coordinator.async_reboot_router()
+        if on_result is not None:
+            on_result(coordinator, result)
+        return result
+
+    results = await asyncio.gather(*(_reboot(c) for c in coordinators))
+    return {c.client.host: result for c, result in zip(coordinators, results)}
+
 
 class ZteDataCoordinator(DataUpdateCoordinator):
     """Class to manage fetching ZTE router data with intelligent caching."""
@@ -64,31 +190,107 @@ class ZteDataCoordinator(DataUpdateCoordinator):
             )
         )
 
-        self.client = zteClient(
+        # Async transport is wired in at __init__ time like session_reuse;
+        # toggling it requires a reload (see __init__._async_options_updated).
+        self._async_transport = bool(
+            entry.options.get(
+                CONF_ASYNC_TRANSPORT,
+                entry.data.get(CONF_ASYNC_TRANSPORT, DEFAULT_ASYNC_TRANSPORT),
+            )
+        )
+        client_args = (
             entry.data[CONF_HOST],
             entry.data[CONF_USERNAME],
             entry.data[CONF_PASSWORD],
             entry.data[CONF_MODEL],
-            verify_ssl=False,
-            query_wan_status=query_wan,
-            query_router_details=query_router,
-            mesh_topology=self._mesh_topology,
         )
+        client_kwargs: dict[str, Any] = {
+            "verify_ssl": False,
+            "query_wan_status": query_wan,
+            "query_router_details": query_router,
+            "mesh_topology": self._mesh_topology,
+            "pool_size": int(
+                entry.options.get(
+                    CONF_CONNECTION_POOL_SIZE, DEFAULT_CONNECTION_POOL_SIZE
+                )
+            ),
+            "isolate_cookies": entry.options.get(
+                CONF_ISOLATE_COOKIES, DEFAULT_ISOLATE_COOKIES
+            ),
+            "capabilities": entry.data.get(CONF_CAPABILITIES),
+        }
+        if self._async_transport:
+            client_kwargs["max_concurrency"] = int(
+                entry.options.get(
+                    CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+                )
+            )
+            self.client = AsyncZteClient(*client_args, **client_kwargs)
+        else:
+            self.client = zteClient(*client_args, **client_kwargs)
+        # Request timings of the client and the poll phases below, together
+        self.instrumentation = Instrumentation()
+        self.client.instrumentation = self.instrumentation
         self._available = True
         self._paused = False
         self._register_new_devices = entry.options.get(CONF_REGISTER_NEW_DEVICES, True)
         self._last_device_count = 0
-        self._stable_count = 0
-        self._device_cache: dict[str, dict[str, Any]] = {}
+        self._last_fetch_latency: float | None = None
+        self._polling = self._create_polling_controller(entry)
+        self.polling_decision: PollDecision | None = None
+        self._device_cache: dict[str, DeviceRecord] = {}
+        self._cache_max_devices = int(
+            entry.options.get(CONF_CACHE_MAX_DEVICES, DEFAULT_CACHE_MAX_DEVICES)
+        )
+        self._cache_inactive_ttl = timedelta(
+            hours=entry.options.get(CONF_CACHE_INACTIVE_TTL, DEFAULT_CACHE_INACTIVE_TTL)
+        )
+        # Devices dropped from the cache since startup
+        self.evicted_devices = 0
+        # MACs with a device_tracker registry entry for this config entry,
+        # maintained by the device_tracker platform.
+        self.tracked_macs: set[str] = set()
+        # Set while registered with the domain's poll scheduler
+        self.scheduler: ZtePollScheduler | None = None
+        # Read by the scheduler, which applies the lowest of all entries
+        self.max_concurrent_polls = int(
+            entry.options.get(CONF_MAX_CONCURRENT_POLLS, DEFAULT_MAX_CONCURRENT_POLLS)
+        )
+        # Subscribed to the presence listener at setup (see __init__)
+        self.presence_listener = bool(
+            entry.options.get(CONF_PRESENCE_LISTENER, DEFAULT_PRESENCE_LISTENER)
+        )
+        # MAC -> monotonic time of the last refresh it triggered
+        self._presence_triggers: dict[str, float] = {}
+        self.presence_refreshes = 0
+        # Created by async_start_cache_load, so tests and callers that never
+        # start it don't touch storage.
+        self._store: Store | None = None
+        self._store_load: asyncio.Task | None = None
         self._last_successful_update: datetime | None = None
+        self._last_changed_at: datetime | None = None
+        # When last_seen of the active devices was last set
+        self._last_seen_at: datetime | None = None
         self._last_login_at: datetime | None = None
+        self._group_cache: dict[str, dict[str, Any]] = {}
+        self._group_fetched_at: dict[str, datetime] = {}
         self._client_lock = asyncio.Lock()
+        # Set while a capability probe runs (see async_probe_capabilities)
+        self._probe_task: asyncio.Task | None = None
+        self._probe_started_at: float | None = None
         self._reuse_session = bool(
             entry.options.get(
                 CONF_SESSION_REUSE,
                 entry.data.get(CONF_SESSION_REUSE, DEFAULT_SESSION_REUSE),
             )
         )
+        self.prewarm_lead = int(
+            entry.options.get(CONF_PREWARM_LEAD, DEFAULT_PREWARM_LEAD)
+        )
+        self._unsub_prewarm: CALLBACK_TYPE | None = None
+        # Monotonic time of the pre-warmed login the next poll may use
+        self._prewarmed_at: float | None = None
+        self.prewarmed_polls = 0
 
         super().__init__(
             hass,
@@ -97,6 +299,41 @@ class ZteDataCoordinator(DataUpdateCoordinator):
             update_interval=DEFAULT_UPDATE_INTERVAL,
             config_entry=entry,
         )
+        self._presence_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=PRESENCE_REFRESH_DELAY,
+            immediate=False,
+            function=self.async_request_refresh,
+        )
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all listeners, timing the dispatch."""
+        with self.instrumentation.phase("listeners"):
+            super().async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        """Cancel scheduled refreshes, including presence triggered ones."""
+        await super().async_shutdown()
+        self._presence_debouncer.async_shutdown()
+        self._cancel_prewarm()
+
+    async def _async_client_call(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a client method without blocking the event loop.
+
+        AsyncZteClient methods are coroutines and are awaited directly; the
+        blocking zteClient is pushed to the executor.
+        """
+        if self._async_transport:
+            return await func(*args)
+        queued = time.perf_counter()
+
+        def _run() -> Any:
+            self.instrumentation.observe("executor_wait", time.perf_counter() - queued)
+            return func(*args)
+
+        return await self.hass.async_add_executor_job(_run)
 
     @property
     def available(self) -> bool:
@@ -121,18 +358,20 @@ class ZteDataCoordinator(DataUpdateCoordinator):
         lock.
         """
         self._paused = True
+        self._cancel_prewarm()
         _LOGGER.info("ZTE tracker scanning paused")
 
         async def _bg_logout() -> None:
             async with self._client_lock:
                 try:
                     await asyncio.wait_for(
-                        self.hass.async_add_executor_job(self.client.logout),
+                        self._async_client_call(self.client.logout),
                         timeout=5,
                     )
                 except Exception as ex:  # noqa: BLE001
                     _LOGGER.debug("pause_scanning logout error: %s", ex)
                 self._last_login_at = None
+                self._prewarmed_at = None
 
         self.hass.async_create_background_task(_bg_logout(), "zte_tracker_pause_logout")
 
@@ -150,6 +389,7 @@ class ZteDataCoordinator(DataUpdateCoordinator):
         """
         self._paused = False
         self._last_login_at = None
+        self._prewarmed_at = None
         self.client.login_data = None
         _LOGGER.info("ZTE tracker scanning resumed (session state cleared)")
 
@@ -163,52 +403,362 @@ class ZteDataCoordinator(DataUpdateCoordinator):
         self._register_new_devices = False
         _LOGGER.info("ZTE tracker will not register new devices")
 
-    def _adjust_update_interval(self, device_count: int) -> None:
-        """Adjust update interval based on device activity."""
-        if device_count == self._last_device_count:
-            self._stable_count += 1
-        else:
-            self._stable_count = 0
-            self._last_device_count = device_count
-
-        # If devices are stable for a while, slow down polling
-        if self._stable_count > 5:
-            new_interval = SLOW_UPDATE_INTERVAL
-        elif self._stable_count < 2:
-            new_interval = FAST_UPDATE_INTERVAL
-        else:
-            new_interval = DEFAULT_UPDATE_INTERVAL
+    @callback
+    def async_handle_presence(self, mac: str) -> None:
+        """Schedule a refresh for a device that announced itself.
+
+        Devices the last poll already reports as active are ignored.
+        """
+        if self._paused:
+            return
+        device = self.data["devices"].get(mac) if self.data else None
+        if device is not None and device.active:
+            return
+
+        now = time.monotonic()
+        last = self._presence_triggers.get(mac)
+        if last is not None and now - last < PRESENCE_COOLDOWN:
+            return
+        if len(self._presence_triggers) >= PRESENCE_TRACKED_LIMIT:
+            self._presence_triggers = {
+                other: seen
+                for other, seen in self._presence_triggers.items()
+                if now - seen < PRESENCE_COOLDOWN
+            }
+        self._presence_triggers[mac] = now
+        self.presence_refreshes += 1
+        _LOGGER.debug("Device %s announced itself; refreshing", mac)
+        self._presence_debouncer.async_schedule_call()
+
+    def async_start_cache_load(self) -> None:
+        """Start loading the persisted device cache in the background.
+
+        The first refresh doesn't wait for it unless the router can't be
+        reached, in which case the loaded devices are served as cached data.
+        """
+        self._store = device_cache_store(self.hass, self.entry.entry_id)
+        self._store_load = self.hass.async_create_task(
+            self._async_load_cache(), f"{DOMAIN} device cache load"
+        )
+
+    async def _async_load_cache(self) -> None:
+        """Fill the device cache from storage."""
+        try:
+            stored = await self._store.async_load()
+        except Exception as ex:  # noqa: BLE001
+            _LOGGER.warning("Could not load cached devices: %s", ex)
+            return
+        if not stored:
+            return
+
+        # Devices missing from a poll that already completed are inactive.
+        polled = self._last_changed_at is not None
+        for mac, fields in stored.get("devices", {}).items():
+            if mac in self._device_cache:
+                continue
+            device = DeviceRecord.from_legacy(fields)
+            if polled:
+                device.active = False
+            self._device_cache[mac] = device
+        if self._last_successful_update is None and stored.get("saved_at"):
+            self._last_successful_update = datetime.fromisoformat(stored["saved_at"])
+        _LOGGER.debug("Loaded %d cached devices", len(stored.get("devices", {})))
+
+    async def _async_wait_cache_loaded(self) -> None:
+        """Wait for the persisted device cache if it is still loading."""
+        if self._store_load is not None and not self._store_load.done():
+            await asyncio.wait([self._store_load])
+
+    def _cache_to_store(self) -> dict[str, Any]:
+        """Return the device cache as stored."""
+        saved_at = self._last_successful_update or datetime.now()
+        return {
+            "saved_at": saved_at.isoformat(),
+            "devices": {mac: asdict(d) for mac, d in self._device_cache.items()},
+        }
+
+    @staticmethod
+    def _create_polling_controller(entry: ConfigEntry) -> PollingController:
+        """Return the polling controller configured in the entry options."""
+        return create_controller(
+            entry.options.get(CONF_POLL_CONTROLLER, DEFAULT_POLL_CONTROLLER),
+            timedelta(
+                seconds=entry.options.get(
+                    CONF_MIN_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL
+                )
+            ),
+            timedelta(
+                seconds=entry.options.get(
+                    CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL
+                )
+            ),
+            DEFAULT_UPDATE_INTERVAL,
+        )
+
+    def set_polling_controller(self, entry: ConfigEntry) -> None:
+        """Switch to the polling controller of updated entry options.
 
-        if self.update_interval != new_interval:
+        The current controller and its history are kept if the controller
+        and its bounds are unchanged.
+        """
+        controller = self._create_polling_controller(entry)
+        current = self._polling
+        if (controller.name, controller.min_interval, controller.max_interval) != (
+            current.name,
+            current.min_interval,
+            current.max_interval,
+        ):
+            self._polling = controller
+
+    def _adjust_update_interval(
+        self,
+        device_count: int,
+        churn: int | None = None,
+        latency: float | None = None,
+        ok: bool = True,
+    ) -> None:
+        """Let the polling controller pick the next update interval.
+
+        Churn defaults to the change in the active device count.
+        """
+        if churn is None:
+            churn = abs(device_count - self._last_device_count)
+        self._last_device_count = device_count
+        decision = self._polling.update(
+            PollSample(device_count, churn, latency, ok, datetime.now())
+        )
+        self.polling_decision = decision
+
+        if self.update_interval != decision.interval:
             _LOGGER.debug(
-                "Adjusting update interval from %s to %s (stable count: %d)",
+                "Adjusting update interval from %s to %s (%s)",
                 self.update_interval,
-                new_interval,
-                self._stable_count,
+                decision.interval,
+                decision.reason,
             )
-            self.update_interval = new_interval
+            self.update_interval = decision.interval
 
     async def async_reboot_router(self) -> bool:
         """Reboot the router."""
-
-        def _reboot():
+        async with self._client_lock:
             try:
-                return self.client.reboot()
+                result = await self._async_client_call(self.client.reboot)
             except Exception as ex:
                 _LOGGER.error("Failed to reboot router: %s", ex)
-                return False
+                result = False
+            # Reboot invalidates any session we held and the cached
+            # WAN/uptime details.
+            self._last_login_at = None
+            self._group_cache.clear()
+            self._group_fetched_at.clear()
+            return result
+
+    async def async_probe_capabilities(self) -> dict[str, Any] | None:
+        """Probe the endpoints the router serves and store them in the entry.
+
+        The probe runs on a client of its own, so it works the same with
+        either transport; it logs in, so the next poll logs in afresh.
+        """
+        data = self.entry.data
+        prober = zteClient(
+            data[CONF_HOST], data[CONF_USERNAME], data[CONF_PASSWORD], data[CONF_MODEL]
+        )
 
+        def _probe() -> dict[str, Any] | None:
+            try:
+                if not prober.login():
+                    _LOGGER.warning(
+                        "Capability probe could not log in: %s", prober.statusmsg
+                    )
+                    return None
+                return probe_capabilities(prober)
+            finally:
+                try:
+                    prober.logout()
+                finally:
+                    prober.close()
+
+        self._probe_started_at = time.monotonic()
         async with self._client_lock:
-            result = await self.hass.async_add_executor_job(_reboot)
-            # Reboot invalidates any session we held.
+            try:
+                capabilities = await self.hass.async_add_executor_job(_probe)
+            except Exception as ex:  # noqa: BLE001
+                _LOGGER.warning("Capability probe failed: %s", ex)
+                capabilities = None
             self._last_login_at = None
-            return result
+        if capabilities is None:
+            return None
+        # Groups this probe couldn't tell keep what the last one found
+        capabilities = merge_capabilities(
+            self.entry.data.get(CONF_CAPABILITIES), capabilities
+        )
+        self.client.apply_capabilities(capabilities)
+        self.hass.config_entries.async_update_entry(
+            self.entry, data={**self.entry.data, CONF_CAPABILITIES: capabilities}
+        )
+        return capabilities
+
+    @callback
+    def _check_capabilities(self, details: dict[str, Any] | None) -> None:
+        """Probe the endpoints again if the stored probe is out of date.
+
+        That is after a firmware change, once the probe is older than
+        CAPABILITY_REPROBE_INTERVAL, or sooner if it left groups unknown.
+        The firmware version comes with the router details, so a firmware
+        change is only seen on polls that fetch them (every 15 minutes,
+        see QUERY_GROUP_INTERVALS) and never with router details turned
+        off; the periodic probe still catches it then.
+        """
+        capabilities = self.entry.data.get(CONF_CAPABILITIES)
+        if not capabilities:
+            return
+        if (
+            self._probe_started_at is not None
+            and time.monotonic() - self._probe_started_at
+            < CAPABILITY_RETRY_INTERVAL.total_seconds()
+        ):
+            return
+        try:
+            age = datetime.now() - datetime.fromisoformat(capabilities["probed_at"])
+        except (KeyError, TypeError, ValueError):
+            age = CAPABILITY_REPROBE_INTERVAL
+        firmware = details.get("SoftwareVer") if isinstance(details, dict) else None
+        known = capabilities.get("firmware")
+
+        if firmware and known and firmware != known:
+            reason = f"firmware changed from {known} to {firmware}"
+        elif age >= CAPABILITY_REPROBE_INTERVAL:
+            reason = "last probe is out of date"
+        elif age >= CAPABILITY_RETRY_INTERVAL and (
+            capabilities.get("unknown") or (firmware and not known)
+        ):
+            reason = "last probe was incomplete"
+        else:
+            return
+        _LOGGER.info("Probing the endpoints of %s: %s", self.client.host, reason)
+        self.async_schedule_probe()
+
+    @callback
+    def async_schedule_probe(self) -> None:
+        """Start a capability probe in the background unless one is running."""
+        if self._probe_task is not None and not self._probe_task.done():
+            return
+        self._probe_task = self.entry.async_create_background_task(
+            self.hass, self.async_probe_capabilities(), f"{DOMAIN} capability probe"
+        )
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next refresh and the pre-warm ahead of it."""
+        super()._schedule_refresh()
+        if self._unsub_refresh is not None:
+            self._schedule_prewarm()
+
+    @callback
+    def _unschedule_refresh(self) -> None:
+        """Unschedule the next refresh and its pre-warm."""
+        super()._unschedule_refresh()
+        self._cancel_prewarm()
+
+    @callback
+    def _schedule_prewarm(self) -> None:
+        """Log in prewarm_lead seconds before the next scheduled poll.
+
+        Only the login/fetch/logout path pre-warms; the session-reuse path
+        already keeps its login between polls.
+        """
+        self._cancel_prewarm()
+        if (
+            self._reuse_session
+            or self._paused
+            or self.prewarm_lead <= 0
+            or self.update_interval is None
+        ):
+            return
+        delay = self.update_interval.total_seconds() - self.prewarm_lead
+        if delay > 0:
+            self._unsub_prewarm = async_call_later(
+                self.hass, delay, self._async_prewarm
+            )
+
+    @callback
+    def _cancel_prewarm(self) -> None:
+        """Cancel a scheduled pre-warm."""
+        if self._unsub_prewarm is not None:
+            self._unsub_prewarm()
+            self._unsub_prewarm = None
+
+    async def _async_prewarm(self, _now: datetime) -> None:
+        """Open the connection, fetch the session token and log in."""
+        self._unsub_prewarm = None
+        if self._paused or self._client_lock.locked():
+            return
+        async with self._client_lock:
+            try:
+                with self.instrumentation.phase("prewarm"):
+                    logged_in = await self._async_client_call(self.client.login)
+            except Exception as ex:  # noqa: BLE001
+                _LOGGER.debug("Pre-warm login failed: %s", ex)
+                return
+            if logged_in:
+                self._prewarmed_at = time.monotonic()
+                _LOGGER.debug("Pre-warmed router login for the next poll")
+
+    async def _async_claim_prewarm(self) -> bool:
+        """Return whether the client holds a usable pre-warmed login.
+
+        A login older than PREWARM_MAX_AGE is logged out so the poll logs
+        in afresh.
+        """
+        prewarmed_at, self._prewarmed_at = self._prewarmed_at, None
+        if prewarmed_at is None:
+            return False
+        if time.monotonic() - prewarmed_at <= PREWARM_MAX_AGE:
+            return True
+        try:
+            await self._async_client_call(self.client.logout)
+        except Exception:  # noqa: BLE001
+            pass
+        return False
+
+    def _due_query_groups(self) -> tuple[bool, bool]:
+        """Return whether the WAN and router details groups are due."""
+        now = datetime.now()
+        due = {
+            group: (
+                group not in self._group_fetched_at
+                or now - self._group_fetched_at[group] >= interval
+            )
+            for group, interval in QUERY_GROUP_INTERVALS.items()
+        }
+        return due["wan"], due["details"]
+
+    def _store_query_groups(self, **results: dict[str, Any] | None) -> None:
+        """Cache fetched query group results.
+
+        None means the group was not due; an empty dict means the fetch
+        failed or the group is disabled, so it is retried next poll. The
+        last good result is kept until it is QUERY_GROUP_MAX_AGE_INTERVALS
+        intervals old.
+        """
+        now = datetime.now()
+        for group, result in results.items():
+            if result:
+                self._group_cache[group] = result
+                self._group_fetched_at[group] = now
+            elif (
+                result is not None
+                and group in self._group_fetched_at
+                and now - self._group_fetched_at[group]
+                >= QUERY_GROUP_INTERVALS[group] * QUERY_GROUP_MAX_AGE_INTERVALS
+            ):
+                self._group_cache.pop(group, None)
 
     def _enrich_topology(
         self,
-        topo_devices: list[dict[str, Any]],
-        legacy_devices: list[dict[str, Any]],
-    ) -> list[dict[str, Any]]:
+        topo_devices: list[DeviceRecord],
+        legacy_devices: list[DeviceRecord],
+    ) -> list[DeviceRecord]:
         """Enrich topology devices with SSID and metadata from legacy data.
 
         Only replaces legacy list if topology has at least as many devices.
@@ -222,29 +772,27 @@ class ZteDataCoordinator(DataUpdateCoordinator):
             )
             return legacy_devices
 
-        legacy_by_mac = {d.get("MACAddress", ""): d for d in legacy_devices}
+        legacy_by_mac = {d.mac: d for d in legacy_devices}
 
         # Phase 1: merge known fields by MAC
         for td in topo_devices:
-            legacy = legacy_by_mac.get(td.get("MACAddress", ""))
+            legacy = legacy_by_mac.get(td.mac)
             if legacy:
-                if legacy.get("Port"):
-                    td["Port"] = legacy["Port"]
-                if legacy.get("ConnectTime"):
-                    td["ConnectTime"] = legacy["ConnectTime"]
-                if legacy.get("LinkTime"):
-                    td["LinkTime"] = legacy["LinkTime"]
+                if legacy.port:
+                    td.port = legacy.port
+                if legacy.connect_time:
+                    td.connect_time = legacy.connect_time
+                if legacy.link_time:
+                    td.link_time = legacy.link_time
 
         # Phase 2: propagate SSID to agent devices by AccessType
         ssid_by_access: dict[str, str] = {}
         for td in topo_devices:
-            port = td.get("Port", "")
-            access = td.get("_AccessType", "")
-            if port and access and access not in ssid_by_access:
-                ssid_by_access[access] = port
+            if td.port and td.access_type and td.access_type not in ssid_by_access:
+                ssid_by_access[td.access_type] = td.port
         for td in topo_devices:
-            if not td.get("Port") and td.get("_AccessType"):
-                td["Port"] = ssid_by_access.get(td["_AccessType"], "")
+            if not td.port and td.access_type:
+                td.port = ssid_by_access.get(td.access_type, "")
 
         _LOGGER.info(
             "Mesh topology: %d devices (was %d from legacy)",
@@ -253,253 +801,401 @@ class ZteDataCoordinator(DataUpdateCoordinator):
         )
         return topo_devices
 
-    def _merge_device_data(self, new_devices: list[dict[str, Any]]) -> dict[str, Any]:
-        """Merge new device data with cached data for better stability."""
-        processed_devices = {}
+    def _merge_device_data(
+        self, new_devices: list[DeviceRecord] | list[dict[str, Any]]
+    ) -> dict[str, DeviceRecord]:
+        """Merge new device data with cached data for better stability.
+
+        The parser's records are adopted into the cache as they are, so a
+        poll allocates one record per reported device and none for the
+        devices that stay missing.
+        """
+        processed_devices: dict[str, DeviceRecord] = {}
+        now_dt = datetime.now()
+        now = now_dt.isoformat()
 
         # Update cache with new data
         current_macs = set()
         for device in new_devices:
-            mac = device.get("MACAddress")
+            if not isinstance(device, DeviceRecord):
+                # Device dicts from older callers
+                device = DeviceRecord.from_legacy(device)
+            elif device.last_seen is not None:
+                # Published by an earlier poll (the client re-serves records
+                # of unchanged replies); published records are not modified.
+                device = device.copy()
+            mac = device.mac
             if not mac:
                 continue
 
             current_macs.add(mac)
-            device_data = {
-                "name": device.get("HostName", "Unknown"),
-                "ip": device.get("IPAddress", ""),
-                "mac": mac,
-                "active": device.get("Active", False),
-                "icon_type": device.get("IconType"),
-                "network_type": device.get("NetworkType", "Unknown"),
-                "last_seen": datetime.now().isoformat(),
-                "port": device.get("Port", ""),  # LAN port or WLAN ESSID
-                "LinkTime": device.get("LinkTime", ""),
-                "ConnectTime": device.get("ConnectTime", ""),
-                "mesh_node": device.get("MeshNode", ""),
-            }
+            device.last_seen = now
 
             # Merge with cached data if available
-            if mac in self._device_cache:
-                cached = self._device_cache[mac]
+            cached = self._device_cache.get(mac)
+            if cached is not None:
                 # Keep the name if new one is generic and cached one is better
-                if device_data["name"] in ("Unknown", mac) and cached.get(
-                    "name", "Unknown"
-                ) not in ("Unknown", mac):
-                    device_data["name"] = cached["name"]
+                if device.name in ("Unknown", mac) and cached.name not in (
+                    "Unknown",
+                    mac,
+                ):
+                    device.name = cached.name
 
                 # Keep last_seen from cache if device is not currently active
-                if not device_data["active"] and cached.get("last_seen"):
-                    device_data["last_seen"] = cached["last_seen"]
+                if not device.active and cached.last_seen:
+                    device.last_seen = cached.last_seen
+
+            self._device_cache[mac] = device
+            processed_devices[mac] = device
 
-            self._device_cache[mac] = device_data
-            processed_devices[mac] = device_data
+        self._last_seen_at = now_dt
+        self._evict_devices(current_macs, now_dt)
 
         # Mark devices not seen in this scan as inactive but keep in cache
         for mac, cached_device in self._device_cache.items():
             if mac not in current_macs:
-                # Keep device in processed list but mark as inactive
-                inactive_device = cached_device.copy()
-                inactive_device["active"] = False
-                processed_devices[mac] = inactive_device
+                if cached_device.active:
+                    cached_device = cached_device.copy()
+                    cached_device.active = False
+                    self._device_cache[mac] = cached_device
+                processed_devices[mac] = cached_device
 
         return processed_devices
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data from the router."""
-        if self._paused:
-            _LOGGER.debug("Scanning paused, returning cached data")
-            # Return cached data when paused
-            return {
-                "devices": {
-                    mac: data.copy() for mac, data in self._device_cache.items()
-                },
-                "router_info": {
-                    "host": self.client.host,
-                    "model": self.client.model,
-                    "status": "paused",
-                },
-            }
+    def _touch_active_devices(
+        self, devices: dict[str, DeviceRecord]
+    ) -> dict[str, DeviceRecord]:
+        """Return the devices of the last poll with last_seen of active ones bumped.
 
-        def _fetch_router_data_legacy() -> tuple[
-            list[dict[str, Any]] | None,
-            dict[str, Any] | None,
-            dict[str, Any] | None,
-        ]:
-            """Original upstream fetch path: login -> fetch -> logout per poll.
+        Used when the router's replies did not change: the active devices
+        were still reported, so their last_seen moves on as it does when
+        merging, or they would age out of the cache once they disconnect.
+        The records are only copied once last_seen is LAST_SEEN_MAX_AGE
+        old; until then the published dict is returned as it is.
+        """
+        now_dt = datetime.now()
+        if (
+            self._last_seen_at is not None
+            and now_dt - self._last_seen_at < LAST_SEEN_MAX_AGE
+        ):
+            return devices
+        self._last_seen_at = now_dt
+        now = now_dt.isoformat()
+        processed_devices: dict[str, DeviceRecord] = {}
+        for mac, device in devices.items():
+            if device.active:
+                device = device.copy()
+                device.last_seen = now
+                self._device_cache[mac] = device
+            processed_devices[mac] = device
+        return processed_devices
 
-            Used when the session_reuse option is disabled (default) so we
-            don't change behaviour for users who haven't opted in to the
-            session-reuse experiment.
-            """
-            try:
-                if not self.client.login():
+    def _evict_devices(self, current_macs: set[str], now: datetime) -> None:
+        """Keep the device cache within its TTL and size bounds.
+
+        Only inactive devices missing from the current poll are evicted.
+        Those without a tracker entity (not in tracked_macs) expire after
+        the inactive TTL; if the cache is still over its maximum, the least
+        recently seen go next, devices without a tracker entity first.
+        """
+        candidates = [
+            (mac, device)
+            for mac, device in self._device_cache.items()
+            if not device.active and mac not in current_macs
+        ]
+        if not candidates:
+            return
+
+        cutoff = (now - self._cache_inactive_ttl).isoformat()
+        evicted = {
+            mac
+            for mac, device in candidates
+            if mac not in self.tracked_macs and (device.last_seen or "") < cutoff
+        }
+        excess = len(self._device_cache) - len(evicted) - self._cache_max_devices
+        if excess > 0:
+            remaining = sorted(
+                (item for item in candidates if item[0] not in evicted),
+                key=lambda item: (
+                    item[0] in self.tracked_macs,
+                    item[1].last_seen or "",
+                ),
+            )
+            evicted.update(mac for mac, _ in remaining[:excess])
+
+        for mac in evicted:
+            del self._device_cache[mac]
+        if evicted:
+            self.evicted_devices += len(evicted)
+            _LOGGER.debug(
+                "Evicted %d devices from the cache (%d in total)",
+                len(evicted),
+                self.evicted_devices,
+            )
+
+    async def _async_fetch_legacy(self) -> tuple[
+        list[DeviceRecord] | None,
+        dict[str, Any] | None,
+        dict[str, Any] | None,
+    ]:
+        """Original upstream fetch path: login -> fetch -> logout per poll.
+
+        Used when the session_reuse option is disabled (default) so we
+        don't change behaviour for users who haven't opted in to the
+        session-reuse experiment.
+        """
+        call = self._async_client_call
+        try:
+            prewarmed = await self._async_claim_prewarm()
+            if not prewarmed:
+                with self.instrumentation.phase("login"):
+                    logged_in = await call(self.client.login)
+                if not logged_in:
                     _LOGGER.warning(
                         "Login failed: %s@%s", self.client.username, self.client.host
                     )
                     return None, None, None
 
-                devices = self.client.get_devices_response()
-                wanstatus = self.client.get_wan_status()
-                routerdetails = self.client.get_router_details()
-
-                # Mesh topology enrichment (before logout!)
-                if devices is not None and self._mesh_topology:
-                    topo = self.client._try_topology()
-                    if topo:
-                        devices = self._enrich_topology(topo, devices)
-
-                return devices, wanstatus, routerdetails
-            except Exception as ex:
-                _LOGGER.error("Error fetching device data: %s", ex)
-                return None, None, None
-            finally:
-                try:
-                    self.client.logout()
-                except Exception:
-                    pass
+            with self.instrumentation.phase("fetch"):
+                results = await call(
+                    self.client.fetch_all,
+                    self._mesh_topology,
+                    *self._due_query_groups(),
+                )
+            devices = results["devices"]
+            if devices is None and prewarmed:
+                # The router dropped the pre-warmed session; log in again.
+                _LOGGER.debug("Fetch failed on pre-warmed session; logging in again")
+                await call(self.client.logout)
+                with self.instrumentation.phase("login"):
+                    logged_in = await call(self.client.login)
+                if not logged_in:
+                    return None, None, None
+                with self.instrumentation.phase("fetch"):
+                    results = await call(
+                        self.client.fetch_all,
+                        self._mesh_topology,
+                        *self._due_query_groups(),
+                    )
+                devices = results["devices"]
+            elif prewarmed:
+                self.prewarmed_polls += 1
+
+            # Mesh topology enrichment (fetched before logout!)
+            if devices is not None and results["topology"]:
+                devices = self._enrich_topology(results["topology"], devices)
+
+            return devices, results["wan"], results["details"]
+        except Exception as ex:
+            _LOGGER.error("Error fetching device data: %s", ex)
+            return None, None, None
+        finally:
+            try:
+                await call(self.client.logout)
+            except Exception:
+                pass
+
+    async def _async_fetch_reuse(self) -> tuple[
+        list[DeviceRecord] | None,
+        dict[str, Any] | None,
+        dict[str, Any] | None,
+    ]:
+        """Session-reuse fetch path (opt-in via the session_reuse option).
+
+        Reuses the existing client session across polls to avoid spamming
+        the router auth log with login/logout pairs. If the cached session
+        is stale (router idle-timed it out), the first fetch will fail; we
+        then force a logout+login and retry once within the same cycle so
+        we don't burn a whole polling interval on a recoverable hiccup.
+        """
+        call = self._async_client_call
+
+        # Proactive session refresh: if we've been holding the same
+        # session longer than SESSION_MAX_AGE, force a clean re-login
+        # before the router idle-times us out and the first attempt
+        # below silently fails.
+        now = datetime.now()
+        if (
+            self._last_login_at is not None
+            and now - self._last_login_at > SESSION_MAX_AGE
+        ):
+            _LOGGER.debug(
+                "Session age %s exceeds %s; proactively re-authenticating",
+                now - self._last_login_at,
+                SESSION_MAX_AGE,
+            )
+            try:
+                await call(self.client.logout)
+            except Exception:
+                pass
+            self._last_login_at = None
 
-        def _fetch_router_data_reuse() -> tuple[
-            list[dict[str, Any]] | None,
+        async def _attempt() -> tuple[
+            list[DeviceRecord] | None,
             dict[str, Any] | None,
             dict[str, Any] | None,
+            bool,
         ]:
-            """Session-reuse fetch path (opt-in via the session_reuse option).
-
-            Reuses the existing client session across polls to avoid spamming
-            the router auth log with login/logout pairs. If the cached session
-            is stale (router idle-timed it out), the first fetch will fail; we
-            then force a logout+login and retry once within the same cycle so
-            we don't burn a whole polling interval on a recoverable hiccup.
-            """
-
-            # Proactive session refresh: if we've been holding the same
-            # session longer than SESSION_MAX_AGE, force a clean re-login
-            # before the router idle-times us out and the first attempt
-            # below silently fails.
-            now = datetime.now()
-            if (
-                self._last_login_at is not None
-                and now - self._last_login_at > SESSION_MAX_AGE
-            ):
-                _LOGGER.debug(
-                    "Session age %s exceeds %s; proactively re-authenticating",
-                    now - self._last_login_at,
-                    SESSION_MAX_AGE,
+            try:
+                have_session = (
+                    self.client.login_data is not None
+                    and self.client.session is not None
+                    and self._last_login_at is not None
                 )
-                try:
-                    self.client.logout()
-                except Exception:
-                    pass
-                self._last_login_at = None
-
-            def _attempt() -> tuple[
-                list[dict[str, Any]] | None,
-                dict[str, Any] | None,
-                dict[str, Any] | None,
-                bool,
-            ]:
-                try:
-                    have_session = (
-                        self.client.login_data is not None
-                        and self.client.session is not None
-                        and self._last_login_at is not None
-                    )
-
-                    if have_session:
-                        _LOGGER.debug("Reusing existing router session")
-                    else:
-                        if not self.client.login():
-                            _LOGGER.debug(
-                                "Login failed: %s@%s",
-                                self.client.username,
-                                self.client.host,
-                            )
-                            return None, None, None, False
-                        _LOGGER.debug("Fresh router login established")
-                        self._last_login_at = datetime.now()
-
-                    devices = self.client.get_devices_response()
-                    if devices is None:
-                        return None, None, None, False
 
-                    # Stale-session safety net: if we reused a cached session
-                    # and got back an empty device list, the router likely
-                    # served us a redirect-to-login page (HTTP 200 with login
-                    # HTML) instead of real data. Real-world router always has
-                    # at least the HA host itself + the gateway visible, so an
-                    # empty list on a reused session is a strong stale-session
-                    # signal -> trigger the retry-once path with a fresh login.
-                    if have_session and len(devices) == 0:
+                if have_session:
+                    _LOGGER.debug("Reusing existing router session")
+                else:
+                    with self.instrumentation.phase("login"):
+                        logged_in = await call(self.client.login)
+                    if not logged_in:
                         _LOGGER.debug(
-                            "Empty device list on reused session; treating as stale"
+                            "Login failed: %s@%s",
+                            self.client.username,
+                            self.client.host,
                         )
                         return None, None, None, False
+                    _LOGGER.debug("Fresh router login established")
+                    self._last_login_at = datetime.now()
+
+                with self.instrumentation.phase("fetch"):
+                    results = await call(
+                        self.client.fetch_all,
+                        self._mesh_topology,
+                        *self._due_query_groups(),
+                    )
+                devices = results["devices"]
+                if devices is None:
+                    return None, None, None, False
 
-                    wanstatus = self.client.get_wan_status()
-                    routerdetails = self.client.get_router_details()
+                # Stale-session safety net: if we reused a cached session
+                # and got back an empty device list, the router likely
+                # served us a redirect-to-login page (HTTP 200 with login
+                # HTML) instead of real data. Real-world router always has
+                # at least the HA host itself + the gateway visible, so an
+                # empty list on a reused session is a strong stale-session
+                # signal -> trigger the retry-once path with a fresh login.
+                if have_session and devices is not UNCHANGED and len(devices) == 0:
+                    _LOGGER.debug(
+                        "Empty device list on reused session; treating as stale"
+                    )
+                    return None, None, None, False
 
-                    # Mesh topology enrichment (session still alive)
-                    if devices is not None and self._mesh_topology:
-                        topo = self.client._try_topology()
-                        if topo:
-                            devices = self._enrich_topology(topo, devices)
+                # Mesh topology enrichment (session still alive)
+                if results["topology"]:
+                    devices = self._enrich_topology(results["topology"], devices)
 
-                    return devices, wanstatus, routerdetails, True
-                except Exception as ex:
-                    _LOGGER.debug("Fetch attempt error: %s", ex)
-                    return None, None, None, False
+                return devices, results["wan"], results["details"], True
+            except Exception as ex:
+                _LOGGER.debug("Fetch attempt error: %s", ex)
+                return None, None, None, False
 
-            devices, wanstatus, routerdetails, ok = _attempt()
+        devices, wanstatus, routerdetails, ok = await _attempt()
 
+        if not ok:
+            _LOGGER.debug("Initial fetch failed; reauthenticating and retrying once")
+            try:
+                await call(self.client.logout)
+            except Exception:
+                pass
+            self._last_login_at = None
+            devices, wanstatus, routerdetails, ok = await _attempt()
             if not ok:
-                _LOGGER.debug(
-                    "Initial fetch failed; reauthenticating and retrying once"
+                _LOGGER.warning(
+                    "Login/fetch failed after retry: %s@%s",
+                    self.client.username,
+                    self.client.host,
                 )
+                # Clear session state so next cycle starts fresh
                 try:
-                    self.client.logout()
+                    await call(self.client.logout)
                 except Exception:
                     pass
                 self._last_login_at = None
-                devices, wanstatus, routerdetails, ok = _attempt()
-                if not ok:
-                    _LOGGER.warning(
-                        "Login/fetch failed after retry: %s@%s",
-                        self.client.username,
-                        self.client.host,
-                    )
-                    # Clear session state so next cycle starts fresh
-                    try:
-                        self.client.logout()
-                    except Exception:
-                        pass
-                    self._last_login_at = None
 
-            return devices, wanstatus, routerdetails
+        return devices, wanstatus, routerdetails
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Fetch data from the router.
+
+        Besides the full ``devices`` dict, publishes a ``delta``
+        (models.DeviceDelta) against the previous poll so listeners can
+        work on the changes only, and the ``views`` (models.DeviceView per
+        MAC) the tracker entities serve their state from.
+        """
+        previous = self.data["devices"] if self.data else None
+        previous_views = self.data["views"] if self.data else None
+        with self.instrumentation.phase("poll"):
+            data = await self._async_poll()
+        with self.instrumentation.phase("diff"):
+            data["delta"] = compute_delta(previous, data["devices"])
+            data["views"] = build_views(data["devices"], previous, previous_views)
+
+        router_info = data["router_info"]
+        if router_info["status"] != "paused":
+            delta = data["delta"]
+            self._adjust_update_interval(
+                router_info.get("active_devices", self._last_device_count),
+                churn=len(delta.added | delta.went_active | delta.went_inactive),
+                latency=self._last_fetch_latency,
+                ok=router_info["status"] == "connected",
+            )
+            router_info["polling"] = self.polling_decision.as_attributes()
+
+        if data["delta"] and self._store is not None:
+            self._store.async_delay_save(self._cache_to_store, STORAGE_SAVE_DELAY)
+        return data
+
+    async def _async_poll(self) -> dict[str, Any]:
+        """Poll the router, or serve cached devices if paused or offline."""
+        if self._paused:
+            _LOGGER.debug("Scanning paused, returning cached data")
+            # Return cached data when paused
+            return {
+                "devices": dict(self._device_cache),
+                "router_info": {
+                    "host": self.client.host,
+                    "model": self.client.model,
+                    "status": "paused",
+                },
+            }
 
         _fetch_router_data = (
-            _fetch_router_data_reuse if self._reuse_session else _fetch_router_data_legacy
+            self._async_fetch_reuse if self._reuse_session else self._async_fetch_legacy
         )
 
+        observe = self.instrumentation.observe
+        fetch_slot = nullcontext()
+        if self.scheduler is not None:
+            # Spaced before taking the client lock, so a reboot or probe of
+            # this router doesn't wait for the poll's turn as well.
+            waiting = time.perf_counter()
+            await self.scheduler.wait_turn(self)
+            observe("spacing_wait", time.perf_counter() - waiting)
+            fetch_slot = self.scheduler.fetch_slot(self)
+        waiting = time.perf_counter()
         async with self._client_lock:
-            devices, wanstatus, routerdetails = await self.hass.async_add_executor_job(
-                _fetch_router_data
-            )
+            observe("lock_wait", time.perf_counter() - waiting)
+            waiting = time.perf_counter()
+            async with fetch_slot:
+                observe("slot_wait", time.perf_counter() - waiting)
+                started = time.monotonic()
+                devices, wanstatus, routerdetails = await _fetch_router_data()
+                self._last_fetch_latency = time.monotonic() - started
 
         if devices is None:
             self._available = False
             devicesItem = {}
+            # At startup the cache may still be coming from disk.
+            await self._async_wait_cache_loaded()
             # Return cached data on failure if we have it and it's recent
             if (
                 self._device_cache
                 and self._last_successful_update
-                and datetime.now() - self._last_successful_update
-                < timedelta(minutes=10)
+                and datetime.now() - self._last_successful_update < CACHE_MAX_AGE
             ):
                 _LOGGER.warning("Using cached data due to connection failure")
-                devicesItem = {
-                    mac: data.copy() for mac, data in self._device_cache.items()
-                }
+                devicesItem = dict(self._device_cache)
 
             return {
                 "devices": devicesItem,
@@ -511,28 +1207,56 @@ class ZteDataCoordinator(DataUpdateCoordinator):
             }
 
         # Have info to return. Tracker is working.
+        was_connected = (
+            self._available
+            and self.data is not None
+            and self.data["router_info"].get("status") == "connected"
+        )
         self._available = True
         self._last_successful_update = datetime.now()
+        self._store_query_groups(wan=wanstatus, details=routerdetails)
+        self._check_capabilities(routerdetails)
 
-        # Process devices with caching
-        processed_devices = self._merge_device_data(devices)
+        if devices is UNCHANGED and was_connected:
+            # Same LAN/WLAN replies as last poll: nothing to parse or merge.
+            processed_devices = self._touch_active_devices(self.data["devices"])
+        else:
+            if devices is UNCHANGED:
+                # Unchanged since the client's last parse, but our last
+                # poll didn't publish it (failure or pause).
+                devices = self.client.last_devices() or []
+            self._last_changed_at = self._last_successful_update
+            # Process devices with caching
+            with self.instrumentation.phase("merge"):
+                processed_devices = self._merge_device_data(devices)
 
-        # Adjust polling interval based on device activity
-        active_count = len([d for d in processed_devices.values() if d.get("active")])
-        self._adjust_update_interval(active_count)
+        active_count = sum(1 for d in processed_devices.values() if d.active)
 
         router_info = {
             "host": self.client.host,
             "model": self.client.model,
             "status": "connected",
-            "last_update": self._last_successful_update.isoformat(),
+            "last_update": self._last_changed_at.isoformat(),
+            "last_checked": self._last_successful_update.isoformat(),
             "active_devices": active_count,
             "total_devices": len(processed_devices),
+            "evicted_devices": self.evicted_devices,
+            "presence_refreshes": self.presence_refreshes,
+            "prewarmed_polls": self.prewarmed_polls,
         }
-        if wanstatus:
-            router_info.update(wanstatus)
-        if routerdetails:
-            router_info.update(routerdetails)
+        planner = getattr(self.client, "planner", None)
+        if planner is not None:
+            router_info["fetch_mode"] = (
+                "parallel" if planner.concurrent else "sequential"
+            )
+        if self.scheduler is not None:
+            router_info["scheduler"] = self.scheduler.metrics()
+        for group in QUERY_GROUP_INTERVALS:
+            if group in self._group_cache:
+                router_info.update(self._group_cache[group])
+                router_info[f"{group}_fetched_at"] = self._group_fetched_at[
+                    group
+                ].isoformat()
         return {
             "devices": processed_devices,
             "router_info": router_info,
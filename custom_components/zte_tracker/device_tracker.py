@@ -2,24 +2,34 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Mapping
+from datetime import timedelta
 import logging
+import time
 from typing import Any
 
 from homeassistant.components.device_tracker import SourceType
 from homeassistant.components.device_tracker.config_entry import ScannerEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, ICONS
+from .const import DOMAIN
 from .coordinator import ZteDataCoordinator
+from .models import DeviceView, build_views
+from .zteclient.device_record import DeviceRecord
 
 _LOGGER = logging.getLogger(__name__)
 
+# Connected trackers are written at least this often even if nothing but
+# last_seen changed, so their last_seen attribute does not go stale. The
+# delta leaves last_seen out, or they would be written on every poll.
+LAST_SEEN_REFRESH_INTERVAL = timedelta(minutes=10)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -29,8 +39,10 @@ async def async_setup_entry(
     """Set up ZTE device tracker from config entry."""
     coordinator: ZteDataCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    # Track entities we've already created
-    created_entities = set()
+    # MAC -> entity for every tracker this entry has created
+    entities_by_mac: dict[str, ZteDeviceTrackerEntity] = {}
+    # Monotonic time connected trackers were last all written
+    last_seen_refreshed_at = time.monotonic()
 
     # Ensure router device exists in device registry so child device_tracker entities are attached
     device_registry = dr.async_get(hass)
@@ -45,48 +57,78 @@ async def async_setup_entry(
     )
     area_id = router_device.area_id
 
+    # MACs of this entry's trackers in the entity registry, including ones
+    # that have no entity in this run because the router hasn't reported
+    # the device since the restart.
+    tracked_macs = coordinator.tracked_macs
+    unique_id_prefix = f"{entry.entry_id}_"
+
+    def _registered_macs() -> set[str]:
+        """Return the MACs of this entry's trackers in the entity registry."""
+        macs = set()
+        for registry_entry in er.async_entries_for_config_entry(
+            entity_registry, entry.entry_id
+        ):
+            unique_id = registry_entry.unique_id
+            if registry_entry.domain == "device_tracker" and unique_id.startswith(
+                unique_id_prefix
+            ):
+                macs.add(unique_id.removeprefix(unique_id_prefix).replace("_", ":"))
+        return macs
+
+    tracked_macs.update(_registered_macs())
+
     @callback
-    def _async_add_entities():
-        """Add device tracker entities for discovered devices."""
-        if not coordinator.data:
-            return
+    def _is_removal(event_data: er.EventEntityRegistryUpdatedData) -> bool:
+        """Return whether a registry event removes an entity."""
+        return event_data["action"] == "remove"
+
+    @callback
+    def _async_registry_updated(
+        event: Event[er.EventEntityRegistryUpdatedData],
+    ) -> None:
+        """Forget the MACs of trackers deleted from the entity registry.
+
+        The removal event only carries the entity_id, so the set is rebuilt
+        from the registry. Entities still being added have no registry
+        entry yet and are kept.
+        """
+        tracked_macs.intersection_update(
+            _registered_macs()
+            | {mac for mac, entity in entities_by_mac.items() if not entity.entity_id}
+        )
 
-        data = coordinator.data
-        devices = data.get("devices", {})
+    @callback
+    def _async_add_entities(
+        devices: dict[str, DeviceRecord], views: dict[str, DeviceView]
+    ) -> set[str]:
+        """Add tracker entities for devices that don't have one yet.
 
+        Returns the MACs of the entities created.
+        """
         entities = []
         allow_new_devices = coordinator.register_new_devices
-        for mac, device_data in devices.items():
+        for mac in devices.keys() - entities_by_mac.keys():
+            device_data = devices[mac]
             # Only create entities for devices that have been seen as active at least once
-            if device_data.get("active") or device_data.get("last_seen"):
+            if device_data.active or device_data.last_seen:
                 unique_id = f"{entry.entry_id}_{mac.replace(':', '_')}"
-                # Only add entities that have not been created yet
-                found = False
-                haentities = async_add_entities.__self__.entities
-                for entitykey in haentities:
-                    entity = haentities[entitykey]
-                    if getattr(entity, "_attr_unique_id", None) == unique_id:
-                        # Update entities that have been added to Home Assistant
-                        entity._device_data = device_data
-                        entity._attr_name = device_data.get("name") or f"Device {mac}"
-                        if entity.hass is not None:
-                            entity.async_write_ha_state()
-                        found = True
-                        break
-                if not found:
-                    # Skip creating new entity if not allowed, unless the entity
-                    # already exists in the Home Assistant entity registry.
-                    existing_entity_id = entity_registry.async_get_entity_id(
-                        "device_tracker", DOMAIN, unique_id
-                    )
-                    if not allow_new_devices and existing_entity_id is None:
-                        # Skip creating new entity when not allowed and no existing registry entry
-                        continue
-                    entity = ZteDeviceTrackerEntity(
-                        coordinator, entry, mac, device_data
-                    )
-                    entities.append(entity)
-                    created_entities.add(mac)
+                # Skip creating new entity if not allowed, unless the entity
+                # already exists in the Home Assistant entity registry.
+                existing_entity_id = entity_registry.async_get_entity_id(
+                    "device_tracker", DOMAIN, unique_id
+                )
+                if not allow_new_devices and existing_entity_id is None:
+                    # Skip creating new entity when not allowed and no existing registry entry
+                    continue
+                view = views.get(mac) or DeviceView.from_device(mac, device_data)
+                entity = ZteDeviceTrackerEntity(coordinator, entry, mac, view)
+                entities_by_mac[mac] = entity
+                tracked_macs.add(mac)
+                entity.async_on_remove(
+                    lambda mac=mac: entities_by_mac.pop(mac, None)
+                )
+                entities.append(entity)
 
         if entities:
             async_add_entities(entities)
@@ -97,34 +139,90 @@ async def async_setup_entry(
                 )
                 if entity_id and area_id:
                     entity_registry.async_update_entity(entity_id, area_id=area_id)
+        return {entity.mac_address for entity in entities}
 
-    # Add initial entities
-    _async_add_entities()
-
-    def _mark_undetected_entities():
-        entity_registry = er.async_get(hass)
-        for entity_id, entity in entity_registry.entities.items():
-            if entity.domain == "device_tracker" and entity.platform == DOMAIN:
-                mac = entity.unique_id.split("_")[-1].replace("_", ":")
-                devices = (
-                    coordinator.data.get("devices", {}) if coordinator.data else {}
-                )
-                device = devices.get(mac)
-                if not device or not device.get("active"):
-                    tracker_entity = hass.states.get(entity_id)
-                    if tracker_entity:
-                        attrs = dict(tracker_entity.attributes)
-                        attrs["active"] = False
-                        hass.states.async_set(entity_id, "not_home", attrs)
+    @callback
+    def _async_update_entities(
+        views: dict[str, DeviceView], macs: Iterable[str]
+    ) -> None:
+        """Hand existing trackers their new view and write their state."""
+        for mac in macs:
+            entity = entities_by_mac.get(mac)
+            if entity is None:
+                continue
+            view = views.get(mac)
+            # Devices no longer reported keep their last data, inactive.
+            entity.async_set_view(view or entity._view.as_inactive())
+            if entity.hass is not None:
+                entity.async_write_ha_state()
+
+    @callback
+    def _mark_undetected_entities(macs: Iterable[str]) -> None:
+        """Set registered trackers without an entity in this run to not_home.
+
+        Trackers with an entity are written by _async_update_entities.
+        """
+        for mac in macs:
+            if mac in entities_by_mac or mac not in tracked_macs:
+                continue
+            entity_id = entity_registry.async_get_entity_id(
+                "device_tracker", DOMAIN, f"{unique_id_prefix}{mac.replace(':', '_')}"
+            )
+            tracker_entity = hass.states.get(entity_id) if entity_id else None
+            if tracker_entity:
+                attrs = dict(tracker_entity.attributes)
+                attrs["active"] = False
+                hass.states.async_set(entity_id, "not_home", attrs)
+
+    @callback
+    def _async_process_poll() -> None:
+        """Apply one coordinator refresh to the trackers.
+
+        Runs once per poll, in order: create trackers for new devices,
+        write the trackers whose data changed (and every connected one each
+        LAST_SEEN_REFRESH_INTERVAL), then mark the registered trackers that
+        are no longer detected. New trackers get their first state when
+        Home Assistant adds them, so they are not written again.
+        """
+        nonlocal last_seen_refreshed_at
+        if not coordinator.data:
+            return
+
+        devices = coordinator.data.get("devices", {})
+        delta = coordinator.data.get("delta")
+        views = coordinator.data.get("views") or build_views(devices)
+        created = _async_add_entities(devices, views)
+        now = time.monotonic()
+        if delta is None:
+            # No delta (nothing published by a poll yet): refresh everything.
+            last_seen_refreshed_at = now
+            _async_update_entities(views, entities_by_mac.keys() - created)
+            return
+        macs = delta.added | delta.updated | delta.removed
+        if now - last_seen_refreshed_at >= LAST_SEEN_REFRESH_INTERVAL.total_seconds():
+            last_seen_refreshed_at = now
+            macs |= {mac for mac, view in views.items() if view.active}
+        _async_update_entities(views, macs - created)
+        _mark_undetected_entities(delta.went_inactive | delta.removed)
 
-    # Listen for new devices and mark undetected entities after each scan
-    def _scan_listener():
-        _async_add_entities()
-        _mark_undetected_entities()
+    # Add initial entities
+    devices = (coordinator.data or {}).get("devices", {})
+    _async_add_entities(
+        devices, (coordinator.data or {}).get("views") or build_views(devices)
+    )
+    _mark_undetected_entities(
+        mac for mac in tracked_macs if mac not in devices or not devices[mac].active
+    )
 
-    coordinator.async_add_listener(_scan_listener)
-    # Listen for new devices
-    coordinator.async_add_listener(_async_add_entities)
+    # Single listener: add, update and mark trackers once per scan
+    entry.async_on_unload(coordinator.async_add_listener(_async_process_poll))
+    entry.async_on_unload(
+        hass.bus.async_listen(
+            er.EVENT_ENTITY_REGISTRY_UPDATED,
+            _async_registry_updated,
+            event_filter=_is_removal,
+        )
+    )
 
 
 class ZteDeviceTrackerEntity(CoordinatorEntity, ScannerEntity):
@@ -135,20 +233,30 @@ class ZteDeviceTrackerEntity(CoordinatorEntity, ScannerEntity):
         coordinator: ZteDataCoordinator,
         entry: ConfigEntry,
         mac: str,
-        device_data: dict[str, Any],
+        view: DeviceView,
     ) -> None:
         """Initialize the device tracker."""
         super().__init__(coordinator)
         self._entry = entry
         self._mac = mac
-        self._device_data = device_data
+        self._view = view
 
         # Generate unique ID and name
         self._attr_unique_id = f"{entry.entry_id}_{mac.replace(':', '_')}"
-        self._attr_name = device_data.get("name") or f"Device {mac}"
+        self._attr_name = view.name or f"Device {mac}"
 
         # Device info is provided via property below
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Skip the per-refresh write; the platform writes changed trackers."""
+
+    @callback
+    def async_set_view(self, view: DeviceView) -> None:
+        """Switch to the view of a new poll."""
+        self._view = view
+        self._attr_name = view.name or f"Device {self._mac}"
+
     @property
     def device_info(self) -> DeviceInfo:
         return DeviceInfo(
@@ -156,7 +264,7 @@ class ZteDeviceTrackerEntity(CoordinatorEntity, ScannerEntity):
                 (DOMAIN, f"{self._entry.entry_id}_{self._mac.replace(':', '_')}")
             },
             connections={("mac", self._mac)},
-            name=self._device_data.get("name") or self._mac,
+            name=self._view.name or self._mac,
             manufacturer="ZTE",
             via_device=(DOMAIN, self._entry.entry_id),
         )
@@ -169,21 +277,12 @@ class ZteDeviceTrackerEntity(CoordinatorEntity, ScannerEntity):
     @property
     def is_connected(self) -> bool:
         """Return true if the device is connected to the network (active), but do not report as unavailable if not detected."""
-        data = self.coordinator.data or {}
-        devices = data.get("devices", {})
-        device = devices.get(self._mac)
-        # If device is not present, keep entity but set active to False
-        if device is None:
-            return False
-        return device.get("active", False)
+        return self._view.active
 
     @property
     def ip_address(self) -> str | None:
         """Return the IP address of the device."""
-        data = self.coordinator.data or {}
-        devices = data.get("devices", {})
-        device = devices.get(self._mac, {})
-        return device.get("ip")
+        return self._view.ip
 
     @property
     def mac_address(self) -> str:
@@ -193,48 +292,17 @@ class ZteDeviceTrackerEntity(CoordinatorEntity, ScannerEntity):
     @property
     def hostname(self) -> str | None:
         """Return the hostname of the device."""
-        data = self.coordinator.data or {}
-        devices = data.get("devices", {})
-        device = devices.get(self._mac, {})
-        return device.get("name")
+        return self._view.name
 
     @property
     def icon(self) -> str | None:
         """Return the icon for the device."""
-        data = self.coordinator.data or {}
-        devices = data.get("devices", {})
-        device = devices.get(self._mac, {})
-        network_type = device.get("network_type")
-        icon_type = device.get("icon_type")
-        # Prefer network_type for icon selection
-        if network_type == "LAN":
-            return "mdi:lan"
-        elif network_type == "WLAN":
-            return "mdi:wifi"
-        # Fallback to icon_type if available
-        if icon_type:
-            return ICONS.get(icon_type, "mdi:devices")
-        return "mdi:devices"
+        return self._view.icon
 
     @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def extra_state_attributes(self) -> Mapping[str, Any]:
         """Return additional attributes."""
-        data = self.coordinator.data or {}
-        devices = data.get("devices", {})
-        device = devices.get(self._mac, {})
-
-        return {
-            "mac_address": self._mac,
-            "ip_address": device.get("ip"),
-            "hostname": device.get("name"),
-            "network_type": device.get("network_type"),
-            "icon_type": device.get("icon_type"),
-            "last_seen": device.get("last_seen"),
-            "port": device.get("port"),
-            "link_time": device.get("LinkTime"),
-            "connect_time": device.get("ConnectTime"),
-            "mesh_node": device.get("mesh_node"),
-        }
+        return self._view.attributes
 
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
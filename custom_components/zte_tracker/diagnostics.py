@@ -0,0 +1,35 @@
+"""Diagnostics support for ZTE Tracker."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import ZteDataCoordinator
+
+TO_REDACT = {CONF_HOST, CONF_PASSWORD, CONF_USERNAME, "host"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: ZteDataCoordinator = hass.data[DOMAIN][entry.entry_id]
+    data = coordinator.data or {}
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "router_info": async_redact_data(data.get("router_info", {}), TO_REDACT),
+        "devices": len(data.get("devices", {})),
+        "timing": coordinator.instrumentation.snapshot(),
+        "connections": coordinator.client.connection_stats(),
+        "supported_groups": coordinator.client.profile.supported_groups(),
+        "fetch_strategies": coordinator.client.strategies.stats(),
+    }
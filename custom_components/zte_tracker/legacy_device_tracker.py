@@ -10,7 +10,7 @@ from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
 from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN, ICONS
-from .zteclient.zte_client import zteClient
+from .zteclient.zte_client import UNCHANGED, zteClient
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -126,6 +126,8 @@ class zteDeviceScanner(DeviceScanner):
                 return []
             
             device_list = self.router_client.get_devices_response()
+            if device_list is UNCHANGED:
+                device_list = self.router_client.last_devices()
         except Exception as ex:
             _LOGGER.error("Error getting device data: %s", ex)
             return []
@@ -0,0 +1,164 @@
+"""Data structures shared by the ZTE Tracker coordinator and platforms."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+from typing import Any
+
+from .const import ICONS
+from .zteclient.device_record import DeviceRecord
+
+# Device fields that change on every poll without the device changing:
+# last_seen is bumped for every active device, so it doesn't count as a
+# change on its own.
+VOLATILE_FIELDS = frozenset({"last_seen"})
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceDelta:
+    """What changed in the device list between two polls.
+
+    ``changed_fields`` maps each MAC present in both polls to the names of
+    the fields that differ, excluding ``active`` (reported through
+    ``went_active``/``went_inactive``) and VOLATILE_FIELDS.
+    """
+
+    added: frozenset[str] = frozenset()
+    removed: frozenset[str] = frozenset()
+    went_active: frozenset[str] = frozenset()
+    went_inactive: frozenset[str] = frozenset()
+    changed_fields: Mapping[str, frozenset[str]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        """Return True if anything changed."""
+        return bool(
+            self.added
+            or self.removed
+            or self.went_active
+            or self.went_inactive
+            or self.changed_fields
+        )
+
+    @property
+    def updated(self) -> frozenset[str]:
+        """Return MACs present in both polls whose data changed."""
+        return self.went_active | self.went_inactive | frozenset(self.changed_fields)
+
+
+EMPTY_DELTA = DeviceDelta()
+
+
+def compute_delta(
+    previous: Mapping[str, DeviceRecord] | None,
+    current: Mapping[str, DeviceRecord],
+) -> DeviceDelta:
+    """Compare two coordinator device dicts keyed by MAC."""
+    if previous is current:
+        return EMPTY_DELTA
+    if not previous:
+        return DeviceDelta(added=frozenset(current))
+
+    went_active = set()
+    went_inactive = set()
+    changed_fields: dict[str, frozenset[str]] = {}
+    for mac, device in current.items():
+        old = previous.get(mac)
+        if old is None or old is device:
+            continue
+        was_active = bool(old.get("active"))
+        if bool(device.get("active")) != was_active:
+            (went_inactive if was_active else went_active).add(mac)
+        fields = frozenset(
+            key
+            for key in device.keys() | old.keys()
+            if key != "active"
+            and key not in VOLATILE_FIELDS
+            and device.get(key) != old.get(key)
+        )
+        if fields:
+            changed_fields[mac] = fields
+
+    return DeviceDelta(
+        added=frozenset(current.keys() - previous.keys()),
+        removed=frozenset(previous.keys() - current.keys()),
+        went_active=frozenset(went_active),
+        went_inactive=frozenset(went_inactive),
+        changed_fields=changed_fields,
+    )
+
+
+def device_icon(network_type: str | None, icon_type: str | None) -> str:
+    """Return the tracker icon for a device."""
+    # Prefer network_type for icon selection
+    if network_type == "LAN":
+        return "mdi:lan"
+    if network_type == "WLAN":
+        return "mdi:wifi"
+    # Fallback to icon_type if available
+    if icon_type:
+        return ICONS.get(icon_type, "mdi:devices")
+    return "mdi:devices"
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceView:
+    """Read-only state of one tracked device, built once per poll.
+
+    Entities hand out ``icon`` and ``attributes`` by reference instead of
+    looking the device up and rebuilding them on every state write.
+    """
+
+    mac: str
+    name: str | None
+    ip: str | None
+    active: bool
+    icon: str
+    attributes: Mapping[str, Any]
+
+    @classmethod
+    def from_device(cls, mac: str, device: DeviceRecord) -> DeviceView:
+        """Build the view of a coordinator device record."""
+        return cls(
+            mac=mac,
+            name=device.name,
+            ip=device.ip,
+            active=device.active,
+            icon=device_icon(device.network_type, device.icon_type),
+            attributes=MappingProxyType(
+                {
+                    "mac_address": mac,
+                    "ip_address": device.ip,
+                    "hostname": device.name,
+                    "network_type": device.network_type,
+                    "icon_type": device.icon_type,
+                    "last_seen": device.last_seen,
+                    "port": device.port,
+                    "link_time": device.link_time,
+                    "connect_time": device.connect_time,
+                    "mesh_node": device.mesh_node,
+                }
+            ),
+        )
+
+    def as_inactive(self) -> DeviceView:
+        """Return this view for a device the router no longer reports."""
+        return self if not self.active else replace(self, active=False)
+
+
+def build_views(
+    devices: Mapping[str, DeviceRecord],
+    previous_devices: Mapping[str, DeviceRecord] | None = None,
+    previous_views: Mapping[str, DeviceView] | None = None,
+) -> dict[str, DeviceView]:
+    """Build the views of a poll, reusing those of untouched device entries."""
+    previous_devices = previous_devices or {}
+    previous_views = previous_views or {}
+    views = {}
+    for mac, device in devices.items():
+        view = previous_views.get(mac)
+        if view is None or previous_devices.get(mac) is not device:
+            view = DeviceView.from_device(mac, device)
+        views[mac] = view
+    return views
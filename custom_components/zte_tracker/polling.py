@@ -0,0 +1,246 @@
+"""Controllers that pick the coordinator's polling interval."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+POLL_CONTROLLER_ADAPTIVE = "adaptive"
+POLL_CONTROLLER_STABLE_COUNT = "stable_count"
+
+
+@dataclass(frozen=True, slots=True)
+class PollSample:
+    """What one poll observed."""
+
+    device_count: int  # active devices
+    churn: int  # devices that arrived or left since the previous poll
+    latency: float | None  # seconds the router fetch took
+    ok: bool
+    at: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class PollDecision:
+    """The interval a controller picked and why."""
+
+    interval: timedelta
+    reason: str
+    details: dict[str, Any] = field(default_factory=dict)
+
+    def as_attributes(self) -> dict[str, Any]:
+        """Return the decision as state attributes."""
+        return {
+            "interval": self.interval.total_seconds(),
+            "reason": self.reason,
+            **self.details,
+        }
+
+
+class PollingController(ABC):
+    """Pick the next polling interval from what the last poll observed."""
+
+    name: str
+
+    def __init__(
+        self,
+        min_interval: timedelta,
+        max_interval: timedelta,
+        default_interval: timedelta,
+    ) -> None:
+        """Initialize the controller; max is raised to min if below it."""
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.interval = min(max(default_interval, self.min_interval), self.max_interval)
+
+    def _clamp(self, seconds: float) -> timedelta:
+        return min(
+            max(timedelta(seconds=seconds), self.min_interval), self.max_interval
+        )
+
+    @abstractmethod
+    def update(self, sample: PollSample) -> PollDecision:
+        """Take one poll into account and return the next interval."""
+
+
+class StableCountController(PollingController):
+    """The original heuristic: slow down while the device count holds.
+
+    Polls at the minimum interval for two polls after the active device
+    count changes, at the maximum after more than five unchanged polls,
+    and at the default interval in between.
+    """
+
+    name = POLL_CONTROLLER_STABLE_COUNT
+
+    def __init__(
+        self,
+        min_interval: timedelta,
+        max_interval: timedelta,
+        default_interval: timedelta,
+    ) -> None:
+        """Initialize the controller."""
+        super().__init__(min_interval, max_interval, default_interval)
+        self._default_interval = self.interval
+        self._last_device_count = 0
+        self._stable_count = 0
+
+    def update(self, sample: PollSample) -> PollDecision:
+        """Count stable polls and pick one of the three intervals."""
+        if sample.device_count == self._last_device_count:
+            self._stable_count += 1
+        else:
+            self._stable_count = 0
+            self._last_device_count = sample.device_count
+
+        if self._stable_count > 5:
+            self.interval, reason = self.max_interval, "stable"
+        elif self._stable_count < 2:
+            self.interval, reason = self.min_interval, "changed"
+        else:
+            self.interval, reason = self._default_interval, "settling"
+        return PollDecision(
+            self.interval,
+            reason,
+            {"controller": self.name, "stable_count": self._stable_count},
+        )
+
+
+class AdaptiveController(PollingController):
+    """Poll fast while devices come and go, back off when quiet or failing.
+
+    - Churn (arrivals and departures) resets the interval to the minimum.
+      Quiet polls grow it by up to QUIET_GROWTH per poll, less while the
+      EWMA churn rate is still high.
+    - The interval never goes below LATENCY_MULTIPLE times the EWMA fetch
+      latency, so a slow router isn't kept busy.
+    - Failed polls back off by (1 + EWMA error rate) per poll.
+    - Hours of the day with churn in past days (a per-hour EWMA folded in
+      when the hour ends) cap the interval at the default, so polling stays
+      responsive when people usually arrive or leave; other hours, such as
+      the night, may go up to the maximum.
+    """
+
+    name = POLL_CONTROLLER_ADAPTIVE
+
+    CHURN_ALPHA = 0.5
+    LATENCY_ALPHA = 0.3
+    ERROR_ALPHA = 0.3
+    HISTORY_ALPHA = 0.3
+    QUIET_GROWTH = 1.5
+    LATENCY_MULTIPLE = 10
+    BUSY_HOUR_CHURN = 2.0
+
+    def __init__(
+        self,
+        min_interval: timedelta,
+        max_interval: timedelta,
+        default_interval: timedelta,
+    ) -> None:
+        """Initialize the controller."""
+        super().__init__(min_interval, max_interval, default_interval)
+        self._busy_ceiling = self.interval
+        self._churn_rate = 0.0
+        self._latency: float | None = None
+        self._error_rate = 0.0
+        # Churn per hour of the day, across days; None until observed
+        self._hour_churn: list[float | None] = [None] * 24
+        self._hour: int | None = None
+        self._hour_total = 0
+
+    def _record_hour(self, sample: PollSample) -> float | None:
+        """Add the sample to the hourly history; return this hour's history."""
+        hour = sample.at.hour
+        if hour != self._hour:
+            if self._hour is not None:
+                past = self._hour_churn[self._hour]
+                self._hour_churn[self._hour] = (
+                    self._hour_total
+                    if past is None
+                    else self.HISTORY_ALPHA * self._hour_total
+                    + (1 - self.HISTORY_ALPHA) * past
+                )
+            self._hour = hour
+            self._hour_total = 0
+        self._hour_total += sample.churn
+        return self._hour_churn[hour]
+
+    def update(self, sample: PollSample) -> PollDecision:
+        """Weigh churn, latency, errors and the hour's history."""
+        current = self.interval.total_seconds()
+        self._churn_rate = (
+            self.CHURN_ALPHA * sample.churn + (1 - self.CHURN_ALPHA) * self._churn_rate
+        )
+        self._error_rate = (
+            self.ERROR_ALPHA * (not sample.ok)
+            + (1 - self.ERROR_ALPHA) * self._error_rate
+        )
+        if sample.latency is not None:
+            self._latency = (
+                sample.latency
+                if self._latency is None
+                else self.LATENCY_ALPHA * sample.latency
+                + (1 - self.LATENCY_ALPHA) * self._latency
+            )
+        hour_churn = self._record_hour(sample)
+        busy_hour = hour_churn is not None and hour_churn >= self.BUSY_HOUR_CHURN
+        ceiling = self._busy_ceiling if busy_hour else self.max_interval
+
+        if not sample.ok:
+            seconds = current * (1 + self._error_rate)
+            reason = "error backoff"
+        elif sample.churn:
+            seconds = self.min_interval.total_seconds()
+            reason = "churn"
+        else:
+            growth = 1 + (self.QUIET_GROWTH - 1) / (1 + self._churn_rate)
+            seconds = current * growth
+            reason = "quiet"
+            if seconds > ceiling.total_seconds():
+                seconds = ceiling.total_seconds()
+                reason = "busy hour" if busy_hour else "quiet"
+
+        if self._latency is not None:
+            floor = self._latency * self.LATENCY_MULTIPLE
+            if floor > seconds:
+                seconds = floor
+                reason = "latency floor"
+
+        self.interval = self._clamp(seconds)
+        return PollDecision(
+            self.interval,
+            reason,
+            {
+                "controller": self.name,
+                "churn": sample.churn,
+                "churn_rate": round(self._churn_rate, 3),
+                "latency": None if self._latency is None else round(self._latency, 3),
+                "error_rate": round(self._error_rate, 3),
+                "hour_churn": None if hour_churn is None else round(hour_churn, 2),
+            },
+        )
+
+
+POLL_CONTROLLERS: dict[str, type[PollingController]] = {
+    POLL_CONTROLLER_ADAPTIVE: AdaptiveController,
+    POLL_CONTROLLER_STABLE_COUNT: StableCountController,
+}
+
+
+def create_controller(
+    name: str,
+    min_interval: timedelta,
+    max_interval: timedelta,
+    default_interval: timedelta,
+) -> PollingController:
+    """Return a new controller by name, falling back to the adaptive one."""
+    controller_class = POLL_CONTROLLERS.get(name)
+    if controller_class is None:
+        _LOGGER.warning("Unknown polling controller %s; using adaptive", name)
+        controller_class = AdaptiveController
+    return controller_class(min_interval, max_interval, default_interval)
@@ -0,0 +1,189 @@
+"""Passive DHCP/ARP listener that reports devices joining the network."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import ctypes
+import logging
+import socket
+import struct
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+PRESENCE_DATA = f"{DOMAIN}_presence"
+
+ETH_P_ALL = 0x0003
+ETH_P_ARP = 0x0806
+ETH_P_IP = 0x0800
+SO_ATTACH_FILTER = 26
+DHCP_SERVER_PORT = 67
+DHCP_MAGIC_COOKIE = b"\x63\x82\x53\x63"
+
+# Classic BPF program equivalent to "arp or (udp dst port 67)", so the
+# kernel only hands us ARP and DHCP client frames instead of all traffic.
+_BPF_FILTER = (
+    (0x28, 0, 0, 0x0000000C),  # ldh [12]            ethertype
+    (0x15, 8, 0, ETH_P_ARP),  # jeq ARP             -> accept
+    (0x15, 0, 8, ETH_P_IP),  # jeq IPv4            else drop
+    (0x30, 0, 0, 0x00000017),  # ldb [23]            IP protocol
+    (0x15, 0, 6, 0x00000011),  # jeq UDP             else drop
+    (0x28, 0, 0, 0x00000014),  # ldh [20]            fragment offset
+    (0x45, 4, 0, 0x00001FFF),  # jset 0x1fff         fragment -> drop
+    (0xB1, 0, 0, 0x0000000E),  # ldxb 4*([14]&0xf)   IP header length
+    (0x48, 0, 0, 0x00000010),  # ldh [x+16]          UDP dst port
+    (0x15, 0, 1, DHCP_SERVER_PORT),  # jeq 67        else drop
+    (0x06, 0, 0, 0x00040000),  # ret accept
+    (0x06, 0, 0, 0x00000000),  # ret drop
+)
+
+
+def _format_mac(raw: bytes) -> str:
+    return ":".join(f"{octet:02X}" for octet in raw)
+
+
+def parse_frame(frame: bytes) -> str | None:
+    """Return the MAC of a device announcing itself in an Ethernet frame.
+
+    Recognizes DHCP client messages (the client hardware address) and
+    gratuitous ARP or ARP probes (the sender hardware address). Anything
+    else, including ordinary ARP traffic, returns None.
+    """
+    if len(frame) < 14:
+        return None
+    ethertype = struct.unpack_from("!H", frame, 12)[0]
+
+    if ethertype == ETH_P_ARP:
+        if len(frame) < 42:
+            return None
+        htype, ptype, hlen, plen = struct.unpack_from("!HHBB", frame, 14)
+        if htype != 1 or ptype != ETH_P_IP or hlen != 6 or plen != 4:
+            return None
+        sender_ip = frame[28:32]
+        target_ip = frame[38:42]
+        if sender_ip != target_ip and sender_ip != b"\x00\x00\x00\x00":
+            return None
+        return _format_mac(frame[22:28])
+
+    if ethertype == ETH_P_IP:
+        if len(frame) < 34 or frame[23] != socket.IPPROTO_UDP:
+            return None
+        ihl = (frame[14] & 0x0F) * 4
+        bootp = 14 + ihl + 8
+        if len(frame) < bootp + 240:
+            return None
+        dst_port = struct.unpack_from("!H", frame, 14 + ihl + 2)[0]
+        op, htype, hlen = frame[bootp], frame[bootp + 1], frame[bootp + 2]
+        if (
+            dst_port != DHCP_SERVER_PORT
+            or op != 1
+            or htype != 1
+            or hlen != 6
+            or frame[bootp + 236 : bootp + 240] != DHCP_MAGIC_COOKIE
+        ):
+            return None
+        return _format_mac(frame[bootp + 28 : bootp + 34])
+
+    return None
+
+
+class PresenceListener:
+    """Watch ARP and DHCP traffic on the Home Assistant host.
+
+    One raw AF_PACKET socket serves all subscribed config entries; it is
+    opened with the first subscriber and closed with the last. Needs Linux
+    and CAP_NET_RAW; without them the listener logs a warning once and
+    subscribers just keep polling.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the listener."""
+        self.hass = hass
+        self._subscribers: list[Callable[[str], None]] = []
+        self._sock: socket.socket | None = None
+        self._filter_buffer: ctypes.Array | None = None
+        self._unavailable = False
+
+    @callback
+    def async_subscribe(self, handler: Callable[[str], None]) -> Callable[[], None]:
+        """Call handler with the MAC of every announcing device."""
+        self._subscribers.append(handler)
+        if self._sock is None and not self._unavailable:
+            self._start()
+
+        @callback
+        def _unsubscribe() -> None:
+            self._subscribers.remove(handler)
+            if not self._subscribers:
+                self._stop()
+
+        return _unsubscribe
+
+    def _start(self) -> None:
+        """Open the raw socket and start reading it on the event loop."""
+        try:
+            sock = socket.socket(
+                socket.AF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_ALL)
+            )
+        except (AttributeError, OSError) as ex:
+            # AttributeError: no AF_PACKET on this platform
+            self._unavailable = True
+            _LOGGER.warning(
+                "DHCP/ARP presence listener unavailable, relying on polling: %s", ex
+            )
+            return
+        try:
+            self._attach_filter(sock)
+        except OSError as ex:
+            _LOGGER.debug("Could not attach BPF filter, parsing all frames: %s", ex)
+        sock.setblocking(False)
+        self._sock = sock
+        self.hass.loop.add_reader(sock.fileno(), self._read)
+        _LOGGER.debug("DHCP/ARP presence listener started")
+
+    def _attach_filter(self, sock: socket.socket) -> None:
+        """Attach _BPF_FILTER to the socket."""
+        program = b"".join(struct.pack("HBBI", *insn) for insn in _BPF_FILTER)
+        self._filter_buffer = ctypes.create_string_buffer(program)
+        fprog = struct.pack(
+            "HL", len(_BPF_FILTER), ctypes.addressof(self._filter_buffer)
+        )
+        sock.setsockopt(socket.SOL_SOCKET, SO_ATTACH_FILTER, fprog)
+
+    def _stop(self) -> None:
+        """Close the raw socket."""
+        if self._sock is None:
+            return
+        self.hass.loop.remove_reader(self._sock.fileno())
+        self._sock.close()
+        self._sock = None
+        self._filter_buffer = None
+        _LOGGER.debug("DHCP/ARP presence listener stopped")
+
+    def _read(self) -> None:
+        """Drain the socket and dispatch announcing MACs."""
+        while self._sock is not None:
+            try:
+                frame = self._sock.recv(2048)
+            except BlockingIOError:
+                return
+            except OSError as ex:
+                _LOGGER.debug("Presence listener read error: %s", ex)
+                return
+            mac = parse_frame(frame)
+            if mac is None:
+                continue
+            for handler in list(self._subscribers):
+                handler(mac)
+
+
+@callback
+def async_get_presence_listener(hass: HomeAssistant) -> PresenceListener:
+    """Return the presence listener shared by all ZTE config entries."""
+    listener = hass.data.get(PRESENCE_DATA)
+    if listener is None:
+        listener = hass.data[PRESENCE_DATA] = PresenceListener(hass)
+    return listener
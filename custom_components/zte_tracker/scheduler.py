@@ -0,0 +1,171 @@
+"""Domain-wide scheduling of the router polls of all ZTE coordinators."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import DEFAULT_MAX_CONCURRENT_POLLS, DOMAIN_DATA
+
+if TYPE_CHECKING:
+    from .coordinator import ZteDataCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Window of the polls_per_minute metric, in seconds
+THROUGHPUT_WINDOW = 60.0
+
+
+class ZtePollScheduler:
+    """Spread and bound the router fetches of all ZTE coordinators.
+
+    Coordinators keep their own refresh timers; each poll first waits in
+    wait_turn until a spacing after the poll before it, then runs its fetch
+    in fetch_slot, which holds one of max_concurrent slots while it runs.
+    A coordinator's next refresh is scheduled when its poll completes, so
+    polls that lined up once keep the phases they were spread to.
+    """
+
+    def __init__(self, max_concurrent: int = DEFAULT_MAX_CONCURRENT_POLLS) -> None:
+        """Initialize the scheduler.
+
+        max_concurrent is the slot count while no registered coordinator
+        sets its own (see the max_concurrent property).
+        """
+        self.default_max_concurrent = max_concurrent
+        self._coordinators: dict[str, ZteDataCoordinator] = {}
+        # Notified whenever a fetch frees its slot
+        self._slot_freed = asyncio.Condition()
+        self._next_start = 0.0
+        self._in_flight = 0
+        self._max_in_flight = 0
+        self._polls = 0
+        self._wait_total = 0.0
+        self._fetch_total = 0.0
+        self._completed: deque[float] = deque()
+
+    @property
+    def max_concurrent(self) -> int:
+        """Return the fetches allowed to run at once.
+
+        Each config entry has a max_concurrent_polls option; the scheduler
+        is shared, so the lowest one of the registered entries applies.
+        """
+        return min(
+            (
+                coordinator.max_concurrent_polls
+                for coordinator in self._coordinators.values()
+            ),
+            default=self.default_max_concurrent,
+        )
+
+    @property
+    def coordinators(self) -> list[ZteDataCoordinator]:
+        """Return the registered coordinators."""
+        return list(self._coordinators.values())
+
+    def register(self, coordinator: ZteDataCoordinator) -> Callable[[], None]:
+        """Schedule the polls of a coordinator; return the unregister callback."""
+        entry_id = coordinator.entry.entry_id
+        self._coordinators[entry_id] = coordinator
+        coordinator.scheduler = self
+
+        def _unregister() -> None:
+            if self._coordinators.get(entry_id) is coordinator:
+                del self._coordinators[entry_id]
+            coordinator.scheduler = None
+
+        return _unregister
+
+    def _spacing(self, coordinator: ZteDataCoordinator) -> float:
+        """Return the gap to keep after a fetch of this coordinator starts.
+
+        The interval is divided evenly between the routers, so their polls
+        end up at evenly spread phases of it. It is rounded to whole seconds,
+        as the coordinators' refresh timers drop the fraction of a second a
+        poll completed at.
+        """
+        if coordinator.update_interval is None or not self._coordinators:
+            return 0.0
+        interval = coordinator.update_interval.total_seconds()
+        return float(round(interval / len(self._coordinators)))
+
+    async def wait_turn(self, coordinator: ZteDataCoordinator) -> None:
+        """Wait until a spacing after the start of the poll before.
+
+        Coordinators call this before taking their client lock, so the
+        wait doesn't hold up a reboot or probe of the same router. First
+        refreshes are not spaced, so setting up many entries at startup
+        isn't delayed; they are spread from their second poll on.
+        """
+        if coordinator.data is None:
+            return
+        loop = asyncio.get_running_loop()
+        queued = loop.time()
+        start = max(queued, self._next_start)
+        self._next_start = start + self._spacing(coordinator)
+        if start > queued:
+            await asyncio.sleep(start - queued)
+            self._wait_total += loop.time() - queued
+
+    @asynccontextmanager
+    async def fetch_slot(self, coordinator: ZteDataCoordinator) -> AsyncIterator[None]:
+        """Hold a fetch slot, waiting for one if all are taken."""
+        loop = asyncio.get_running_loop()
+        queued = loop.time()
+        async with self._slot_freed:
+            await self._slot_freed.wait_for(
+                lambda: self._in_flight < self.max_concurrent
+            )
+            self._in_flight += 1
+        started = loop.time()
+        self._wait_total += started - queued
+        self._max_in_flight = max(self._max_in_flight, self._in_flight)
+        try:
+            yield
+        finally:
+            finished = loop.time()
+            self._in_flight -= 1
+            self._polls += 1
+            self._fetch_total += finished - started
+            self._completed.append(finished)
+            async with self._slot_freed:
+                # All waiters re-check: the limit may have been raised.
+                self._slot_freed.notify_all()
+
+    def metrics(self) -> dict[str, Any]:
+        """Return aggregate poll metrics across all registered routers."""
+        loop = asyncio.get_running_loop()
+        while self._completed and loop.time() - self._completed[0] > THROUGHPUT_WINDOW:
+            self._completed.popleft()
+        polls = self._polls or 1
+        return {
+            "routers": len(self._coordinators),
+            "routers_available": sum(
+                1 for coordinator in self._coordinators.values() if coordinator.available
+            ),
+            "polls": self._polls,
+            "polls_per_minute": round(
+                len(self._completed) * 60.0 / THROUGHPUT_WINDOW, 1
+            ),
+            "polls_in_flight": self._in_flight,
+            "max_concurrent_polls": self.max_concurrent,
+            "max_polls_in_flight": self._max_in_flight,
+            "avg_poll_wait": round(self._wait_total / polls, 3),
+            "avg_poll_duration": round(self._fetch_total / polls, 3),
+        }
+
+
+def async_get_scheduler(hass: HomeAssistant) -> ZtePollScheduler:
+    """Return the scheduler shared by all ZTE config entries."""
+    scheduler = hass.data.get(DOMAIN_DATA)
+    if scheduler is None:
+        scheduler = hass.data[DOMAIN_DATA] = ZtePollScheduler()
+        _LOGGER.debug("Created poll scheduler")
+    return scheduler
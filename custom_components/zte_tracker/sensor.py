@@ -4,8 +4,13 @@ from __future__ import annotations
 
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -28,6 +33,7 @@ async def async_setup_entry(
         [
             ZteRouterSensor(coordinator, entry),
             ZteDeviceCountSensor(coordinator, entry),
+            ZtePollTimingSensor(coordinator, entry),
         ]
     )
 
@@ -91,7 +97,7 @@ class ZteDeviceCountSensor(ZteBaseSensor):
         """Return the number of connected devices."""
         data = self.coordinator.data or {}
         devices = data.get("devices", {})
-        return len([d for d in devices.values() if d.get("active")])
+        return sum(1 for d in devices.values() if d.active)
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -99,10 +105,43 @@ class ZteDeviceCountSensor(ZteBaseSensor):
         data = self.coordinator.data or {}
         devices = data.get("devices", {})
         device_list = [
-            f"{mac}({device.get('name', 'Unknown')}-{device.get('ip', '')})"
+            f"{mac}({device.name}-{device.ip})"
             for mac, device in devices.items()
         ]
         return {
             "devices": device_list,
-            "num_devices": len([d for d in devices.values() if d.get("active")]),
+            "num_devices": sum(1 for d in devices.values() if d.active),
         }
+
+
+class ZtePollTimingSensor(ZteBaseSensor):
+    """Diagnostic sensor with the duration of the last poll.
+
+    Attributes break polls down into phases (lock and executor waits,
+    login, fetches, parse, merge, listener dispatch) and router endpoints,
+    as histogram summaries.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _unrecorded_attributes = frozenset({"phases", "endpoints"})
+
+    def __init__(self, coordinator: ZteDataCoordinator, entry: ConfigEntry) -> None:
+        """Initialize the poll timing sensor."""
+        super().__init__(coordinator, entry)
+        self._attr_name = f"ZTE Router {coordinator.client.host} Poll Duration"
+        self._attr_unique_id = f"{entry.entry_id}_poll_duration"
+        self._attr_icon = "mdi:timer-outline"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the duration of the last poll in milliseconds."""
+        seconds = self.coordinator.instrumentation.last_phases.get("poll")
+        return None if seconds is None else round(seconds * 1000, 1)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return per-phase and per-endpoint timing summaries."""
+        return self.coordinator.instrumentation.summary()
@@ -0,0 +1,144 @@
+"""Benchmarks of the poll hot path against replayed router responses.
+
+Run with ``pytest custom_components/zte_tracker/tests/benchmarks
+--benchmark-only``; save a baseline with ``--benchmark-autosave`` and
+compare later runs against it with ``--benchmark-compare``.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from custom_components.zte_tracker.coordinator import ZteDataCoordinator  # noqa: E402
+from custom_components.zte_tracker.device_tracker import (  # noqa: E402
+    ZteDeviceTrackerEntity,
+)
+from custom_components.zte_tracker.models import build_views, compute_delta  # noqa: E402
+from custom_components.zte_tracker.zteclient.zte_client import (  # noqa: E402
+    PARSE_MODE_STREAM,
+    PARSE_MODE_TREE,
+    zteClient,
+)
+
+from ..fake_router import device_xml  # noqa: E402
+from ..replay_router import (  # noqa: E402
+    RECORDED_MODELS,
+    ReplayRouter,
+    serve_in_thread,
+    synthetic_devices,
+    synthetic_recording,
+)
+
+DEVICE_COUNTS = (10, 100, 500, 2000)
+# Share of devices that change state between two polls
+CHURN = 0.1
+
+
+def _wlan_body(count: int) -> str:
+    return device_xml("OBJ_WLAN_AD_ID", synthetic_devices(count, lan_share=0)[1])
+
+
+def _records(count: int):
+    client = zteClient("127.0.0.1", "admin", "secret", "F6640")
+    return client.parse_devices(_wlan_body(count), "OBJ_WLAN_AD_ID", "WLAN")
+
+
+def _churned(records):
+    """Return fresh copies of records with CHURN of them flipped."""
+    step = max(1, round(1 / CHURN))
+    copies = [record.copy() for record in records]
+    for record in copies[::step]:
+        record.active = not record.active
+    return copies
+
+
+@pytest.fixture
+def coordinator(hass, mock_config_entry, mock_zte_client):
+    with patch(
+        "custom_components.zte_tracker.coordinator.zteClient",
+        return_value=mock_zte_client,
+    ):
+        return ZteDataCoordinator(hass, mock_config_entry)
+
+
+@pytest.mark.benchmark(group="poll")
+@pytest.mark.parametrize("count", DEVICE_COUNTS)
+@pytest.mark.parametrize("model", RECORDED_MODELS)
+def test_poll_latency(benchmark, model, count):
+    """End-to-end poll: login, fetch and parse everything, logout."""
+    replay = ReplayRouter(synthetic_recording(model, count))
+    with serve_in_thread(replay.app) as host:
+        client = zteClient(host, "admin", "secret", model, scheme="http")
+
+        def _poll():
+            # Parse every round rather than short-circuit unchanged replies
+            client._payload_hashes.clear()
+            assert client.login()
+            try:
+                return client.fetch_all()
+            finally:
+                client.logout()
+
+        result = benchmark.pedantic(_poll, rounds=5, warmup_rounds=1)
+    assert len(result["devices"]) == count
+    assert not replay.misses
+
+
+@pytest.mark.benchmark(group="parse", max_time=0.25)
+@pytest.mark.parametrize("count", DEVICE_COUNTS)
+@pytest.mark.parametrize("parse_mode", (PARSE_MODE_STREAM, PARSE_MODE_TREE))
+def test_parse_throughput(benchmark, parse_mode, count):
+    """Parse one WLAN reply of count devices."""
+    body = _wlan_body(count)
+    client = zteClient("127.0.0.1", "admin", "secret", "F6640", parse_mode=parse_mode)
+    benchmark.extra_info["devices"] = count
+    benchmark.extra_info["bytes"] = len(body)
+    devices = benchmark(client.parse_devices, body, "OBJ_WLAN_AD_ID", "WLAN")
+    assert len(devices) == count
+
+
+@pytest.mark.benchmark(group="merge")
+@pytest.mark.parametrize("count", DEVICE_COUNTS)
+def test_merge_cost(benchmark, coordinator, count):
+    """Merge a poll into the cache, diff it and build the views."""
+    records = _records(count)
+    previous = coordinator._merge_device_data(records)
+    previous_views = build_views(previous)
+
+    def _merge(new_records):
+        devices = coordinator._merge_device_data(new_records)
+        compute_delta(previous, devices)
+        return build_views(devices, previous, previous_views)
+
+    views = benchmark.pedantic(
+        _merge, setup=lambda: ((_churned(records),), {}), rounds=50
+    )
+    assert len(views) == count
+
+
+@pytest.mark.benchmark(group="entities", max_time=0.25)
+@pytest.mark.parametrize("count", DEVICE_COUNTS)
+def test_entity_update_cost(benchmark, coordinator, mock_config_entry, count):
+    """Hand the changed trackers their views and compute their state."""
+    previous = coordinator._merge_device_data(_records(count))
+    previous_views = build_views(previous)
+    entities = {
+        mac: ZteDeviceTrackerEntity(coordinator, mock_config_entry, mac, view)
+        for mac, view in previous_views.items()
+    }
+    devices = coordinator._merge_device_data(_churned(list(previous.values())))
+    delta = compute_delta(previous, devices)
+    views = build_views(devices, previous, previous_views)
+    changed = delta.added | delta.updated | delta.removed
+
+    def _update():
+        for mac in changed:
+            entity = entities[mac]
+            entity.async_set_view(views[mac])
+            (entity.state, entity.state_attributes, entity.extra_state_attributes)
+
+    benchmark.extra_info["changed"] = len(changed)
+    benchmark(_update)
+    assert len(changed) == -(-count // round(1 / CHURN))
@@ -1,10 +1,15 @@
 """Common fixtures for ZTE Tracker tests."""
 import pytest
+import pytest_asyncio
 from unittest.mock import Mock
 
+from aiohttp.test_utils import TestServer
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_MODEL, CONF_PASSWORD, CONF_USERNAME
 
+from .fake_router import FakeRouter
+
 
 class MockHomeAssistant:
     """Mock HomeAssistant for testing."""
@@ -63,4 +68,15 @@ def mock_zte_client():
             "NetworkType": "WLAN",
         }
     ]
-    return client
\ No newline at end of file
+    return client
+
+
+@pytest_asyncio.fixture
+async def router():
+    """Run a fake ZTE router on a local port."""
+    fake = FakeRouter()
+    server = TestServer(fake.app)
+    await server.start_server()
+    fake.host = f"{server.host}:{server.port}"
+    yield fake
+    await server.close()
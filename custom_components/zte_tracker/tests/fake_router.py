@@ -0,0 +1,106 @@
+"""Minimal fake ZTE router web app for client tests."""
+
+from __future__ import annotations
+
+from collections import Counter
+
+from aiohttp import web
+
+
+def device_xml(node: str, devices: list[dict[str, str]]) -> str:
+    """Build a menuData device reply with ParaName/ParaValue pairs."""
+    instances = []
+    for device in devices:
+        pairs = "".join(
+            f"<ParaName>{name}</ParaName><ParaValue>{value}</ParaValue>"
+            for name, value in device.items()
+        )
+        instances.append(f"<Instance>{pairs}</Instance>")
+    return (
+        "<ajax_response_xml_root><IF_ERRORSTR>SUCC</IF_ERRORSTR>"
+        f"<{node}>{''.join(instances)}</{node}></ajax_response_xml_root>"
+    )
+
+
+LAN_DEVICES = [
+    {
+        "_InstID": "DEV.HOST1",
+        "MACAddress": "00:11:22:33:44:01",
+        "IPAddress": "192.168.1.10",
+        "HostName": "desktop",
+        "AliasName": "LAN1",
+    }
+]
+WLAN_DEVICES = [
+    {
+        "_InstID": "DEV.WIFI.AD1",
+        "MACAddress": "00:11:22:33:44:02",
+        "IPAddress": "192.168.1.11",
+        "HostName": "phone",
+        "ConnectTime": "2025/11/17 Mon 14:23:45",
+    }
+]
+WAN_XML = (
+    "<ajax_response_xml_root><IF_ERRORSTR>SUCC</IF_ERRORSTR><ID_WAN_COMFIG>"
+    "<Instance><ParaName>WANCName</ParaName><ParaValue>WAN_internet</ParaValue>"
+    "<ParaName>UpTime</ParaName><ParaValue>88760</ParaValue>"
+    "<ParaName>ConnStatus</ParaName><ParaValue>Connected</ParaValue></Instance>"
+    "</ID_WAN_COMFIG></ajax_response_xml_root>"
+)
+DETAILS_XML = (
+    "<ajax_response_xml_root><IF_ERRORSTR>SUCC</IF_ERRORSTR><OBJ_POWERONTIME_ID>"
+    "<Instance><ParaName>_InstID</ParaName><ParaValue>IGD</ParaValue>"
+    "<ParaName>PowerOnTime</ParaName><ParaValue>1234</ParaValue></Instance>"
+    "</OBJ_POWERONTIME_ID></ajax_response_xml_root>"
+)
+
+
+class FakeRouter:
+    """In-process F6640-like router answering the endpoints zteClient uses."""
+
+    def __init__(self) -> None:
+        self.hits: Counter[str] = Counter()
+        # Requests in the order they arrived
+        self.requests: list[str] = []
+        self.menu_data: dict[str, str] = {
+            "accessdev_landevs_lua.lua": device_xml("OBJ_ACCESSDEV_ID", LAN_DEVICES),
+            "wlan_client_stat_lua.lua": device_xml("OBJ_WLAN_AD_ID", WLAN_DEVICES),
+            "wan_internetstatus_lua.lua": WAN_XML,
+            "devmgr_statusmgr_lua.lua": DETAILS_XML,
+        }
+        # Answer the WLAN list only right after its menuView, like the
+        # firmwares that need the context request.
+        self.wlan_needs_view = False
+        self._last_tag = ""
+        self.app = web.Application()
+        self.app.router.add_route("*", "/", self._handle)
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        req_type = request.query.get("_type", "")
+        tag = request.query.get("_tag", "")
+        self.hits[f"{request.method} {req_type} {tag}"] += 1
+        self.requests.append(f"{request.method} {req_type} {tag}")
+        last_tag, self._last_tag = self._last_tag, tag
+
+        if (
+            self.wlan_needs_view
+            and tag == "wlan_client_stat_lua.lua"
+            and last_tag != "localNetStatus"
+        ):
+            return web.Response(status=500)
+
+        if req_type == "loginData":
+            if tag == "login_token":
+                return web.Response(
+                    text="<ajax_response_xml_root>token</ajax_response_xml_root>"
+                )
+            if tag == "login_entry" and request.method == "GET":
+                return web.json_response({"lockingTime": 0, "sess_token": "sess"})
+            if tag == "login_entry":
+                return web.json_response(
+                    {"login_need_refresh": 0, "lockingTime": 0, "loginErrMsg": ""}
+                )
+            return web.Response(text="")
+        if req_type == "menuData" and tag in self.menu_data:
+            return web.Response(text=self.menu_data[tag])
+        return web.Response(text="")
@@ -0,0 +1,181 @@
+"""Stand-in router that replays recorded responses."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+import json
+from pathlib import Path
+import random
+import ssl
+import threading
+
+from aiohttp import web
+
+from custom_components.zte_tracker.zteclient.recorder import (
+    RecordedResponse,
+    load_recording,
+    response_key,
+)
+from custom_components.zte_tracker.zteclient.model_registry import MODELS
+
+from .fake_router import DETAILS_XML, WAN_XML, device_xml
+
+RECORDINGS_DIR = Path(__file__).parent / "recordings"
+RECORDED_MODELS = ("F6640", "H288A", "H388X", "E2631")
+
+
+class ReplayRouter:
+    """Serve recorded responses with a configurable latency and jitter.
+
+    Each request waits ``latency`` plus a uniform ``jitter`` either way
+    (never below zero) before the recorded response of its endpoint is
+    sent. Endpoints missing from the recording get an empty reply.
+    """
+
+    def __init__(
+        self,
+        responses: dict[str, RecordedResponse],
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        self.responses = responses
+        self.latency = latency
+        self.jitter = jitter
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+        self._random = random.Random(seed)
+        self.app = web.Application()
+        self.app.router.add_route("*", "/", self._handle)
+
+    @classmethod
+    def from_file(cls, path: str | Path, **kwargs) -> ReplayRouter:
+        _, responses = load_recording(path)
+        return cls(responses, **kwargs)
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        delay = self.latency
+        if self.jitter:
+            delay += self._random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        key = response_key(request.method, str(request.url))
+        response = self.responses.get(key)
+        if response is None:
+            self.misses[key] += 1
+            return web.Response(text="")
+        self.hits[key] += 1
+        return web.Response(
+            status=response.status,
+            body=response.body.encode(),
+            headers=(
+                {"Content-Type": response.content_type}
+                if response.content_type
+                else None
+            ),
+        )
+
+
+@contextmanager
+def serve_in_thread(
+    app: web.Application, ssl_context: ssl.SSLContext | None = None
+) -> Iterator[str]:
+    """Run an aiohttp app on its own loop in a thread; yield host:port.
+
+    For driving the blocking zteClient from synchronous tests and
+    benchmarks without sharing their thread. Serves HTTPS when given
+    an ssl_context.
+    """
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(app)
+    started = threading.Event()
+    host: list[str] = []
+
+    async def _start() -> None:
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0, ssl_context=ssl_context)
+        await site.start()
+        port = runner.addresses[0][1]
+        host.append(f"127.0.0.1:{port}")
+
+    def _run() -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(_start())
+        started.set()
+        loop.run_forever()
+        loop.run_until_complete(runner.cleanup())
+        loop.close()
+
+    thread = threading.Thread(target=_run, daemon=True)
+    thread.start()
+    started.wait()
+    try:
+        yield host[0]
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+
+def _tag(value: str) -> str:
+    """Return the _tag of a model path entry (which may carry more params)."""
+    return value.split("&", 1)[0]
+
+
+def synthetic_devices(count: int, lan_share: float = 0.3) -> tuple[list, list]:
+    """Return count LAN and WLAN device parameter lists."""
+    lan_count = round(count * lan_share)
+    lan, wlan = [], []
+    for index in range(count):
+        mac = "02:00:00:" + ":".join(
+            f"{(index >> shift) & 0xFF:02X}" for shift in (16, 8, 0)
+        )
+        device = {
+            "_InstID": f"DEV.HOST{index}",
+            "MACAddress": mac,
+            "IPAddress": f"10.{index >> 16 & 0xFF}.{index >> 8 & 0xFF}.{index & 0xFF}",
+            "HostName": f"host-{index}",
+            "IconType": "phone",
+            "Active": "1",
+        }
+        if index < lan_count:
+            lan.append({**device, "AliasName": f"LAN{index % 4 + 1}"})
+        else:
+            wlan.append({**device, "ConnectTime": "2025/11/17 Mon 14:23:45"})
+    return lan, wlan
+
+
+def synthetic_recording(model: str, count: int) -> dict[str, RecordedResponse]:
+    """Build the responses a router of a model gives with count devices."""
+    endpoints = MODELS[model].endpoints()
+    lan, wlan = synthetic_devices(count)
+
+    def key(endpoint: str) -> str:
+        return f"GET {endpoints[endpoint].type}:{_tag(endpoints[endpoint].tag)}"
+
+    def xml(body: str) -> RecordedResponse:
+        return RecordedResponse(200, "application/xml", body)
+
+    def js(data: dict) -> RecordedResponse:
+        return RecordedResponse(200, "application/json", json.dumps(data))
+
+    return {
+        "GET loginData:login_entry": js({"lockingTime": 0, "sess_token": "sess"}),
+        "GET loginData:login_token": xml(
+            "<ajax_response_xml_root>token</ajax_response_xml_root>"
+        ),
+        "POST loginData:login_entry": js(
+            {"login_need_refresh": 0, "lockingTime": 0, "loginErrMsg": ""}
+        ),
+        "POST loginData:logout_entry": xml(""),
+        key("net_view"): xml(""),
+        key("lan"): xml(device_xml(MODELS[model].lan_id_element, lan)),
+        key("wlan"): xml(device_xml(MODELS[model].wlan_id_element, wlan)),
+        key("wan_view"): xml(""),
+        key("wan"): xml(WAN_XML),
+        key("details_view"): xml(""),
+        key("details"): xml(DETAILS_XML),
+    }
@@ -0,0 +1,81 @@
+"""Tests for the aiohttp-based AsyncZteClient."""
+
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.zte_tracker.zteclient.async_zte_client import AsyncZteClient
+from custom_components.zte_tracker.zteclient.zte_client import UNCHANGED
+
+from .fake_router import WLAN_DEVICES, device_xml
+
+
+def _client(router) -> AsyncZteClient:
+    return AsyncZteClient(router.host, "admin", "secret", "F6640", scheme="http")
+
+
+@pytest.mark.asyncio
+async def test_login_fetch_logout(router):
+    """A full poll runs on aiohttp and closes its session on logout."""
+    client = _client(router)
+    assert await client.login()
+    assert client.statusmsg == "Login successful."
+
+    devices = await client.get_devices_response()
+    by_mac = {d["MACAddress"]: d for d in devices}
+    assert by_mac["00:11:22:33:44:01"]["NetworkType"] == "LAN"
+    assert by_mac["00:11:22:33:44:01"]["Port"] == "LAN1"
+    assert by_mac["00:11:22:33:44:02"]["NetworkType"] == "WLAN"
+    assert by_mac["00:11:22:33:44:02"]["ConnectTime"] == "2025-11-17T14:23:45"
+
+    assert await client.get_wan_status() == {
+        "WAN_uptime": 88760,
+        "WAN_connected": True,
+    }
+    assert await client.get_router_details() == {"PowerOnTime": 1234}
+
+    session = client.session
+    await client.logout()
+    assert session.closed
+    assert client.session is None
+    assert client.login_data is None
+    assert router.hits["POST loginData logout_entry"] == 1
+
+
+@pytest.mark.asyncio
+async def test_login_unreachable_sets_statusmsg():
+    """Connection errors are reported through statusmsg like zteClient."""
+    client = AsyncZteClient("127.0.0.1:9", "admin", "secret", "F6640", scheme="http")
+    assert not await client.login()
+    assert "Cannot connect" in client.statusmsg
+    await client.logout()
+
+
+@pytest.mark.asyncio
+async def test_unchanged_payloads_skip_parse(router):
+    """Identical LAN/WLAN replies short-circuit to the UNCHANGED sentinel."""
+    client = _client(router)
+    assert await client.login()
+    first = await client.get_devices_response()
+    assert len(first) == 2
+
+    with patch.object(client, "parse_devices") as parse:
+        assert await client.get_devices_response() is UNCHANGED
+        parse.assert_not_called()
+    assert client.last_devices() == first
+
+    # A changed WLAN reply is parsed again; LAN comes from the last parse.
+    router.menu_data["wlan_client_stat_lua.lua"] = device_xml(
+        "OBJ_WLAN_AD_ID", WLAN_DEVICES + [{"MACAddress": "00:11:22:33:44:03"}]
+    )
+    devices = await client.get_devices_response()
+    assert [d["MACAddress"] for d in devices][-1] == "00:11:22:33:44:03"
+
+    # A failed fetch drops the cached hash so the next reply is parsed.
+    router.menu_data["wlan_client_stat_lua.lua"] = "<html>login</html>"
+    assert len(await client.get_devices_response()) == 1
+    router.menu_data["wlan_client_stat_lua.lua"] = device_xml(
+        "OBJ_WLAN_AD_ID", WLAN_DEVICES
+    )
+    assert await client.get_devices_response() == first
+    await client.logout()
@@ -0,0 +1,270 @@
+"""Tests for the endpoint capability probe."""
+
+from datetime import datetime, timedelta
+from functools import partial
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.zte_tracker import _entry_settings
+from custom_components.zte_tracker.config_flow import WrongModel, validate_input
+from custom_components.zte_tracker.const import CONF_CAPABILITIES
+from custom_components.zte_tracker.coordinator import ZteDataCoordinator
+from custom_components.zte_tracker.zteclient.capabilities import (
+    merge_capabilities,
+    probe_capabilities,
+)
+from custom_components.zte_tracker.zteclient.model_registry import MODELS
+from custom_components.zte_tracker.zteclient.recorder import RecordedResponse
+from custom_components.zte_tracker.zteclient.zte_client import zteClient
+
+from .replay_router import ReplayRouter, serve_in_thread, synthetic_recording
+
+DETAILS_XML = (
+    "<ajax_response_xml_root><IF_ERRORSTR>SUCC</IF_ERRORSTR><OBJ_DEVINFO_ID>"
+    "<Instance><ParaName>_InstID</ParaName><ParaValue>IGD</ParaValue>"
+    "<ParaName>SoftwareVer</ParaName><ParaValue>V9.0.10P24N1</ParaValue>"
+    "<ParaName>ModelName</ParaName><ParaValue>F6640</ParaValue></Instance>"
+    "</OBJ_DEVINFO_ID></ajax_response_xml_root>"
+)
+
+
+def _router(model: str, count: int = 4) -> ReplayRouter:
+    """Return a replayed router of a model reporting a firmware version."""
+    responses = synthetic_recording(model, count)
+    responses["GET menuData:devmgr_statusmgr_lua.lua"] = RecordedResponse(
+        200, "application/xml", DETAILS_XML
+    )
+    return ReplayRouter(responses)
+
+
+def _probe(host: str, model: str) -> dict:
+    client = zteClient(host, "admin", "secret", model, scheme="http")
+    assert client.login()
+    try:
+        return probe_capabilities(client)
+    finally:
+        client.logout()
+
+
+def test_probe_model_endpoints():
+    """A router serving its model's endpoints needs no overrides."""
+    with serve_in_thread(_router("F6640").app) as host:
+        capabilities = _probe(host, "F6640")
+    assert capabilities["model"] == "F6640"
+    assert capabilities["firmware"] == "V9.0.10P24N1"
+    assert capabilities["reported_model"] == "F6640"
+    assert capabilities["overrides"] == {}
+    # The replayed router has no mesh topology script
+    assert capabilities["unsupported"] == ["topology"]
+
+
+def test_probe_finds_other_scripts():
+    """Scripts of another model are found and polls only request those."""
+    replay = _router("H388X")
+    with serve_in_thread(replay.app) as host:
+        capabilities = _probe(host, "F6640")
+        assert capabilities["overrides"] == {
+            "wlan_script": "accessdev_ssiddev_lua.lua",
+            "wlan_id_element": "OBJ_ACCESSDEV_ID",
+            "tag_wan_status_data": "wan_internet_lua.lua&TypeUplink=2&pageType=1",
+        }
+
+        client = zteClient(
+            host,
+            "admin",
+            "secret",
+            "F6640",
+            scheme="http",
+            mesh_topology=True,
+            capabilities=capabilities,
+        )
+        replay.misses.clear()
+        assert client.login()
+        try:
+            result = client.fetch_all()
+        finally:
+            client.logout()
+    assert len(result["devices"]) == 4
+    assert result["wan"]["WAN_connected"] is True
+    assert not replay.misses
+
+
+def test_probe_failures_stay_unknown():
+    """Router errors and HTTP errors don't mark groups unsupported."""
+    replay = _router("F6640")
+    timeout = RecordedResponse(
+        200,
+        "application/xml",
+        "<ajax_response_xml_root><IF_ERRORSTR>SessionTimeout</IF_ERRORSTR>"
+        "</ajax_response_xml_root>",
+    )
+    replay.responses["GET menuData:wan_internetstatus_lua.lua"] = timeout
+    replay.responses["GET menuData:devmgr_statusmgr_lua.lua"] = RecordedResponse(
+        503, "text/plain", ""
+    )
+    with serve_in_thread(replay.app) as host:
+        capabilities = _probe(host, "F6640")
+    assert capabilities["unsupported"] == ["topology"]
+    assert capabilities["unknown"] == ["wan", "details"]
+    assert capabilities["firmware"] is None
+
+    previous = {
+        "model": "F6640",
+        "overrides": {"tag_wan_status_data": "wan_internet_lua.lua"},
+        "unsupported": ["details"],
+    }
+    merged = merge_capabilities(previous, capabilities)
+    assert merged["overrides"] == {"tag_wan_status_data": "wan_internet_lua.lua"}
+    assert merged["unsupported"] == ["details", "topology"]
+    assert merged["unknown"] == ["wan"]
+
+
+class _HttpClient(zteClient):
+    """zteClient of the config flow, talking plain HTTP to the replay."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, scheme="http", **kwargs)
+
+
+def _user_input(host: str, model: str) -> dict:
+    return {
+        "host": host,
+        "username": "admin",
+        "password": "secret",
+        "model": model,
+        "query_wan_status": True,
+        "query_router_details": True,
+    }
+
+
+_ROUTER_ERROR = RecordedResponse(
+    200,
+    "application/xml",
+    "<ajax_response_xml_root><IF_ERRORSTR>SessionTimeout</IF_ERRORSTR>"
+    "</ajax_response_xml_root>",
+)
+
+
+@pytest.mark.asyncio
+async def test_setup_probes_before_device_check(hass):
+    """Setup with another model selected uses the scripts the probe found."""
+    replay = _router("E2631")
+    # The selected model's device lists fail
+    for script in ("accessdev_landevs_lua.lua", "wlan_client_stat_lua.lua"):
+        replay.responses[f"GET menuData:{script}"] = _ROUTER_ERROR
+    with serve_in_thread(replay.app) as host, patch(
+        "custom_components.zte_tracker.config_flow.zteClient", _HttpClient
+    ):
+        info = await validate_input(hass, _user_input(host, "F6640"))
+    overrides = info["capabilities"]["overrides"]
+    assert overrides["lan_script"] == "localnet_lan_info_lua"
+    assert overrides["wlan_script"] == "vue_client_data"
+
+
+@pytest.mark.asyncio
+async def test_setup_reports_detected_model(hass):
+    """When no device list answers, setup names the model the router reports."""
+    replay = _router("H388X")
+    for script in (
+        "accessdev_landevs_lua.lua",
+        "accessdev_ssiddev_lua.lua",
+        "wlan_client_stat_lua.lua",
+    ):
+        replay.responses[f"GET menuData:{script}"] = _ROUTER_ERROR
+    replay.responses["GET menuData:devmgr_statusmgr_lua.lua"] = RecordedResponse(
+        200, "application/xml", DETAILS_XML.replace(">F6640<", ">H388X<")
+    )
+    with serve_in_thread(replay.app) as host, patch(
+        "custom_components.zte_tracker.config_flow.zteClient", _HttpClient
+    ):
+        with pytest.raises(WrongModel) as err:
+            await validate_input(hass, _user_input(host, "F6640"))
+    assert err.value.detected == "H388X"
+
+
+def test_with_capabilities():
+    """Probe results apply to their own model only."""
+    profile = MODELS["F6640"]
+    capabilities = {
+        "model": "F6640",
+        "overrides": {"wlan_script": "other.lua", "reboot_key": "x", "new": 1},
+        "unsupported": ["wan", "unknown"],
+    }
+    probed = profile.with_capabilities(capabilities)
+    assert probed.wlan_script == "other.lua"
+    assert probed.reboot_key == profile.reboot_key
+    assert probed.unsupported == {"wan"}
+    assert not probed.supports("wan")
+    assert MODELS["H288A"].with_capabilities(capabilities) is MODELS["H288A"]
+    assert profile.with_capabilities(None) is profile
+
+
+@pytest.mark.asyncio
+async def test_coordinator_reprobes_on_firmware_change(hass, mock_config_entry):
+    """A new firmware starts a probe whose results go to the entry."""
+    mock_config_entry.data = {
+        **mock_config_entry.data,
+        CONF_CAPABILITIES: {
+            "model": "F6640",
+            "firmware": "V9.0.10P24N1",
+            "probed_at": datetime.now().isoformat(),
+        },
+    }
+    coordinator = ZteDataCoordinator(hass, mock_config_entry)
+    coordinator._check_capabilities({"SoftwareVer": "V9.0.10P24N1"})
+    mock_config_entry.async_create_background_task.assert_not_called()
+    coordinator._check_capabilities({"SoftwareVer": "V9.1.0"})
+    mock_config_entry.async_create_background_task.assert_called_once()
+    mock_config_entry.async_create_background_task.call_args.args[1].close()
+
+    with serve_in_thread(_router("H388X").app) as host:
+        mock_config_entry.data = {**mock_config_entry.data, "host": host}
+        with patch(
+            "custom_components.zte_tracker.coordinator.zteClient",
+            partial(zteClient, scheme="http"),
+        ):
+            capabilities = await coordinator.async_probe_capabilities()
+    assert capabilities["firmware"] == "V9.0.10P24N1"
+    assert coordinator.client.profile.wlan_script == "accessdev_ssiddev_lua.lua"
+    data = hass.config_entries.async_update_entry.call_args.kwargs["data"]
+    assert data[CONF_CAPABILITIES] == capabilities
+
+
+@pytest.mark.parametrize(
+    ("stored", "age", "reprobe"),
+    [
+        ({}, timedelta(days=6), False),
+        ({}, timedelta(days=7), True),
+        ({"unknown": ["wan"]}, timedelta(minutes=10), False),
+        ({"unknown": ["wan"]}, timedelta(hours=1), True),
+        ({"firmware": None}, timedelta(hours=1), True),
+    ],
+)
+def test_coordinator_reprobes_periodically(
+    hass, mock_config_entry, stored, age, reprobe
+):
+    """Old probes, and incomplete ones after a while, are repeated."""
+    mock_config_entry.data = {
+        **mock_config_entry.data,
+        CONF_CAPABILITIES: {
+            "model": "F6640",
+            "firmware": "V9.0.10P24N1",
+            "probed_at": (datetime.now() - age).isoformat(),
+            **stored,
+        },
+    }
+    coordinator = ZteDataCoordinator(hass, mock_config_entry)
+    coordinator._check_capabilities({"SoftwareVer": "V9.0.10P24N1"})
+    assert mock_config_entry.async_create_background_task.called == reprobe
+    if reprobe:
+        mock_config_entry.async_create_background_task.call_args.args[1].close()
+
+
+def test_stored_probe_is_not_a_settings_change(mock_config_entry):
+    """Storing probe results doesn't look like an options change."""
+    before = _entry_settings(mock_config_entry)
+    mock_config_entry.data = {**mock_config_entry.data, CONF_CAPABILITIES: {}}
+    assert _entry_settings(mock_config_entry) == before
+    mock_config_entry.options = {**mock_config_entry.options, "prewarm_lead": 5}
+    assert _entry_settings(mock_config_entry) != before
@@ -0,0 +1,145 @@
+"""Tests for the connection pool kept across logins."""
+
+import datetime
+import ssl
+from unittest.mock import AsyncMock, patch
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+import pytest
+
+from custom_components.zte_tracker import async_unload_entry
+from custom_components.zte_tracker.const import DOMAIN
+from custom_components.zte_tracker.coordinator import ZteDataCoordinator
+from custom_components.zte_tracker.zteclient.async_zte_client import AsyncZteClient
+from custom_components.zte_tracker.zteclient.zte_client import zteClient
+
+from .replay_router import ReplayRouter, serve_in_thread, synthetic_recording
+
+
+@pytest.fixture
+def server_context(tmp_path):
+    """Return a TLS server context with a self-signed certificate."""
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "router")])
+    now = datetime.datetime.now(datetime.UTC)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(1)
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    cert_path, key_path = tmp_path / "cert.pem", tmp_path / "key.pem"
+    cert_path.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+    key_path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_path, key_path)
+    return context
+
+
+def _poll(client):
+    assert client.login(), client.statusmsg
+    try:
+        return client.fetch_all()
+    finally:
+        client.logout()
+
+
+def test_connections_kept_across_logins():
+    """Consecutive logins reuse the pooled connection."""
+    with serve_in_thread(ReplayRouter(synthetic_recording("F6640", 5)).app) as host:
+        client = zteClient(host, "admin", "secret", "F6640", scheme="http")
+        _poll(client)
+        _poll(client)
+        pools = client._pool.poolmanager.pools
+        [pool] = [pools[key] for key in pools.keys()]
+        assert pool.num_connections == 1
+        assert pool.num_requests > 1
+        client.close()
+    assert client._pool is None
+
+
+def test_tls_session_resumed(server_context):
+    """A new connection after the old one closed resumes its TLS session."""
+    replay = ReplayRouter(synthetic_recording("F6640", 5))
+    with serve_in_thread(replay.app, server_context) as host:
+        client = zteClient(host, "admin", "secret", "F6640", scheme="https")
+        first = _poll(client)
+        # As if the router had dropped the idle connection between polls
+        client._pool.close_pool()
+        assert _poll(client)["wan"] == first["wan"]
+        stats = client.connection_stats()
+        client.close()
+    assert stats["tls_handshakes"] == 2
+    assert stats["tls_resumed"] == 1
+
+
+@pytest.mark.parametrize("isolate_cookies", (True, False))
+def test_cookie_isolation(isolate_cookies):
+    """Cookies carry over to the next login only when not isolated."""
+    with serve_in_thread(ReplayRouter(synthetic_recording("F6640", 1)).app) as host:
+        client = zteClient(
+            host,
+            "admin",
+            "secret",
+            "F6640",
+            scheme="http",
+            isolate_cookies=isolate_cookies,
+        )
+        assert client.login()
+        client.session.cookies.set("SID", "abc")
+        client.logout()
+        assert client.login()
+        sid = client.session.cookies.get("SID")
+        client.logout()
+        client.close()
+    assert sid == (None if isolate_cookies else "abc")
+
+
+@pytest.mark.asyncio
+async def test_async_connector_kept_across_logins(router):
+    """AsyncZteClient sessions share one connector until close()."""
+    client = AsyncZteClient(
+        router.host, "admin", "secret", "F6640", scheme="http", pool_size=3
+    )
+    assert await client.login()
+    connector = client._connector
+    await client.logout()
+    assert not connector.closed
+    assert await client.login()
+    assert client._connector is connector
+    assert connector.limit == 3
+    await client.logout()
+    await client.close()
+    assert connector.closed
+
+
+@pytest.mark.asyncio
+async def test_unload_closes_pool_when_logout_fails(
+    hass, mock_config_entry, mock_zte_client
+):
+    """The pooled connections are closed even if the logout fails."""
+    with patch(
+        "custom_components.zte_tracker.coordinator.zteClient",
+        return_value=mock_zte_client,
+    ):
+        coordinator = ZteDataCoordinator(hass, mock_config_entry)
+    mock_zte_client.logout.side_effect = OSError("router gone")
+    hass.data[DOMAIN] = {mock_config_entry.entry_id: coordinator}
+    hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
+
+    assert await async_unload_entry(hass, mock_config_entry)
+    mock_zte_client.logout.assert_called_once()
+    mock_zte_client.close.assert_called_once()
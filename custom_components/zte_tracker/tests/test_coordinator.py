@@ -1,16 +1,28 @@
 """Test the ZTE Tracker coordinator."""
+import asyncio
+import json
+
 import pytest
-from unittest.mock import patch, Mock
+from unittest.mock import AsyncMock, patch, Mock
 from datetime import datetime, timedelta
 
 
 from custom_components.zte_tracker.const import CONF_REGISTER_NEW_DEVICES
 from custom_components.zte_tracker.coordinator import (
     FAST_UPDATE_INTERVAL,
+    LAST_SEEN_MAX_AGE,
+    QUERY_GROUP_INTERVALS,
+    QUERY_GROUP_MAX_AGE_INTERVALS,
     SLOW_UPDATE_INTERVAL,
     ZteDataCoordinator,
 )
+from custom_components.zte_tracker.models import compute_delta
 from custom_components.zte_tracker.switch import ZteRegisterNewDevicesSwitch
+from custom_components.zte_tracker.zteclient.device_record import (
+    DeviceRecord,
+    NetworkType,
+)
+from custom_components.zte_tracker.zteclient.zte_client import UNCHANGED
 
 
 def test_coordinator_pause_resume(hass, mock_config_entry, mock_zte_client):
@@ -123,3 +135,330 @@ async def test_register_new_devices_switch_updates_entry(
     hass.config_entries.async_update_entry.assert_called_once_with(
         mock_config_entry, options={CONF_REGISTER_NEW_DEVICES: False}
     )
+
+
+@pytest.mark.asyncio
+async def test_coordinator_query_group_cadence(hass, mock_config_entry, mock_zte_client):
+    """WAN and router details are refreshed on their own cadence and cached."""
+    mock_zte_client.fetch_all.side_effect = lambda topology, wan, details: {
+        "devices": mock_zte_client.get_devices_response.return_value,
+        "wan": {"WAN_uptime": 10} if wan else None,
+        "details": {"PowerOnTime": 20} if details else None,
+        "topology": None,
+    }
+    with patch("custom_components.zte_tracker.coordinator.zteClient", return_value=mock_zte_client):
+        coordinator = ZteDataCoordinator(hass, mock_config_entry)
+
+        data = await coordinator._async_update_data()
+        assert mock_zte_client.fetch_all.call_args.args == (False, True, True)
+        assert data["router_info"]["WAN_uptime"] == 10
+        assert data["router_info"]["PowerOnTime"] == 20
+
+        # Next poll: neither group is due, cached values are still reported.
+        data = await coordinator._async_update_data()
+        assert mock_zte_client.fetch_all.call_args.args == (False, False, False)
+        assert data["router_info"]["WAN_uptime"] == 10
+        assert data["router_info"]["PowerOnTime"] == 20
+
+        # Six minutes later only the WAN group is due again.
+        coordinator._group_fetched_at = {
+            group: fetched_at - timedelta(minutes=6)
+            for group, fetched_at in coordinator._group_fetched_at.items()
+        }
+        await coordinator._async_update_data()
+        assert mock_zte_client.fetch_all.call_args.args == (False, True, False)
+
+
+@pytest.mark.asyncio
+async def test_coordinator_failing_group_expires(hass, mock_config_entry, mock_zte_client):
+    """A group that keeps failing stops reporting its last good result."""
+    wan = {"WAN_uptime": 10}
+    mock_zte_client.fetch_all.side_effect = lambda topology, due_wan, details: {
+        "devices": mock_zte_client.get_devices_response.return_value,
+        "wan": dict(wan) if due_wan else None,
+        "details": None,
+        "topology": None,
+    }
+    with patch("custom_components.zte_tracker.coordinator.zteClient", return_value=mock_zte_client):
+        coordinator = ZteDataCoordinator(hass, mock_config_entry)
+        await coordinator._async_update_data()
+
+        # The WAN fetch fails from now on; the group is retried every poll
+        # and the cached value is reported with its fetch time.
+        wan.clear()
+        coordinator._group_fetched_at["wan"] -= QUERY_GROUP_INTERVALS["wan"]
+        fetched_at = coordinator._group_fetched_at["wan"].isoformat()
+        for _ in range(3):
+            data = await coordinator._async_update_data()
+            assert mock_zte_client.fetch_all.call_args.args == (False, True, True)
+            assert data["router_info"]["WAN_uptime"] == 10
+            assert data["router_info"]["wan_fetched_at"] == fetched_at
+
+        coordinator._group_fetched_at["wan"] -= (
+            QUERY_GROUP_INTERVALS["wan"] * QUERY_GROUP_MAX_AGE_INTERVALS
+        )
+        data = await coordinator._async_update_data()
+        assert "WAN_uptime" not in data["router_info"]
+        assert "wan_fetched_at" not in data["router_info"]
+
+
+@pytest.mark.asyncio
+async def test_coordinator_unchanged_poll(hass, mock_config_entry, mock_zte_client):
+    """An UNCHANGED poll reuses the published devices and bumps last_seen."""
+    results = {
+        "devices": mock_zte_client.get_devices_response.return_value,
+        "wan": None,
+        "details": None,
+        "topology": None,
+    }
+    mock_zte_client.fetch_all.side_effect = lambda *args: dict(results)
+    mock_zte_client.last_devices.return_value = results["devices"]
+    with patch("custom_components.zte_tracker.coordinator.zteClient", return_value=mock_zte_client):
+        coordinator = ZteDataCoordinator(hass, mock_config_entry)
+        coordinator.data = await coordinator._async_update_data()
+        first = coordinator.data
+
+        results["devices"] = UNCHANGED
+        with patch.object(coordinator, "_merge_device_data") as merge:
+            coordinator.data = await coordinator._async_update_data()
+            merge.assert_not_called()
+        assert coordinator.data["devices"] is first["devices"]
+        assert coordinator.data["router_info"]["last_update"] == first["router_info"]["last_update"]
+        assert coordinator.data["router_info"]["last_checked"] >= first["router_info"]["last_checked"]
+
+        # Once last_seen is LAST_SEEN_MAX_AGE old, active devices move it on.
+        coordinator._last_seen_at -= LAST_SEEN_MAX_AGE
+        coordinator.data = await coordinator._async_update_data()
+        for mac, device in coordinator.data["devices"].items():
+            previous = first["devices"][mac]
+            if previous.active:
+                assert device is not previous
+                assert device.last_seen > previous.last_seen
+                assert coordinator._device_cache[mac] is device
+            else:
+                assert device is previous
+        assert not compute_delta(first["devices"], coordinator.data["devices"])
+
+        # After a failed poll the cached parse is merged again.
+        results["devices"] = None
+        coordinator.data = await coordinator._async_update_data()
+        results["devices"] = UNCHANGED
+        coordinator.data = await coordinator._async_update_data()
+        assert "00:11:22:33:44:55" in coordinator.data["devices"]
+        assert coordinator.data["router_info"]["status"] == "connected"
+
+
+def test_compute_delta():
+    """The delta reports membership, activity and field changes per MAC."""
+    previous = {
+        "AA": {"active": True, "ip": "1", "last_seen": "t0"},
+        "BB": {"active": True, "ip": "2", "last_seen": "t0"},
+        "CC": {"active": False, "ip": "3", "last_seen": "t0"},
+        "DD": {"active": True, "ip": "4", "last_seen": "t0"},
+    }
+    current = {
+        "AA": {"active": True, "ip": "1", "last_seen": "t1"},
+        "BB": {"active": False, "ip": "2", "last_seen": "t0"},
+        "CC": {"active": True, "ip": "5", "last_seen": "t1"},
+        "EE": {"active": True, "ip": "6", "last_seen": "t1"},
+    }
+    delta = compute_delta(previous, current)
+    assert delta.added == {"EE"}
+    assert delta.removed == {"DD"}
+    assert delta.went_active == {"CC"}
+    assert delta.went_inactive == {"BB"}
+    assert delta.changed_fields == {"CC": {"ip"}}
+    assert delta.updated == {"BB", "CC"}
+
+    assert not compute_delta(current, current)
+    assert not compute_delta(current, {mac: dict(d) for mac, d in current.items()})
+    assert compute_delta(None, current).added == set(current)
+
+
+@pytest.mark.asyncio
+async def test_coordinator_publishes_delta(hass, mock_config_entry, mock_zte_client):
+    """Each poll carries a delta against the previously published devices."""
+    results = {
+        "devices": mock_zte_client.get_devices_response.return_value,
+        "wan": None,
+        "details": None,
+        "topology": None,
+    }
+    mock_zte_client.fetch_all.side_effect = lambda *args: dict(results)
+    with patch("custom_components.zte_tracker.coordinator.zteClient", return_value=mock_zte_client):
+        coordinator = ZteDataCoordinator(hass, mock_config_entry)
+        coordinator.data = await coordinator._async_update_data()
+        assert coordinator.data["delta"].added == {"00:11:22:33:44:55"}
+
+        coordinator.data = await coordinator._async_update_data()
+        assert not coordinator.data["delta"]
+
+        results["devices"] = []
+        coordinator.data = await coordinator._async_update_data()
+        assert coordinator.data["delta"].went_inactive == {"00:11:22:33:44:55"}
+
+
+def _legacy_entry(record):
+    """The per-device dict the coordinator cached before DeviceRecord."""
+    return {
+        "name": record.name,
+        "ip": record.ip,
+        "mac": record.mac,
+        "active": record.active,
+        "icon_type": record.icon_type,
+        "network_type": str(record.network_type),
+        "last_seen": datetime.now().isoformat(),
+        "port": record.port,
+        "LinkTime": record.link_time,
+        "ConnectTime": record.connect_time,
+        "mesh_node": record.mesh_node,
+    }
+
+
+def test_device_record_memory_benchmark(hass, mock_config_entry, mock_zte_client):
+    """A 500-device cache of records takes less memory than the old dicts."""
+    import tracemalloc
+
+    from custom_components.zte_tracker.zteclient.zte_client import zteClient
+
+    from .test_parse_devices import synthetic_payload
+
+    client = zteClient("192.168.1.1", "admin", "secret", "F6640")
+    payload = synthetic_payload(500)
+    with patch("custom_components.zte_tracker.coordinator.zteClient", return_value=mock_zte_client):
+        coordinator = ZteDataCoordinator(hass, mock_config_entry)
+
+    records = coordinator._merge_device_data(client.parse_devices(payload))
+    # Field values are the same strings in both cases; this measures the
+    # per-device containers the cache keeps.
+    tracemalloc.start()
+    cache = {mac: record.copy() for mac, record in records.items()}
+    cache_size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    tracemalloc.start()
+    legacy = {mac: _legacy_entry(record) for mac, record in records.items()}
+    legacy_size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(cache) == len(legacy) == 500
+    assert cache_size < legacy_size / 2
+
+
+@pytest.mark.asyncio
+async def test_coordinator_persisted_cache(hass, mock_config_entry, mock_zte_client):
+    """Changed polls are saved; a restart serves the saved devices if offline."""
+    store = Mock()
+    hass.async_create_task = lambda coro, name=None: asyncio.ensure_future(coro)
+    mock_zte_client.fetch_all.side_effect = lambda *args: {
+        "devices": mock_zte_client.get_devices_response.return_value,
+        "wan": None,
+        "details": None,
+        "topology": None,
+    }
+    with patch(
+        "custom_components.zte_tracker.coordinator.zteClient", return_value=mock_zte_client
+    ), patch("custom_components.zte_tracker.coordinator.Store", return_value=store):
+        store.async_load = AsyncMock(return_value=None)
+        coordinator = ZteDataCoordinator(hass, mock_config_entry)
+        coordinator.async_start_cache_load()
+        coordinator.data = await coordinator._async_update_data()
+        store.async_delay_save.assert_called_once()
+        saved = store.async_delay_save.call_args.args[0]()
+
+        # Unchanged polls don't write.
+        coordinator.data = await coordinator._async_update_data()
+        store.async_delay_save.assert_called_once()
+
+        # After a restart with the router offline, the saved devices are served.
+        store.async_load = AsyncMock(return_value=json.loads(json.dumps(saved)))
+        mock_zte_client.fetch_all.side_effect = lambda *args: {
+            "devices": None,
+            "wan": None,
+            "details": None,
+            "topology": None,
+        }
+        coordinator = ZteDataCoordinator(hass, mock_config_entry)
+        coordinator.async_start_cache_load()
+        data = await coordinator._async_update_data()
+        device = data["devices"]["00:11:22:33:44:55"]
+        assert data["router_info"]["status"] == "unavailable"
+        assert device.name == "TestDevice"
+        assert device.network_type is NetworkType.WLAN
+
+
+def test_coordinator_cache_eviction(hass, mock_config_entry, mock_zte_client):
+    """Inactive devices expire or are evicted LRU, tracked ones last."""
+    mock_config_entry.options = {"cache_max_devices": 3, "cache_inactive_ttl": 1}
+    with patch("custom_components.zte_tracker.coordinator.zteClient", return_value=mock_zte_client):
+        coordinator = ZteDataCoordinator(hass, mock_config_entry)
+    coordinator.tracked_macs = {"AA", "BB"}
+    now = datetime.now()
+    for mac, hours_ago in (("AA", 5), ("BB", 0.1), ("CC", 5), ("DD", 0.2), ("EE", 0.3)):
+        coordinator._device_cache[mac] = DeviceRecord(
+            mac=mac, active=False, last_seen=(now - timedelta(hours=hours_ago)).isoformat()
+        )
+
+    processed = coordinator._merge_device_data([{"MACAddress": "FF", "Active": True}])
+    # CC expired; DD and EE (untracked) go before the stale tracked AA.
+    assert set(processed) == {"AA", "BB", "FF"}
+    assert coordinator.evicted_devices == 3
+
+    # Reported and still-active devices are never evicted.
+    coordinator._cache_max_devices = 1
+    processed = coordinator._merge_device_data([{"MACAddress": "FF", "Active": True}])
+    assert set(processed) == {"FF"}
+    assert coordinator.evicted_devices == 5
+
+
+@pytest.mark.asyncio
+async def test_coordinator_prewarm(hass, mock_config_entry, mock_zte_client):
+    """A pre-warmed login is used by the next poll, then logged out."""
+    with patch("custom_components.zte_tracker.coordinator.zteClient", return_value=mock_zte_client):
+        coordinator = ZteDataCoordinator(hass, mock_config_entry)
+    mock_zte_client.fetch_all.side_effect = lambda *args: {
+        "devices": [DeviceRecord(mac="AA", active=True)],
+        "wan": None,
+        "details": None,
+        "topology": None,
+    }
+
+    with patch("custom_components.zte_tracker.coordinator.async_call_later") as call_later:
+        coordinator.update_interval = timedelta(seconds=60)
+        # Off by default
+        coordinator._schedule_prewarm()
+        call_later.assert_not_called()
+        coordinator.prewarm_lead = 5
+        coordinator._schedule_prewarm()
+        assert call_later.call_args.args[1] == 55
+        coordinator._reuse_session = True
+        coordinator._schedule_prewarm()
+        assert call_later.call_count == 1
+
+    await coordinator._async_prewarm(datetime.now())
+    assert mock_zte_client.login.call_count == 1
+    devices, _, _ = await coordinator._async_fetch_legacy()
+    assert devices[0].mac == "AA"
+    assert mock_zte_client.login.call_count == 1
+    assert mock_zte_client.logout.call_count == 1
+    assert coordinator.prewarmed_polls == 1
+
+    # A stale pre-warmed login is dropped and the poll logs in itself.
+    await coordinator._async_prewarm(datetime.now())
+    coordinator._prewarmed_at -= 60
+    await coordinator._async_fetch_legacy()
+    assert mock_zte_client.login.call_count == 3
+    assert mock_zte_client.logout.call_count == 3
+    assert coordinator.prewarmed_polls == 1
+
+    # A pre-warmed session the router dropped is replaced within the poll.
+    results = iter([None, [DeviceRecord(mac="BB", active=True)]])
+    mock_zte_client.fetch_all.side_effect = lambda *args: {
+        "devices": next(results),
+        "wan": None,
+        "details": None,
+        "topology": None,
+    }
+    await coordinator._async_prewarm(datetime.now())
+    devices, _, _ = await coordinator._async_fetch_legacy()
+    assert devices[0].mac == "BB"
+    assert mock_zte_client.login.call_count == 5
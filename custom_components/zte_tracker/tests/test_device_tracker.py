@@ -51,4 +51,227 @@ class HassMockup:
     """Mock for Home Assistant instance."""
     def __init__(self):
         self.data = {}
-        self.states = HassStatesMockup()
\ No newline at end of file
+        self.states = HassStatesMockup()
+
+def _tracker_setup(devices, registered=()):
+    """Set up the device_tracker platform against a mocked coordinator."""
+    import asyncio
+
+    from ..const import DOMAIN
+    from ..device_tracker import async_setup_entry
+    from ..models import build_views, compute_delta
+
+    entry = Mock(entry_id="entry", title="Router")
+    coordinator = Mock(register_new_devices=True, data=None, tracked_macs=set())
+    listeners = []
+    coordinator.async_add_listener.side_effect = listeners.append
+    hass = Mock(data={DOMAIN: {entry.entry_id: coordinator}})
+    hass.states.get.return_value = Mock(attributes={"active": True})
+    added = []
+
+    def add_entities(entities):
+        for entity in entities:
+            entity.hass = hass
+            entity.entity_id = f"device_tracker.{entity.mac_address}"
+            entity.async_write_ha_state = Mock()
+            added.append(entity)
+
+    def publish(new_devices):
+        previous = coordinator.data["devices"] if coordinator.data else None
+        previous_views = coordinator.data["views"] if coordinator.data else None
+        coordinator.data = {
+            "devices": new_devices,
+            "delta": compute_delta(previous, new_devices),
+            "views": build_views(new_devices, previous, previous_views),
+        }
+
+    publish(devices)
+    registry = Mock()
+    registry.async_get_entity_id.side_effect = lambda domain, platform, unique_id: (
+        f"device_tracker.{unique_id}"
+    )
+    registry_entries = [
+        Mock(domain="device_tracker", unique_id=f"entry_{mac.replace(':', '_')}")
+        for mac in registered
+    ]
+    module = async_setup_entry.__module__
+    with patch(f"{module}.dr.async_get"), patch(
+        f"{module}.er.async_get", return_value=registry
+    ), patch(
+        f"{module}.er.async_entries_for_config_entry", return_value=registry_entries
+    ):
+        asyncio.run(async_setup_entry(hass, entry, add_entities))
+    return coordinator, listeners, added, publish
+
+
+def _device(ip, active=True, **fields):
+    from ..zteclient.device_record import DeviceRecord
+
+    return DeviceRecord(name="dev", ip=ip, active=active, last_seen="t", **fields)
+
+
+def test_tracker_updates_only_changed_entities():
+    """Existing trackers are found by MAC and only changed ones are written."""
+    devices = {f"00:00:00:00:00:{i:02X}": _device(f"10.0.0.{i}") for i in range(5)}
+    coordinator, listeners, added, publish = _tracker_setup(devices)
+    assert len(added) == 5
+
+    changed = dict(devices)
+    changed["00:00:00:00:00:01"] = _device("10.0.0.99")
+    changed["00:00:00:00:00:05"] = _device("10.0.0.5")
+    publish(changed)
+    listeners[0]()
+
+    writes = {e.mac_address: e.async_write_ha_state.call_count for e in added}
+    assert writes["00:00:00:00:00:01"] == 1
+    assert writes["00:00:00:00:00:00"] == 0
+    assert writes["00:00:00:00:00:05"] == 0  # New entity, added instead
+    assert len(added) == 6
+
+
+def test_tracker_marks_only_undetected_registered_macs():
+    """Registered trackers without an entity are set not_home on setup and
+    when they go inactive, without sweeping the entity registry."""
+    devices = {
+        "00:00:00:00:00:01": _device("10.0.0.1"),
+        "00:00:00:00:00:02": _device("10.0.0.2", active=False),
+    }
+    coordinator, listeners, added, publish = _tracker_setup(
+        devices, registered=["00:00:00:00:00:03"]
+    )
+    hass = added[0].hass
+    assert coordinator.tracked_macs == {
+        "00:00:00:00:00:01",
+        "00:00:00:00:00:02",
+        "00:00:00:00:00:03",
+    }
+    hass.states.async_set.assert_called_once()
+    assert hass.states.async_set.call_args.args[:2] == (
+        "device_tracker.entry_00_00_00_00_00_03",
+        "not_home",
+    )
+
+    hass.states.async_set.reset_mock()
+    publish({**devices, "00:00:00:00:00:01": _device("10.0.0.1", active=False)})
+    listeners[0]()
+    hass.states.async_set.assert_not_called()
+    by_mac = {entity.mac_address: entity for entity in added}
+    assert by_mac["00:00:00:00:00:01"].async_write_ha_state.called
+    assert not by_mac["00:00:00:00:00:02"].async_write_ha_state.called
+
+
+def test_tracker_single_state_write_per_poll():
+    """One listener runs the whole pass and writes each tracker once."""
+    devices = {f"00:00:00:00:00:{i:02X}": _device(f"10.0.0.{i}") for i in range(4)}
+    coordinator, listeners, added, publish = _tracker_setup(devices)
+    assert len(listeners) == 1
+
+    polled = {
+        "00:00:00:00:00:00": _device("10.0.0.100"),  # Changed field
+        "00:00:00:00:00:01": _device("10.0.0.1", active=False),  # Went inactive
+        "00:00:00:00:00:02": _device("10.0.0.2"),  # Unchanged
+        "00:00:00:00:00:04": _device("10.0.0.4"),  # New
+    }  # 00:00:00:00:00:03 removed
+    publish(polled)
+    for listener in listeners:
+        listener()
+
+    writes = {e.mac_address: e.async_write_ha_state.call_count for e in added}
+    assert writes == {
+        "00:00:00:00:00:00": 1,
+        "00:00:00:00:00:01": 1,
+        "00:00:00:00:00:02": 0,
+        "00:00:00:00:00:03": 1,
+        "00:00:00:00:00:04": 0,
+    }
+
+
+def test_tracker_serves_precomputed_view():
+    """Entity properties return the per-poll view instead of rebuilding it."""
+    devices = {"00:00:00:00:00:01": _device("10.0.0.1", network_type="LAN")}
+    coordinator, listeners, added, publish = _tracker_setup(devices)
+    entity = added[0]
+    view = coordinator.data["views"]["00:00:00:00:00:01"]
+    assert entity.extra_state_attributes is view.attributes
+    assert entity.extra_state_attributes["ip_address"] == "10.0.0.1"
+    assert entity.icon == "mdi:lan"
+    assert entity.is_connected
+
+    # Unchanged device entries keep their view object across polls.
+    publish(dict(devices))
+    assert coordinator.data["views"]["00:00:00:00:00:01"] is view
+
+    publish({})
+    listeners[0]()
+    assert not entity.is_connected
+    assert entity.ip_address == "10.0.0.1"
+
+
+def test_tracker_refreshes_last_seen_periodically():
+    """Connected trackers are written every LAST_SEEN_REFRESH_INTERVAL even
+    when only last_seen changed."""
+    from ..device_tracker import LAST_SEEN_REFRESH_INTERVAL
+    from ..zteclient.device_record import DeviceRecord
+
+    def poll(last_seen):
+        return {
+            "00:00:00:00:00:01": DeviceRecord(
+                name="dev", ip="10.0.0.1", active=True, last_seen=last_seen
+            ),
+            "00:00:00:00:00:02": DeviceRecord(
+                name="dev", ip="10.0.0.2", active=False, last_seen="t0"
+            ),
+        }
+
+    module = "custom_components.zte_tracker.device_tracker.time.monotonic"
+    with patch(module, return_value=1000.0) as monotonic:
+        coordinator, listeners, added, publish = _tracker_setup(poll("t0"))
+        by_mac = {entity.mac_address: entity for entity in added}
+
+        publish(poll("t1"))
+        listeners[0]()
+        assert not by_mac["00:00:00:00:00:01"].async_write_ha_state.called
+
+        monotonic.return_value += LAST_SEEN_REFRESH_INTERVAL.total_seconds()
+        publish(poll("t2"))
+        listeners[0]()
+
+    connected = by_mac["00:00:00:00:00:01"]
+    assert connected.async_write_ha_state.call_count == 1
+    assert connected.extra_state_attributes["last_seen"] == "t2"
+    assert not by_mac["00:00:00:00:00:02"].async_write_ha_state.called
+
+
+
+def test_tracker_forgets_macs_removed_from_registry():
+    """Deleting a tracker from the entity registry drops its MAC from the
+    coordinator's tracked MACs, with or without an entity in this run."""
+    from ..device_tracker import async_setup_entry
+
+    devices = {
+        "00:00:00:00:00:01": _device("10.0.0.1"),
+        "00:00:00:00:00:02": _device("10.0.0.2"),
+    }
+    coordinator, listeners, added, publish = _tracker_setup(
+        devices, registered=["00:00:00:00:00:01", "00:00:00:00:00:03"]
+    )
+    hass = added[0].hass
+    event_type, handler = hass.bus.async_listen.call_args.args
+    event_filter = hass.bus.async_listen.call_args.kwargs["event_filter"]
+    assert event_type == "entity_registry_updated"
+    assert not event_filter({"action": "create", "entity_id": "device_tracker.x"})
+    assert event_filter({"action": "remove", "entity_id": "device_tracker.x"})
+
+    # 00:..:02 was added in this run and isn't registered yet.
+    by_mac = {entity.mac_address: entity for entity in added}
+    by_mac["00:00:00:00:00:02"].entity_id = None
+    remaining = [Mock(domain="device_tracker", unique_id="entry_00_00_00_00_00_01")]
+    module = async_setup_entry.__module__
+    with patch(f"{module}.er.async_entries_for_config_entry", return_value=remaining):
+        handler(Mock(data={"action": "remove", "entity_id": "device_tracker.x"}))
+    assert coordinator.tracked_macs == {"00:00:00:00:00:01", "00:00:00:00:00:02"}
+
+    by_mac["00:00:00:00:00:02"].entity_id = "device_tracker.entry_00_00_00_00_00_02"
+    with patch(f"{module}.er.async_entries_for_config_entry", return_value=[]):
+        handler(Mock(data={"action": "remove", "entity_id": "device_tracker.x"}))
+    assert coordinator.tracked_macs == set()
@@ -0,0 +1,133 @@
+"""Tests for the concurrent fetch planner."""
+
+import asyncio
+
+import pytest
+
+from custom_components.zte_tracker.zteclient.async_zte_client import AsyncZteClient
+from custom_components.zte_tracker.zteclient.fetch_planner import (
+    FAILED,
+    PARALLEL_FAILURE_LIMIT,
+    FetchPlanner,
+)
+
+
+def _chain(result, log, name, delay=0.01):
+    async def _run():
+        log.append(f"start {name}")
+        await asyncio.sleep(delay)
+        log.append(f"end {name}")
+        return result
+
+    return _run
+
+
+@pytest.mark.asyncio
+async def test_chains_run_concurrently():
+    """Independent chains overlap when concurrency allows it."""
+    log: list[str] = []
+    planner = FetchPlanner(max_concurrency=3)
+    results = await planner.run(
+        {"a": _chain(1, log, "a"), "b": _chain(2, log, "b"), "c": _chain(3, log, "c")}
+    )
+    assert results == {"a": 1, "b": 2, "c": 3}
+    assert log[:3] == ["start a", "start b", "start c"]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_one_is_sequential():
+    """max_concurrency=1 runs chains strictly one after another."""
+    log: list[str] = []
+    planner = FetchPlanner(max_concurrency=1)
+    await planner.run({"a": _chain(1, log, "a"), "b": _chain(2, log, "b")})
+    assert log == ["start a", "end a", "start b", "end b"]
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_sequential_when_parallel_rejected():
+    """Chains that only succeed when run alone switch the planner off."""
+    running = 0
+
+    async def _sid_bound():
+        nonlocal running
+        running += 1
+        await asyncio.sleep(0.01)
+        clash = running > 1
+        running -= 1
+        return FAILED if clash else "ok"
+
+    planner = FetchPlanner(max_concurrency=3)
+    for _ in range(PARALLEL_FAILURE_LIMIT):
+        results = await planner.run({"a": _sid_bound, "b": _sid_bound})
+        assert results == {"a": "ok", "b": "ok"}
+    assert not planner.parallel_supported
+    assert not planner.concurrent
+
+
+@pytest.mark.asyncio
+async def test_genuine_failure_keeps_parallel_mode():
+    """A chain failing both ways is not blamed on parallelism."""
+    log: list[str] = []
+    planner = FetchPlanner(max_concurrency=3)
+    for _ in range(PARALLEL_FAILURE_LIMIT + 1):
+        results = await planner.run(
+            {"a": _chain(FAILED, log, "a"), "b": _chain(2, log, "b")}
+        )
+        assert results == {"a": None, "b": 2}
+    assert planner.parallel_supported
+
+
+@pytest.mark.asyncio
+async def test_no_data_is_not_retried():
+    """A chain returning None (no data) runs once and isn't a failure."""
+    log: list[str] = []
+    planner = FetchPlanner(max_concurrency=3)
+    for _ in range(PARALLEL_FAILURE_LIMIT + 1):
+        results = await planner.run(
+            {"a": _chain(None, log, "a"), "b": _chain(2, log, "b")}
+        )
+        assert results == {"a": None, "b": 2}
+    assert log.count("start a") == PARALLEL_FAILURE_LIMIT + 1
+    assert planner.parallel_supported
+
+
+@pytest.mark.asyncio
+async def test_fetch_all_against_fake_router(router):
+    """fetch_all returns the same shape as the sequential client."""
+    client = AsyncZteClient(router.host, "admin", "secret", "F6640", scheme="http")
+    assert await client.login()
+    results = await client.fetch_all()
+    await client.logout()
+
+    assert len(results["devices"]) == 2
+    assert results["wan"]["WAN_connected"] is True
+    assert results["details"] == {"PowerOnTime": 1234}
+    assert results["topology"] is None
+
+
+@pytest.mark.asyncio
+async def test_wlan_fetched_after_lan(router):
+    """The WLAN request follows the LAN fetch whose menu it relies on."""
+    client = AsyncZteClient(router.host, "admin", "secret", "F6640", scheme="http")
+    assert await client.login()
+    await client.fetch_all()
+    await client.logout()
+
+    lan = router.requests.index("GET menuData accessdev_landevs_lua.lua")
+    wlan = router.requests.index("GET menuData wlan_client_stat_lua.lua")
+    assert lan < wlan
+    assert router.requests.index("GET menuView localNetStatus") < lan
+
+
+@pytest.mark.asyncio
+async def test_topology_requested_once_without_mesh(router):
+    """A router without a mesh gets one topology request per poll."""
+    client = AsyncZteClient(router.host, "admin", "secret", "F6640", scheme="http")
+    assert await client.login()
+    results = await client.fetch_all(topology=True)
+    await client.logout()
+
+    assert results["topology"] is None
+    assert len(results["devices"]) == 2
+    assert router.hits["GET menuData topo_lua.lua"] == 1
+    assert client.planner.parallel_supported
@@ -0,0 +1,96 @@
+"""Tests for request and phase instrumentation."""
+
+import asyncio
+
+import pytest
+
+from custom_components.zte_tracker.zteclient.async_zte_client import AsyncZteClient
+from custom_components.zte_tracker.zteclient.instrumentation import (
+    Histogram,
+    Instrumentation,
+    RequestTiming,
+    endpoint_tag,
+)
+from custom_components.zte_tracker.zteclient.zte_client import zteClient
+
+
+def test_histogram_summary():
+    """Quantiles report bucket bounds; the overflow bucket reports the max."""
+    histogram = Histogram()
+    assert histogram.summary()["p50_ms"] is None
+    for seconds in (0.003, 0.004, 0.02, 0.2, 30.0):
+        histogram.observe(seconds)
+    summary = histogram.summary()
+    assert summary["count"] == 5
+    assert summary["p50_ms"] == 25
+    assert summary["p95_ms"] == 30000
+    assert summary["max_ms"] == 30000
+    assert histogram.as_dict()["buckets"]["le_5"] == 2
+
+
+def test_endpoint_tag():
+    """Endpoints are named from the _type/_tag query parameters."""
+    assert endpoint_tag("http://r/?_type=menuData&_tag=accessdev_landevs_lua.lua") == (
+        "menuData:accessdev_landevs_lua.lua"
+    )
+    assert endpoint_tag("http://r/?_type=loginData&_tag=login_entry") == (
+        "loginData:login_entry"
+    )
+    assert endpoint_tag("http://r/") == "/"
+
+
+def test_request_timing_aggregation():
+    """Errors are counted and only measured stages get histograms."""
+    instrumentation = Instrumentation()
+    instrumentation.record_request(RequestTiming("a", "GET", 200, 10, 0.02, 0.01))
+    instrumentation.record_request(
+        RequestTiming("a", "GET", None, 0, 5.0, error="TimeoutError")
+    )
+    stats = instrumentation.summary()["endpoints"]["a"]
+    assert stats["requests"] == 2
+    assert stats["errors"] == 1
+    assert stats["bytes"] == 10
+    assert stats["total"]["count"] == 2
+    assert stats["ttfb"]["count"] == 1
+    assert "dns" not in stats
+    assert len(instrumentation.snapshot()["recent_requests"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_client_timing(router):
+    """The aiohttp client records every request and the fetch phases."""
+    client = AsyncZteClient(router.host, "admin", "secret", "F6640", scheme="http")
+    assert await client.login()
+    await client.get_devices_response()
+    await client.logout()
+
+    endpoints = client.instrumentation.summary()["endpoints"]
+    lan = endpoints["menuData:accessdev_landevs_lua.lua"]
+    assert lan["requests"] == 1
+    assert lan["last_status"] == 200
+    assert lan["bytes"] > 0
+    assert lan["ttfb"]["count"] == 1
+    assert lan["total"]["count"] == 1
+    recent = client.instrumentation.snapshot()["recent_requests"]
+    assert recent[0]["connect_ms"] is not None
+    assert {"fetch.lan", "fetch.wlan", "parse"} <= set(
+        client.instrumentation.last_phases
+    )
+
+
+@pytest.mark.asyncio
+async def test_sync_client_timing(router):
+    """The requests-based client records total time and time to headers."""
+    client = zteClient(router.host, "admin", "secret", "F6640", scheme="http")
+
+    def _poll():
+        assert client.login()
+        client.get_devices_response()
+        client.logout()
+
+    await asyncio.to_thread(_poll)
+
+    endpoints = client.instrumentation.summary()["endpoints"]
+    lan = endpoints["menuData:accessdev_landevs_lua.lua"]
+    assert lan["ttfb"]["count"] == 1
+    assert "parse" in client.instrumentation.last_phases
@@ -0,0 +1,98 @@
+"""Tests for the router model registry."""
+
+import json
+
+import pytest
+
+from custom_components.zte_tracker.zteclient.async_zte_client import AsyncZteClient
+from custom_components.zte_tracker.zteclient.model_registry import (
+    MODELS,
+    load_model_file,
+    register_model_file,
+)
+from custom_components.zte_tracker.zteclient.zte_client import zteClient
+
+
+@pytest.fixture
+def model_file(tmp_path):
+    """Write a models file and drop its models from the registry afterwards."""
+    added: list[str] = []
+
+    def _write(models: dict) -> str:
+        path = tmp_path / "models.json"
+        path.write_text(json.dumps({"version": 1, "models": models}))
+        added.extend(models)
+        return path
+
+    yield _write
+    for name in added:
+        MODELS.pop(name, None)
+
+
+def test_compiled_urls():
+    """Compiled endpoints give the URLs the clients always requested."""
+    client = zteClient("192.168.1.1", "admin", "secret", "H388X")
+    client.guid = 7
+    assert client._url("net_view") == (
+        "https://192.168.1.1/?_type=menuView&_tag=localNetStatus&_=7"
+    )
+    assert client._url("wan") == (
+        "https://192.168.1.1/?_type=menuData"
+        "&_tag=wan_internet_lua.lua&TypeUplink=2&pageType=1&_=8"
+    )
+    assert client._url("details_view") == (
+        "https://192.168.1.1/?_type=menuView&_tag=statusMgr&Menu3Location=0&_=9"
+    )
+
+
+def test_synonyms_and_variants():
+    """Synonyms share their model's endpoints; F6600P keeps its own key."""
+    assert set(zteClient.get_models()) >= {"F6640", "F6600P", "H169A", "SR7410"}
+    assert MODELS["H169A"].endpoints() == MODELS["H288A"].endpoints()
+    assert MODELS["F6600P"].endpoints() == MODELS["F6640"].endpoints()
+    assert MODELS["F6600P"].reboot_key != MODELS["F6640"].reboot_key
+    assert MODELS["F6640"].supports("topology")
+    assert not MODELS["H288A"].supports("topology")
+    assert "topology" not in MODELS["E2631"].supported_groups()
+
+
+def test_register_model_file(model_file):
+    """A firmware can be added from a data file, extending a known model."""
+    path = model_file(
+        {
+            "F6640X": {
+                "extends": "F6640",
+                "wlan_script": "x.lua",
+                "unsupported": ["wan"],
+            }
+        }
+    )
+    assert register_model_file(path) == ["F6640X"]
+    profile = MODELS["F6640X"]
+    assert profile.wlan_script == "x.lua"
+    assert profile.lan_script == MODELS["F6640"].lan_script
+    assert profile.reboot_key == MODELS["F6640"].reboot_key
+    assert not profile.supports("wan")
+    assert "F6640X" in zteClient.get_models()
+
+
+def test_unknown_field_rejected(model_file):
+    """Typos in a models file are reported instead of ignored."""
+    path = model_file({"F6640X": {"extends": "F6640", "wlan_scrpt": "x.lua"}})
+    with pytest.raises(ValueError, match="wlan_scrpt"):
+        load_model_file(path, MODELS)
+
+
+@pytest.mark.asyncio
+async def test_unsupported_endpoints_skipped(router, model_file):
+    """Feature groups a model does not serve are never requested."""
+    register_model_file(
+        model_file({"F6640X": {"extends": "F6640", "unsupported": ["details"]}})
+    )
+    client = AsyncZteClient(router.host, "admin", "secret", "F6640X", scheme="http")
+    assert await client.login()
+    result = await client.fetch_all(topology=True)
+    await client.logout()
+    assert result["details"] == {}
+    assert result["wan"] == {"WAN_uptime": 88760, "WAN_connected": True}
+    assert not any("statusMgr" in hit or "statusmgr" in hit for hit in router.hits)
@@ -0,0 +1,147 @@
+"""Tests for the streaming and tree device parsers."""
+
+import tracemalloc
+
+import pytest
+
+from custom_components.zte_tracker.zteclient.device_record import (
+    DeviceRecord,
+    NetworkType,
+)
+from custom_components.zte_tracker.zteclient.zte_client import (
+    PARSE_MODE_STREAM,
+    PARSE_MODE_TREE,
+    zteClient,
+)
+
+from .fake_router import device_xml
+
+
+def _client(parse_mode: str) -> zteClient:
+    return zteClient("192.168.1.1", "admin", "secret", "F6640", parse_mode=parse_mode)
+
+
+def _wlanap_xml() -> str:
+    return (
+        "<OBJ_WLANAP_ID>"
+        "<Instance><ParaName>_InstID</ParaName><ParaValue>DEV.WIFI.AP1</ParaValue>"
+        "<ParaName>ESSID</ParaName><ParaValue>Home</ParaValue></Instance>"
+        "<Instance><ParaName>_InstID</ParaName><ParaValue>DEV.WIFI.AP5</ParaValue>"
+        "<ParaName>ESSID</ParaName><ParaValue>Home-5G</ParaValue></Instance>"
+        "</OBJ_WLANAP_ID>"
+    )
+
+
+def synthetic_devices(count: int) -> list[dict[str, str]]:
+    """Build a mixed list of WLAN clients like a busy router reports."""
+    devices = []
+    for i in range(count):
+        devices.append(
+            {
+                "_InstID": f"DEV.WIFI.AD{i}",
+                "MACAddress": f"aa:bb:cc:{i >> 16 & 0xFF:02x}:{i >> 8 & 0xFF:02x}:{i & 0xFF:02x}",
+                "IPAddress": f"192.168.{i // 250}.{i % 250 + 2}",
+                "HostName": f" host-{i} ",
+                "IconType": "phone" if i % 2 else "pc",
+                "Active": ("1", "0", "true", "no")[i % 4],
+                "AliasName": "DEV.WIFI.AP1" if i % 3 else "DEV.WIFI.AP5",
+                "LinkTime": str(i * 7),
+                "ConnectTime": (
+                    "2025/11/17 Mon 14:23:45" if i % 5 else "not a date"
+                ),
+            }
+        )
+    return devices
+
+
+def synthetic_payload(count: int) -> str:
+    """Return a menuData WLAN reply with count clients and an AP table."""
+    xml = device_xml("OBJ_WLAN_AD_ID", synthetic_devices(count))
+    return xml.replace(
+        "</ajax_response_xml_root>", f"{_wlanap_xml()}</ajax_response_xml_root>"
+    )
+
+
+@pytest.mark.parametrize("count", [0, 10, 100, 1000])
+def test_stream_matches_tree(count):
+    """Both parsers return identical records for the same payload."""
+    payload = synthetic_payload(count)
+    stream = _client(PARSE_MODE_STREAM).parse_devices(payload)
+    tree = _client(PARSE_MODE_TREE).parse_devices(payload)
+    assert stream == tree
+    assert len(stream) == count
+
+
+def test_stream_record_contents():
+    """Field conversions and the ESSID remap happen in the streaming parser."""
+    devices = _client(PARSE_MODE_STREAM).parse_devices(synthetic_payload(5))
+    assert devices[0] == DeviceRecord(
+        mac="AA:BB:CC:00:00:00",
+        name="host-0",
+        ip="192.168.0.2",
+        active=True,
+        icon_type="pc",
+        network_type=NetworkType.WLAN,
+        port="Home-5G",
+        link_time="0",
+        connect_time="not a date",
+    )
+    assert devices[1].active is False
+    assert devices[1].port == "Home"
+    assert devices[1].connect_time == "2025-11-17T14:23:45"
+    # Old dict keys still resolve through the record.
+    assert devices[1]["ConnectTime"] == devices[1].connect_time
+    assert devices[1].get("HostName") == "host-1"
+
+
+@pytest.mark.parametrize("parse_mode", [PARSE_MODE_STREAM, PARSE_MODE_TREE])
+def test_parser_edge_cases(parse_mode):
+    """Malformed and partial replies behave the same in both modes."""
+    client = _client(parse_mode)
+    assert client.parse_devices("   ") == []
+
+    odd = (
+        "<ajax_response_xml_root><OBJ_ACCESSDEV_ID>"
+        "<Instance><ParaName>MACAddress</ParaName></Instance>"
+        "<Instance><ParaName>HostName</ParaName><ParaValue>x</ParaValue></Instance>"
+        "<Instance><ParaName>MACAddress</ParaName><ParaValue>aa:bb</ParaValue></Instance>"
+        "</OBJ_ACCESSDEV_ID></ajax_response_xml_root>"
+    )
+    devices = client.parse_devices(odd, "OBJ_ACCESSDEV_ID", "LAN")
+    assert [d.mac for d in devices] == ["AA:BB"]
+    assert devices[0].network_type is NetworkType.LAN
+
+    with pytest.raises(Exception, match="Router error: SessionTimeout"):
+        client.parse_devices(
+            "<ajax_response_xml_root><IF_ERRORSTR>SessionTimeout</IF_ERRORSTR>"
+            "</ajax_response_xml_root>"
+        )
+    with pytest.raises(Exception, match="Invalid XML format"):
+        client.parse_devices("<html><body>login</body></html>")
+    with pytest.raises(Exception):
+        client.parse_devices("<ajax_response_xml_root><OBJ_WLAN_AD_ID>")
+
+
+def _peak_memory(parse_mode: str, payload: str) -> int:
+    client = _client(parse_mode)
+    tracemalloc.start()
+    client.parse_devices(payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+@pytest.mark.parametrize("count", [10, 100, 1000])
+def test_parser_benchmark(count):
+    """Compare the peak memory of both parsers.
+
+    Their parse times are measured by the benchmark suite.
+    """
+    payload = synthetic_payload(count)
+    stream_peak = _peak_memory(PARSE_MODE_STREAM, payload)
+    tree_peak = _peak_memory(PARSE_MODE_TREE, payload)
+    # Elements are dropped as they are consumed, so the streaming parser
+    # never holds the whole document; small replies are dominated by the
+    # parser's fixed overhead.
+    if count >= 100:
+        assert stream_peak < tree_peak
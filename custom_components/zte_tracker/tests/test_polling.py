@@ -0,0 +1,77 @@
+"""Tests for the polling interval controllers."""
+from datetime import datetime, timedelta
+
+from custom_components.zte_tracker.polling import (
+    AdaptiveController,
+    PollSample,
+    StableCountController,
+    create_controller,
+)
+
+MIN = timedelta(seconds=30)
+MAX = timedelta(seconds=120)
+DEFAULT = timedelta(seconds=60)
+NOON = datetime(2026, 1, 5, 12, 0)
+
+
+def _sample(churn=0, latency=None, ok=True, at=NOON):
+    return PollSample(5, churn, latency, ok, at)
+
+
+def test_adaptive_churn_and_quiet():
+    """Churn polls at the minimum; quiet polls grow to the maximum."""
+    controller = AdaptiveController(MIN, MAX, DEFAULT)
+    decision = controller.update(_sample(churn=3))
+    assert decision.interval == MIN
+    assert decision.reason == "churn"
+
+    intervals = [controller.update(_sample()).interval for _ in range(8)]
+    assert intervals == sorted(intervals)
+    assert intervals[0] > MIN
+    assert intervals[-1] == MAX
+    attributes = decision.as_attributes()
+    assert attributes["controller"] == "adaptive"
+    assert attributes["interval"] == 30
+
+
+def test_adaptive_errors_and_latency():
+    """Failures back off and slow routers set a floor."""
+    controller = AdaptiveController(MIN, MAX, DEFAULT)
+    first = controller.update(_sample(ok=False))
+    second = controller.update(_sample(ok=False))
+    assert first.reason == "error backoff"
+    assert DEFAULT < first.interval < second.interval
+
+    controller = AdaptiveController(MIN, MAX, DEFAULT)
+    decision = controller.update(_sample(churn=1, latency=6.0))
+    assert decision.reason == "latency floor"
+    assert decision.interval == timedelta(seconds=60)
+
+
+def test_adaptive_busy_hours():
+    """Hours with churn on past days cap the interval at the default."""
+    controller = AdaptiveController(MIN, MAX, DEFAULT)
+    # Arrivals at 8:00 on one day...
+    controller.update(_sample(churn=4, at=NOON.replace(hour=8)))
+    controller.update(_sample(at=NOON.replace(hour=9)))
+    # ...keep polling at most at the default interval at 8:00 the next day,
+    for _ in range(10):
+        decision = controller.update(_sample(at=NOON.replace(day=6, hour=8)))
+    assert decision.interval == DEFAULT
+    assert decision.reason == "busy hour"
+    # while quiet hours go up to the maximum.
+    for _ in range(10):
+        decision = controller.update(_sample(at=NOON.replace(day=6, hour=3)))
+    assert decision.interval == MAX
+
+
+def test_stable_count_controller():
+    """The original heuristic is available as a controller."""
+    controller = create_controller("stable_count", MIN, MAX, DEFAULT)
+    assert isinstance(controller, StableCountController)
+    intervals = [controller.update(_sample()).interval for _ in range(7)]
+    assert intervals[0] == MIN
+    assert intervals[3] == DEFAULT
+    assert intervals[-1] == MAX
+
+    assert isinstance(create_controller("unknown", MIN, MAX, DEFAULT), AdaptiveController)
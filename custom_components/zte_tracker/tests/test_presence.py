@@ -0,0 +1,87 @@
+"""Tests for the DHCP/ARP presence listener."""
+import struct
+from unittest.mock import Mock, patch
+
+from custom_components.zte_tracker.coordinator import ZteDataCoordinator
+from custom_components.zte_tracker.presence import PresenceListener, parse_frame
+from custom_components.zte_tracker.zteclient.device_record import DeviceRecord
+
+MAC = bytes.fromhex("a0b1c2d3e4f5")
+ETH_HEADER = b"\xff" * 6 + MAC
+
+
+def _arp(sender_ip, target_ip, oper=1):
+    return (
+        ETH_HEADER
+        + b"\x08\x06"
+        + struct.pack("!HHBBH", 1, 0x0800, 6, 4, oper)
+        + MAC
+        + bytes(sender_ip)
+        + b"\x00" * 6
+        + bytes(target_ip)
+    )
+
+
+def _dhcp(op=1, dst_port=67):
+    bootp = bytearray(240)
+    bootp[0:3] = bytes((op, 1, 6))
+    bootp[28:34] = MAC
+    bootp[236:240] = b"\x63\x82\x53\x63"
+    udp = struct.pack("!HHHH", 68, dst_port, 8 + len(bootp), 0)
+    ip = bytearray(20)
+    ip[0] = 0x45
+    ip[9] = 17
+    return ETH_HEADER + b"\x08\x00" + bytes(ip) + udp + bytes(bootp)
+
+
+def test_parse_frame():
+    """DHCP client messages and ARP announcements yield the device MAC."""
+    assert parse_frame(_dhcp()) == "A0:B1:C2:D3:E4:F5"
+    assert parse_frame(_arp((192, 168, 1, 20), (192, 168, 1, 20))) == "A0:B1:C2:D3:E4:F5"
+    assert parse_frame(_arp((0, 0, 0, 0), (192, 168, 1, 20))) == "A0:B1:C2:D3:E4:F5"
+
+    # Ordinary ARP, DHCP server replies and junk are ignored.
+    assert parse_frame(_arp((192, 168, 1, 20), (192, 168, 1, 1))) is None
+    assert parse_frame(_dhcp(op=2)) is None
+    assert parse_frame(_dhcp(dst_port=68)) is None
+    assert parse_frame(_dhcp()[:100]) is None
+    assert parse_frame(b"") is None
+
+
+def test_listener_without_raw_socket(hass):
+    """Without raw socket access the listener stays off and polling goes on."""
+    listener = PresenceListener(hass)
+    with patch(
+        "custom_components.zte_tracker.presence.socket.socket",
+        side_effect=PermissionError("Operation not permitted"),
+    ) as sock:
+        unsubscribe = listener.async_subscribe(Mock())
+        listener.async_subscribe(Mock())
+    assert sock.call_count == 1
+    unsubscribe()
+
+
+def test_coordinator_handle_presence(hass, mock_config_entry, mock_zte_client):
+    """Arrivals schedule one debounced refresh per MAC and cooldown."""
+    with patch("custom_components.zte_tracker.coordinator.zteClient", return_value=mock_zte_client):
+        coordinator = ZteDataCoordinator(hass, mock_config_entry)
+    coordinator._presence_debouncer = Mock()
+    coordinator.data = {
+        "devices": {
+            "AA": DeviceRecord(mac="AA", active=True),
+            "BB": DeviceRecord(mac="BB", active=False),
+        }
+    }
+
+    coordinator.async_handle_presence("AA")
+    coordinator._presence_debouncer.async_schedule_call.assert_not_called()
+
+    coordinator.async_handle_presence("BB")
+    coordinator.async_handle_presence("BB")
+    coordinator.async_handle_presence("CC")
+    assert coordinator._presence_debouncer.async_schedule_call.call_count == 2
+    assert coordinator.presence_refreshes == 2
+
+    coordinator._paused = True
+    coordinator.async_handle_presence("DD")
+    assert coordinator.presence_refreshes == 2
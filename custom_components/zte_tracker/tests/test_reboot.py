@@ -0,0 +1,122 @@
+"""Tests for reboot request signing and batch reboots."""
+
+import asyncio
+import base64
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from homeassistant.exceptions import HomeAssistantError
+import pytest
+
+from custom_components.zte_tracker import REBOOT_SERVICE_SCHEMA, async_reboot_service
+from custom_components.zte_tracker.const import DOMAIN, EVENT_REBOOT_RESULT
+from custom_components.zte_tracker.coordinator import async_reboot_routers
+from custom_components.zte_tracker.zteclient.zte_client import (
+    _reboot_public_key,
+    zteClient,
+)
+
+
+@pytest.mark.parametrize(
+    ("model", "key_size"), (("F6640", 2048), ("H288A", 2048), ("F6600P", 4096))
+)
+def test_reboot_request_key(model, key_size):
+    """Restart requests are signed with the key of the model's firmware."""
+    client = zteClient("127.0.0.1", "admin", "secret", model)
+    post_data, headers = client._build_reboot_request("token")
+    assert post_data == "IF_ACTION=Restart&Btn_restart=&_sessionTOKEN=token"
+    assert len(base64.b64decode(headers["Check"])) * 8 == key_size
+
+
+def test_reboot_keys_loaded_once():
+    """Each reboot key is parsed on first use only."""
+    client = zteClient("127.0.0.1", "admin", "secret", "F6640")
+    client._build_reboot_request("token")
+    misses = _reboot_public_key.cache_info().misses
+    client._build_reboot_request("token")
+    zteClient("127.0.0.1", "admin", "secret", "H288A")._build_reboot_request("t")
+    assert _reboot_public_key.cache_info().misses == misses
+
+
+class _Router:
+    """Coordinator stand-in whose reboot takes a while."""
+
+    in_flight = peak = 0
+
+    def __init__(self, host: str, success: bool = True) -> None:
+        self.client = SimpleNamespace(host=host, statusmsg=None)
+        self.entry = SimpleNamespace(entry_id=f"entry-{host}")
+        self.success = success
+        self.started: float | None = None
+
+    async def async_reboot_router(self) -> bool:
+        self.started = asyncio.get_running_loop().time()
+        _Router.in_flight += 1
+        _Router.peak = max(_Router.peak, _Router.in_flight)
+        await asyncio.sleep(0.01)
+        _Router.in_flight -= 1
+        self.client.statusmsg = "ok" if self.success else "failed"
+        return self.success
+
+
+@pytest.fixture(autouse=True)
+def _reset_router_counts():
+    _Router.in_flight = _Router.peak = 0
+
+
+@pytest.mark.asyncio
+async def test_reboot_routers_concurrently():
+    """Reboots run in parallel up to the concurrency limit."""
+    routers = [_Router(f"10.0.0.{i}", i != 3) for i in range(6)]
+    results = await async_reboot_routers(routers, max_concurrency=2)
+    assert _Router.peak == 2
+    assert results == {f"10.0.0.{i}": i != 3 for i in range(6)}
+
+
+@pytest.mark.asyncio
+async def test_reboot_routers_stagger():
+    """Reboots start at least stagger seconds apart."""
+    routers = [_Router(f"10.0.0.{i}") for i in range(3)]
+    await async_reboot_routers(routers, max_concurrency=3, stagger=0.03)
+    starts = sorted(router.started for router in routers)
+    assert all(b - a >= 0.025 for a, b in zip(starts, starts[1:]))
+
+
+@pytest.mark.asyncio
+async def test_reboot_service_response_and_events(hass):
+    """The service reboots matching routers and reports each result."""
+    hass.bus = Mock()
+    routers = {
+        "a": _Router("192.168.1.1"),
+        "b": _Router("192.168.1.2", success=False),
+        "c": _Router("10.0.0.1"),
+    }
+    hass.data[DOMAIN] = dict(routers)
+    call = SimpleNamespace(
+        hass=hass,
+        data=REBOOT_SERVICE_SCHEMA({"host": "192.168.1.*"}),
+        return_response=True,
+    )
+    response = await async_reboot_service(call)
+
+    assert routers["c"].started is None
+    assert response["results"]["192.168.1.1"]["success"] is True
+    failed = response["results"]["192.168.1.2"]
+    assert (failed["success"], failed["message"]) == (False, "failed")
+    events = [c.args for c in hass.bus.async_fire.call_args_list]
+    assert [name for name, _ in events] == [EVENT_REBOOT_RESULT] * 2
+    assert sorted(data["completed"] for _, data in events) == [1, 2]
+    assert {data["total"] for _, data in events} == {2}
+
+
+@pytest.mark.asyncio
+async def test_reboot_service_no_match(hass):
+    """A host matching no router is an error."""
+    hass.data[DOMAIN] = {"a": _Router("192.168.1.1")}
+    call = SimpleNamespace(
+        hass=hass,
+        data=REBOOT_SERVICE_SCHEMA({"host": ["10.0.0.1"]}),
+        return_response=False,
+    )
+    with pytest.raises(HomeAssistantError):
+        await async_reboot_service(call)
@@ -0,0 +1,143 @@
+"""Tests for the response recorder and the replay router."""
+
+import time
+
+import pytest
+
+from custom_components.zte_tracker.zteclient.recorder import (
+    Anonymizer,
+    ResponseRecorder,
+    load_recording,
+)
+from custom_components.zte_tracker.zteclient.zte_client import zteClient
+
+from .replay_router import (
+    RECORDED_MODELS,
+    RECORDINGS_DIR,
+    ReplayRouter,
+    serve_in_thread,
+    synthetic_recording,
+)
+
+
+def _poll(host, model, recorder=None):
+    client = zteClient(host, "admin", "secret", model, scheme="http")
+    client.recorder = recorder
+    assert client.login(), client.statusmsg
+    try:
+        return client.fetch_all(), client
+    finally:
+        client.logout()
+
+
+def test_anonymizer():
+    """MACs and host names map to stable placeholders."""
+    anonymize = Anonymizer()
+    body = (
+        "<ParaName>HostName</ParaName><ParaValue>Alices-Phone</ParaValue>"
+        "<ParaName>MACAddress</ParaName><ParaValue>a4:b1:c1:d1:e1:f1</ParaValue>"
+    )
+    first = anonymize(body)
+    assert "Alices-Phone" not in first
+    assert "a4:b1" not in first.lower()
+    assert "<ParaValue>host-1</ParaValue>" in first
+    assert "<ParaValue>02:00:00:00:00:01</ParaValue>" in first
+    assert anonymize(body.replace("a4:b1:c1:d1:e1:f1", "A4-B1-C1-D1-E1-F1")) == first
+
+
+def test_anonymizer_scrubs_private_fields():
+    """Addresses, network names, serials and WAN fields are replaced in XML
+    and JSON replies; times, netmasks and unrelated values are kept."""
+    private = [
+        "192.168.1.23",
+        "2a02:9130:8e4:1::17",
+        "fe80::a6b1:c1ff:fed1:e1f1",
+        "Smith-Family-5G",
+        "ZTEGC8A1B2C3",
+        "83.44.12.7",
+        "83.44.12.1",
+        "pppoe-user@isp",
+        "hunter2",
+        "Alices-Mesh",
+    ]
+    param = "<ParaName>{}</ParaName><ParaValue>{}</ParaValue>"
+    body = "".join(
+        param.format(*pair)
+        for pair in (
+            ("IPAddress", "192.168.1.23"),
+            ("IPv6Address", "2a02:9130:8e4:1::17"),
+            ("LinkLocal", "fe80::a6b1:c1ff:fed1:e1f1"),
+            ("ESSID", "Smith-Family-5G"),
+            ("SerialNumber", "ZTEGC8A1B2C3"),
+            ("WANCName", "WAN_internet"),
+            ("IPAddress", "83.44.12.7"),
+            ("Gateway", "83.44.12.1"),
+            ("SubnetMask", "255.255.255.0"),
+            ("UserName", "pppoe-user@isp"),
+            ("Password", "hunter2"),
+            ("ConnectTime", "12:30:45"),
+            ("SoftwareVer", "V1.0.0.5T3"),
+        )
+    ) + (
+        '{"slave": [{"DeviceName": "Alices-Mesh", "IpAddr": "192.168.1.23"}],'
+        '"ad": [{"HostName":"Smith-Family-5G", "IpAddr": "fe80::1"}]}'
+    )
+    result = Anonymizer()(body)
+    for value in private:
+        assert value.lower() not in result.lower(), value
+    assert param.format("WANCName", "WAN_internet") in result
+    assert param.format("SubnetMask", "255.255.255.0") in result
+    assert param.format("ConnectTime", "12:30:45") in result
+    assert param.format("SoftwareVer", "V1.0.0.5T3") in result
+    assert param.format("ESSID", "ssid-1") in result
+    assert param.format("SerialNumber", "serial-1") in result
+    # The same address maps to the same placeholder in both formats.
+    assert param.format("IPAddress", "10.0.0.1") in result
+    assert '"IpAddr": "10.0.0.1"' in result
+    assert '"DeviceName": "host-1"' in result
+    assert '"HostName":"host-2"' in result
+
+
+def test_record_and_replay(tmp_path):
+    """A recorded poll replays to the same devices."""
+    recorder = ResponseRecorder("F6640", anonymize=False)
+    with serve_in_thread(ReplayRouter(synthetic_recording("F6640", 5)).app) as host:
+        recorded, _ = _poll(host, "F6640", recorder)
+    path = tmp_path / "F6640.json"
+    recorder.save(path)
+
+    model, responses = load_recording(path)
+    assert model == "F6640"
+    assert "GET menuData:wlan_client_stat_lua.lua" in responses
+    replay = ReplayRouter(responses)
+    with serve_in_thread(replay.app) as host:
+        replayed, _ = _poll(host, "F6640")
+    assert replayed == recorded
+    assert not replay.misses
+
+
+@pytest.mark.parametrize("model", RECORDED_MODELS)
+def test_replay_recordings(model):
+    """Every model's recording replays without missing endpoints."""
+    replay = ReplayRouter.from_file(RECORDINGS_DIR / f"{model}.json")
+    with serve_in_thread(replay.app) as host:
+        result, _ = _poll(host, model)
+    assert len(result["devices"]) == 10
+    assert result["wan"] == {"WAN_uptime": 88760, "WAN_connected": True}
+    assert result["details"] == {"PowerOnTime": 1234}
+    assert not replay.misses
+
+
+def test_replay_latency():
+    """Replies are delayed by the configured latency and jitter."""
+    replay = ReplayRouter(
+        synthetic_recording("F6640", 1), latency=0.02, jitter=0.01, seed=1
+    )
+    with serve_in_thread(replay.app) as host:
+        started = time.perf_counter()
+        _, client = _poll(host, "F6640")
+        elapsed = time.perf_counter() - started
+    requests = sum(replay.hits.values())
+    assert elapsed >= requests * 0.01
+    endpoints = client.instrumentation.summary()["endpoints"]
+    assert endpoints["menuData:accessdev_landevs_lua.lua"]["total"]["avg_ms"] >= 10
@@ -0,0 +1,194 @@
+"""Tests for the domain-wide poll scheduler."""
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+
+from custom_components.zte_tracker.const import DOMAIN_DATA
+from custom_components.zte_tracker.coordinator import ZteDataCoordinator
+from custom_components.zte_tracker import scheduler as scheduler_module
+from custom_components.zte_tracker.scheduler import (
+    ZtePollScheduler,
+    async_get_scheduler,
+)
+
+
+def _coordinator(entry_id, interval=60, data=None, max_polls=4):
+    coordinator = Mock()
+    coordinator.entry.entry_id = entry_id
+    coordinator.max_concurrent_polls = max_polls
+    coordinator.update_interval = timedelta(seconds=interval)
+    coordinator.data = data
+    coordinator.available = True
+    return coordinator
+
+
+@pytest.mark.asyncio
+async def test_scheduler_caps_concurrent_polls():
+    """No more than max_concurrent fetches run at once."""
+    scheduler = ZtePollScheduler()
+    coordinators = [_coordinator(f"entry{i}", max_polls=3 + i) for i in range(5)]
+    coordinators[3].max_concurrent_polls = 2
+    for coordinator in coordinators:
+        scheduler.register(coordinator)
+    running = 0
+    peak = 0
+
+    async def _poll(coordinator):
+        nonlocal running, peak
+        async with scheduler.fetch_slot(coordinator):
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*(_poll(c) for c in coordinators))
+    assert peak == 2
+    metrics = scheduler.metrics()
+    assert metrics["routers"] == 5
+    assert metrics["polls"] == 5
+    assert metrics["polls_per_minute"] == 5
+    assert metrics["max_polls_in_flight"] == 2
+    assert metrics["max_concurrent_polls"] == 2
+    assert metrics["polls_in_flight"] == 0
+    assert metrics["avg_poll_wait"] > 0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_staggers_polls():
+    """Polls after the first are spaced by interval / routers."""
+    scheduler = ZtePollScheduler()
+    coordinators = [_coordinator(f"entry{i}", interval=2, data={}) for i in range(2)]
+    unregister = [scheduler.register(c) for c in coordinators]
+    loop = asyncio.get_running_loop()
+    starts = []
+
+    async def _poll(coordinator):
+        await scheduler.wait_turn(coordinator)
+        async with scheduler.fetch_slot(coordinator):
+            starts.append(loop.time())
+
+    await asyncio.gather(*(_poll(c) for c in coordinators))
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert all(gap >= 0.9 for gap in gaps)
+
+    for callback in unregister:
+        callback()
+    assert scheduler.coordinators == []
+    assert coordinators[0].scheduler is None
+
+    # Spacing is rounded to whole seconds; short intervals aren't spaced.
+    scheduler.register(coordinators[0])
+    coordinators[0].update_interval = timedelta(seconds=0.2)
+    assert scheduler._spacing(coordinators[0]) == 0
+
+
+@pytest.mark.parametrize("routers", [2, 3])
+@pytest.mark.asyncio
+async def test_scheduler_spreads_phases(routers):
+    """Routers polling at the same moment end up at phases spread evenly
+    over the interval, and keep them on the following polls."""
+    now = 1000.0
+    waits = []
+
+    async def _sleep(delay):
+        waits.append(delay)
+
+    clock = SimpleNamespace(
+        get_running_loop=lambda: SimpleNamespace(time=lambda: now), sleep=_sleep
+    )
+    scheduler = ZtePollScheduler()
+    coordinators = [
+        _coordinator(f"entry{i}", interval=60, data={}) for i in range(routers)
+    ]
+    for coordinator in coordinators:
+        scheduler.register(coordinator)
+
+    with patch.object(scheduler_module, "asyncio", clock):
+        for coordinator in coordinators:
+            await scheduler.wait_turn(coordinator)
+        phases = [0.0, *waits]
+        assert phases == [60 / routers * i for i in range(routers)]
+
+        # Each next refresh is due an interval after the poll started.
+        waits.clear()
+        for coordinator, phase in zip(coordinators, phases):
+            now = 1060.0 + phase
+            await scheduler.wait_turn(coordinator)
+        assert waits == []
+
+
+@pytest.mark.asyncio
+async def test_scheduler_limit_follows_options():
+    """The lowest limit of the registered entries applies, and raising it
+    lets waiting fetches start."""
+    scheduler = ZtePollScheduler(max_concurrent=3)
+    assert scheduler.max_concurrent == 3
+    first = _coordinator("entry0", max_polls=1)
+    second = _coordinator("entry1", max_polls=5)
+    scheduler.register(first)
+    unregister = scheduler.register(second)
+    assert scheduler.max_concurrent == 1
+
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def _hold():
+        async with scheduler.fetch_slot(first):
+            started.set()
+            await release.wait()
+
+    async def _poll():
+        async with scheduler.fetch_slot(second):
+            pass
+
+    holder = asyncio.create_task(_hold())
+    await started.wait()
+    waiting = asyncio.create_task(_poll())
+    await asyncio.sleep(0.01)
+    assert not waiting.done()
+    first.max_concurrent_polls = 2
+    release.set()
+    await asyncio.gather(holder, waiting)
+    assert scheduler.max_concurrent == 2
+    unregister()
+    assert scheduler.max_concurrent == 2
+
+
+@pytest.mark.asyncio
+async def test_scheduler_spacing_before_client_lock(
+    hass, mock_config_entry, mock_zte_client
+):
+    """A poll waits for its turn without holding the coordinator's client
+    lock."""
+    with patch(
+        "custom_components.zte_tracker.coordinator.zteClient",
+        return_value=mock_zte_client,
+    ):
+        coordinator = ZteDataCoordinator(hass, mock_config_entry)
+    mock_zte_client.fetch_all.side_effect = lambda *args: {
+        "devices": mock_zte_client.get_devices_response.return_value,
+        "wan": None,
+        "details": None,
+        "topology": None,
+    }
+    scheduler = ZtePollScheduler()
+    scheduler.register(coordinator)
+    lock_held = []
+
+    async def _wait_turn(coordinator):
+        lock_held.append(coordinator._client_lock.locked())
+
+    with patch.object(scheduler, "wait_turn", side_effect=_wait_turn):
+        coordinator.data = await coordinator._async_update_data()
+    assert lock_held == [False]
+    assert coordinator.data["router_info"]["status"] == "connected"
+
+
+def test_scheduler_shared_per_hass(hass):
+    """All config entries get the same scheduler."""
+    scheduler = async_get_scheduler(hass)
+    assert async_get_scheduler(hass) is scheduler
+    assert hass.data[DOMAIN_DATA] is scheduler
@@ -0,0 +1,66 @@
+"""Tests for the remembered WLAN fetch sequence."""
+
+import pytest
+
+from custom_components.zte_tracker.zteclient.async_zte_client import AsyncZteClient
+from custom_components.zte_tracker.zteclient.strategy import StrategyCache
+
+WLAN = "GET menuData wlan_client_stat_lua.lua"
+VIEW = "GET menuView localNetStatus"
+
+
+def test_strategy_cache():
+    """Remembered strategies go first until they fail or expire."""
+    now = [0.0]
+    cache = StrategyCache(reprobe_interval=60, clock=lambda: now[0])
+    strategies = ("direct", "view_first")
+    assert cache.order("wlan", strategies) == ["direct", "view_first"]
+    cache.succeeded("wlan", "view_first")
+    assert cache.order("wlan", strategies) == ["view_first", "direct"]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.failed("wlan", "direct")
+    now[0] = 30
+    cache.succeeded("wlan", "view_first")
+    assert cache.order("wlan", strategies)[0] == "view_first"
+    # Expiry counts from when the strategy was first recorded
+    now[0] = 60
+    assert cache.order("wlan", strategies)[0] == "direct"
+
+    cache.succeeded("wlan", "view_first")
+    cache.failed("wlan", "view_first")
+    assert cache.stats() == {"strategies": {}, "hits": 2, "misses": 2}
+
+
+async def _poll(client: AsyncZteClient) -> None:
+    assert await client.login()
+    try:
+        assert await client.get_wifi_devices()
+    finally:
+        await client.logout()
+
+
+@pytest.mark.asyncio
+async def test_wlan_strategy_remembered(router):
+    """A router needing the context request is asked for it up front."""
+    router.wlan_needs_view = True
+    client = AsyncZteClient(router.host, "admin", "secret", "F6640", scheme="http")
+    await _poll(client)
+    assert (router.hits[WLAN], router.hits[VIEW]) == (2, 1)
+
+    router.hits.clear()
+    await _poll(client)
+    assert (router.hits[WLAN], router.hits[VIEW]) == (1, 1)
+    assert client.strategies.stats() == {
+        "strategies": {"wlan": "view_first"},
+        "hits": 1,
+        "misses": 1,
+    }
+
+    # A firmware that answers directly again is noticed once it expires
+    router.wlan_needs_view = False
+    client.strategies.reprobe_interval = 0
+    router.hits.clear()
+    await _poll(client)
+    assert (router.hits[WLAN], router.hits[VIEW]) == (1, 0)
+    assert client.strategies.stats()["strategies"] == {"wlan": "direct"}
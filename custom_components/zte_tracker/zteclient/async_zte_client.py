@@ -0,0 +1,578 @@
+"""Asyncio ZTE router client built on aiohttp."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import json
+import logging
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+
+from ..const import DEFAULT_MAX_CONCURRENT_REQUESTS
+from .device_record import DeviceRecord
+from .fetch_planner import FAILED, FetchPlanner
+from .instrumentation import RequestTiming, endpoint_tag
+from .zte_client import _WLAN_STRATEGIES, UNCHANGED, _Unchanged, zteClient
+
+_LOGGER = logging.getLogger(__name__)
+
+_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+# Longer than the poll interval so pooled connections survive between polls
+_KEEPALIVE_TIMEOUT = 300
+
+
+def _trace_config() -> aiohttp.TraceConfig:
+    """Return a trace config that timestamps the stages of each request.
+
+    The timestamps (loop time) go into the dict passed as the request's
+    ``trace_request_ctx``. aiohttp reports TCP and TLS setup as one
+    connection-create stage.
+    """
+    config = aiohttp.TraceConfig()
+
+    def _mark(stage: str) -> Callable[..., Awaitable[None]]:
+        async def _on_stage(
+            session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+        ) -> None:
+            marks = context.trace_request_ctx
+            if isinstance(marks, dict):
+                marks[stage] = asyncio.get_running_loop().time()
+
+        return _on_stage
+
+    config.on_dns_resolvehost_start.append(_mark("dns_start"))
+    config.on_dns_resolvehost_end.append(_mark("dns_end"))
+    config.on_connection_create_start.append(_mark("connect_start"))
+    config.on_connection_create_end.append(_mark("connect_end"))
+    config.on_request_end.append(_mark("headers"))
+    return config
+
+
+def _between(marks: dict[str, float], start: str, end: str) -> float | None:
+    if start in marks and end in marks:
+        return marks[end] - marks[start]
+    return None
+
+
+class _Response:
+    """Fully-read HTTP response, mirroring the parts of requests we use."""
+
+    __slots__ = ("status_code", "url", "content", "text")
+
+    def __init__(self, status_code: int, url: str, content: bytes, text: str) -> None:
+        self.status_code = status_code
+        self.url = url
+        self.content = content
+        self.text = text
+
+    def json(self) -> Any:
+        """Decode the body as JSON."""
+        return json.loads(self.text)
+
+
+class AsyncZteClient(zteClient):
+    """ZTE router client running on an aiohttp ClientSession.
+
+    Exposes the same surface as :class:`zteClient` but every method that
+    talks to the router is a coroutine, so polls run on the event loop
+    instead of occupying an executor thread. Parsing is shared with the
+    blocking client. Independent endpoint chains of a poll are run
+    concurrently by a :class:`FetchPlanner`.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the client."""
+        super().__init__(*args, **kwargs)
+        self.session: aiohttp.ClientSession | None = None
+        self.planner = FetchPlanner(max_concurrency)
+        self._connector: aiohttp.TCPConnector | None = None
+        self._cookie_jar: aiohttp.CookieJar | None = None
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        *,
+        data: Any = None,
+        headers: dict[str, str] | None = None,
+        timeout: int = 10,
+    ) -> _Response:
+        """Send a request on the current session and read the whole body."""
+        if not self.session:
+            raise RuntimeError("Session not initialized")
+        loop = asyncio.get_running_loop()
+        marks: dict[str, float] = {"start": loop.time()}
+        r: _Response | None = None
+        try:
+            async with self.session.request(
+                method,
+                url,
+                data=data,
+                headers=headers,
+                ssl=self.verify_ssl,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+                trace_request_ctx=marks,
+            ) as resp:
+                content = await resp.read()
+                text = await resp.text(errors="replace")
+                r = _Response(resp.status, str(resp.url), content, text)
+                self._record_request(method, url, marks, r.status_code, len(content))
+                self.log_request(r)
+                resp.raise_for_status()
+                return r
+        except Exception as ex:
+            if r is None:
+                self._record_request(method, url, marks, None, 0, type(ex).__name__)
+            raise
+
+    def _record_request(
+        self,
+        method: str,
+        url: str,
+        marks: dict[str, float],
+        status: int | None,
+        size: int,
+        error: str | None = None,
+    ) -> None:
+        """Record the timing of a request from its trace timestamps."""
+        self.instrumentation.record_request(
+            RequestTiming(
+                endpoint_tag(url),
+                method,
+                status,
+                size,
+                asyncio.get_running_loop().time() - marks["start"],
+                ttfb=_between(marks, "start", "headers"),
+                dns=_between(marks, "dns_start", "dns_end"),
+                connect=_between(marks, "connect_start", "connect_end"),
+                error=error,
+            )
+        )
+
+    def _timed_chain(
+        self, name: str, chain: Callable[[], Awaitable[Any]], retry: bool = True
+    ) -> Callable[[], Awaitable[Any]]:
+        """Wrap a planner chain so its duration is recorded as a phase.
+
+        With retry, a None result (the fetch failed) is returned as FAILED
+        for the planner to run the chain again alone.
+        """
+
+        async def _run() -> Any:
+            with self.instrumentation.phase(name):
+                result = await chain()
+            return FAILED if retry and result is None else result
+
+        return _run
+
+    async def _get(self, url: str, timeout: int = 10) -> _Response:
+        """GET helper."""
+        return await self._request("GET", url, timeout=timeout)
+
+    def log_request(self, r):
+        if not r:
+            return
+        _LOGGER.debug("Request %d URL: %s", r.status_code, r.url)
+
+    def _connection_pool(self) -> aiohttp.TCPConnector:
+        """Return the connector pooling the connections to the router."""
+        if self._connector is None or self._connector.closed:
+            self._connector = aiohttp.TCPConnector(
+                limit=self.pool_size, keepalive_timeout=_KEEPALIVE_TIMEOUT
+            )
+        return self._connector
+
+    def connection_stats(self) -> dict[str, Any]:
+        """Return the pool size; asyncio does not resume TLS sessions."""
+        return {"pool_size": self.pool_size, "isolate_cookies": self.isolate_cookies}
+
+    async def close(self) -> None:
+        """Close the session and the pooled connections to the router."""
+        await self._close_session()
+        self._cookie_jar = None
+        connector, self._connector = self._connector, None
+        if connector is not None and not connector.closed:
+            await connector.close()
+
+    async def _setup_session(self) -> None:
+        """Set up the aiohttp session with browser-like headers.
+
+        The session shares the client's connector, so connections are
+        kept across logins; see zteClient._setup_session for cookies.
+        """
+        await self._close_session()
+        if self.isolate_cookies or self._cookie_jar is None:
+            # unsafe=True lets the jar keep cookies set by IP-address hosts,
+            # which is how routers are usually addressed.
+            self._cookie_jar = aiohttp.CookieJar(unsafe=True)
+        self.session = aiohttp.ClientSession(
+            connector=self._connection_pool(),
+            connector_owner=False,
+            cookie_jar=self._cookie_jar,
+            headers={"User-Agent": _USER_AGENT, "DNT": "1"},
+            trace_configs=[_trace_config()],
+        )
+
+        if self._browser_session():
+            # Mesh topology requires browser-like session initialization,
+            # see zteClient._setup_session.
+            try:
+                await self._get(f"{self.base_url}/")
+            except Exception:
+                pass  # Best-effort; login will fail later if unreachable
+
+            self.session.headers.update(
+                {
+                    "X-Requested-With": "XMLHttpRequest",
+                    "Referer": f"{self.base_url}/",
+                }
+            )
+
+    async def _close_session(self) -> None:
+        """Close the aiohttp session, if any."""
+        session, self.session = self.session, None
+        if session is not None and not session.closed:
+            await session.close()
+
+    async def login(self) -> bool:
+        """Login procedure using ZTE challenge. Returns True if successful."""
+        try:
+            # Check if we are logged in already.
+            if self.login_data is not None and self.session is not None:
+                if self.login_data.get("login_need_refresh") == 0:
+                    _LOGGER.debug("Already logged in, no need to refresh.")
+                    return True
+
+            await self._setup_session()
+            # Step1: Get session token
+            try:
+                session_token = await self.get_session_token()
+            except aiohttp.ClientConnectionError:
+                self.statusmsg = f"Cannot connect to router at {self.host}. Please check network and address."
+                return False
+            except asyncio.TimeoutError:
+                self.statusmsg = f"Connection to router at {self.host} timed out."
+                return False
+            except Exception as e:
+                self.statusmsg = f"Error getting session token: {e}"
+                return False
+
+            # Step2: Query for login token
+            try:
+                r = await self._get(
+                    f"{self.base_url}/?_type=loginData&_tag=login_token&_={self.get_guid()}"
+                )
+            except aiohttp.ClientConnectionError:
+                self.statusmsg = (
+                    f"Cannot connect to router at {self.host} (login token)."
+                )
+                return False
+            except asyncio.TimeoutError:
+                self.statusmsg = (
+                    f"Connection to router at {self.host} timed out (login token)."
+                )
+                return False
+            except Exception as e:
+                self.statusmsg = f"Error getting login token: {e}"
+                return False
+
+            login_token = self._parse_login_token(r.content)
+            if not login_token:
+                return False
+
+            # Step3: Login entry
+            password_param = self._password_param(login_token)
+            try:
+                r = await self._request(
+                    "POST",
+                    f"{self.base_url}/?_type=loginData&_tag=login_entry",
+                    data={
+                        "action": "login",
+                        "Password": password_param,
+                        "Username": self.username,
+                        "_sessionTOKEN": session_token,
+                    },
+                )
+                self.login_data = r.json()
+            except aiohttp.ClientConnectionError:
+                self.statusmsg = (
+                    f"Cannot connect to router at {self.host} (login entry)."
+                )
+                return False
+            except asyncio.TimeoutError:
+                self.statusmsg = (
+                    f"Connection to router at {self.host} timed out (login entry)."
+                )
+                return False
+            except Exception as e:
+                self.statusmsg = f"Error during login entry: {e}"
+                return False
+
+            # Handle refresh requirement
+            if self.login_data.get("login_need_refresh") == 1:
+                _LOGGER.debug("Login refresh required")
+                if self._browser_session():
+                    try:
+                        await self._get(f"{self.base_url}/")
+                    except Exception:
+                        pass  # Best-effort reload
+            return self._check_login_data()
+        except Exception as e:
+            self.statusmsg = f"Failed login: {e}"
+            _LOGGER.error(self.statusmsg)
+            self.login_data = None
+            await self._close_session()
+            return False
+
+    async def get_session_token(self) -> str:
+        """Get session token from router."""
+        r = await self._get(f"{self.base_url}/?_type=loginData&_tag=login_entry")
+        return self._parse_session_token(r.json())
+
+    async def logout(self) -> None:
+        """Logout from router."""
+        try:
+            # Check if we are logged in.
+            if self.login_data is None or not self.session:
+                return
+
+            await self._request(
+                "POST",
+                f"{self.base_url}?_type=loginData&_tag=logout_entry",
+                data={"IF_LogOff": "1"},
+            )
+            _LOGGER.debug("Logged out successfully")
+
+        except Exception as e:
+            _LOGGER.error("Failed to logout: %s", e)
+        finally:
+            await self._close_session()
+            self.login_data = None
+
+    async def get_devices_response(self) -> list[DeviceRecord] | _Unchanged | None:
+        """Get the list of LAN and WLAN devices.
+
+        Returns UNCHANGED if both replies match the previous poll.
+        """
+        try:
+            lists: dict[str, list[DeviceRecord] | None] = {}
+            await self._device_chain(lists)()
+            return self._combine_payloads(lists["lan"], lists["wlan"])
+
+        except Exception as e:
+            _LOGGER.error("Error getting device response: %s", e)
+            return None
+
+    async def fetch_all(
+        self, topology: bool = False, wan: bool = True, details: bool = True
+    ) -> dict[str, Any]:
+        """Fetch everything a poll needs, running independent chains at once.
+
+        Same result shape as :meth:`zteClient.fetch_all`. The device
+        lists, WAN, router-details and topology chains each start with
+        their own menuView request, so the planner runs them concurrently
+        and the poll takes about as long as the slowest chain. The WLAN
+        list shares the LAN list's menu, so both are one chain (see
+        _device_chain). Firmwares that keep a single menu per session are
+        detected by the planner, which then runs the chains one by one.
+        """
+        lists: dict[str, list[DeviceRecord] | None] = {}
+        chains = {"devices": self._device_chain(lists)}
+        # Endpoints the model does not serve are never requested
+        if wan and self.query_wan_status and self.supports("wan"):
+            chains["wan"] = self._timed_chain("fetch.wan", self._fetch_wan_status)
+        if details and self.query_router_details and self.supports("details"):
+            chains["details"] = self._timed_chain(
+                "fetch.details", self.get_router_details
+            )
+        if topology and self._topology_allowed() is not None:
+            # None is also a router without a mesh or an open circuit
+            # breaker: not a reason to request the topology twice.
+            chains["topology"] = self._timed_chain(
+                "fetch.topology", self._try_topology, retry=False
+            )
+
+        results = await self.planner.run(chains)
+        devices = self._combine_payloads(lists["lan"], lists["wlan"])
+        topo = results.get("topology") if devices is not None else None
+        if topo and devices is UNCHANGED:
+            devices = self.last_devices()
+        return {
+            "devices": devices,
+            "wan": (results.get("wan") or {}) if wan else None,
+            "details": results.get("details", {}) if details else None,
+            "topology": topo,
+        }
+
+    def _device_chain(
+        self, lists: dict[str, list[DeviceRecord] | None]
+    ) -> Callable[[], Awaitable[Any]]:
+        """Return a planner chain fetching the LAN list, then the WLAN list.
+
+        The WLAN list is in the localNetStatus menu the LAN fetch opens,
+        and the direct WLAN request relies on that context, so the two
+        never run apart. The lists are stored in lists; the chain returns
+        FAILED, for the planner to run it again alone, if either failed.
+        """
+
+        async def _run() -> Any:
+            phase = self.instrumentation.phase
+            with phase("fetch.lan"):
+                lists["lan"] = await self.get_lan_devices()
+            with phase("fetch.wlan"):
+                lists["wlan"] = await self.get_wifi_devices()
+            return FAILED if None in lists.values() else lists
+
+        return _run
+
+    async def get_lan_devices(self) -> list[DeviceRecord] | None:
+        """Get the list of devices connected to the LAN ports."""
+        try:
+            # First request to set up context
+            await self._get(self._url("net_view"))
+
+            # Main request for LAN devices
+            r = await self._get(self._url("lan"))
+
+            devices = self._parse_device_payload(
+                "lan", r, self.profile.lan_id_element, "LAN"
+            )
+            self.statusmsg = "OK"
+            return devices
+
+        except Exception as e:
+            self._forget_payload("lan")
+            self.statusmsg = f"Failed to get LAN devices: {e}"
+            _LOGGER.error(self.statusmsg)
+            return None
+
+    async def get_wifi_devices(self) -> list[DeviceRecord] | None:
+        """Get the list of devices connected to the wifi."""
+        try:
+            # Start with the sequence that worked last time
+            error: Exception | None = None
+            for strategy in self.strategies.order("wlan", _WLAN_STRATEGIES):
+                try:
+                    for endpoint in _WLAN_STRATEGIES[strategy]:
+                        r = await self._get(self._url(endpoint))
+                except Exception as ex:
+                    self.strategies.failed("wlan", strategy)
+                    error = ex
+                    continue
+                self.strategies.succeeded("wlan", strategy)
+                break
+            else:
+                raise error
+
+            devices = self._parse_device_payload(
+                "wlan", r, self.profile.wlan_id_element, "WLAN"
+            )
+            self.statusmsg = "OK"
+            return devices
+
+        except Exception as e:
+            self._forget_payload("wlan")
+            self.statusmsg = f"Failed to get WiFi devices: {e}"
+            _LOGGER.error(self.statusmsg)
+            return None
+
+    async def _try_topology(self) -> list[DeviceRecord] | None:
+        """Fetch all devices via the mesh topology endpoint.
+
+        See :meth:`zteClient._try_topology`; shares its circuit breaker.
+        """
+        allowed = self._topology_allowed()
+        if allowed is None or not self.session:
+            return None
+        _, failures = allowed
+        try:
+            # Navigate to topology context (like clicking "Topology" tab)
+            await self._get(self._url("topology_view"))
+            r = await self._get(self._url("topology"))
+            return self._handle_topology_text(r.text, failures)
+        except Exception as ex:
+            _LOGGER.debug("Topology inline failed: %s", ex)
+            self._topology_failed(failures)
+            return None
+
+    async def get_router_details(self) -> dict[str, Any] | None:
+        """Get router details."""
+        if not getattr(self, "query_router_details", True):
+            _LOGGER.debug("Router details query disabled by client flag")
+            return {}
+        if not self.supports("details"):
+            return {}
+        try:
+            await self._get(self._url("details_view"))
+            r = await self._get(self._url("details"))
+            return self._parse_router_details(r.text)
+
+        except Exception as e:
+            _LOGGER.error("Error fetching router details: %s", e)
+            return None
+
+    async def get_wan_status(self) -> dict[str, Any]:
+        """Fetch WAN status and return relevant attributes."""
+        if not getattr(self, "query_wan_status", True):
+            _LOGGER.debug("WAN status query disabled by client flag")
+            return {}
+        if not self.supports("wan"):
+            return {}
+
+        return await self._fetch_wan_status() or {}
+
+    async def _fetch_wan_status(self) -> dict[str, Any] | None:
+        """Fetch WAN status, returning None on failure."""
+        try:
+            await self._get(self._url("wan_view"))
+            r = await self._get(self._url("wan"))
+            return self._parse_wan_status(r.text)
+        except Exception as ex:
+            _LOGGER.warning(f"Failed to fetch WAN status: {ex}")
+            return None
+
+    async def reboot(self) -> bool:
+        """Reboot the router using the secure endpoint."""
+        try:
+            if not await self.login():
+                _LOGGER.error("Login failed: %s", self.statusmsg)
+                return False
+
+            await self._get(self._url("reboot_view"), timeout=30)
+
+            # Now prepare the reboot request.
+            session_token = await self.get_session_token()
+            if not session_token:
+                self.statusmsg = "Session token missing after login"
+                _LOGGER.error(self.statusmsg)
+                return False
+
+            post_data, headers = self._build_reboot_request(session_token)
+            r = await self._request(
+                "POST",
+                self._url("reboot"),
+                data=post_data,
+                headers=headers,
+                timeout=30,
+            )
+            self._check_reboot_response(r.content)
+
+            self.statusmsg = "Reboot command sent successfully."
+            return True
+        except Exception as e:
+            self.statusmsg = f"Failed to reboot: {e}"
+            _LOGGER.error(self.statusmsg)
+            return False
+        finally:
+            await self.logout()
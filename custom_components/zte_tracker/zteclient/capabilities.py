@@ -0,0 +1,280 @@
+"""Find which endpoints a router actually serves.
+
+The model picked at setup only tells which scripts its firmware usually
+serves. The prober tries the scripts and tags of every known model on a
+logged-in client at setup, after a firmware change and periodically
+(see the coordinator), and returns the working set. The config entry stores it, and clients apply
+it over their model (see ModelProfile.with_capabilities), so polls never
+spend requests on endpoints known to fail.
+
+A group is only recorded as unsupported when the router answered every
+candidate with an empty or invalid reply. Timeouts, HTTP errors and
+router errors (such as an expired session) leave it unknown, and the
+model's own endpoints are kept until a later probe.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+import json
+import logging
+import re
+from typing import TYPE_CHECKING, Any
+import xml.etree.ElementTree as ET
+
+import requests
+
+from .model_registry import GROUPS, MODELS, Endpoint
+
+if TYPE_CHECKING:
+    from .zte_client import zteClient
+
+_LOGGER = logging.getLogger(__name__)
+
+CAPABILITIES_VERSION = 1
+
+# Profile fields that select the endpoints of each probed group. The
+# request types are shared by all groups and follow the device lists.
+_TYPE_FIELDS = ("type_first_request", "type_main_request")
+_GROUP_FIELDS: dict[str, tuple[str, ...]] = {
+    "lan": ("lan_script", "lan_id_element"),
+    "wlan": ("wlan_script", "wlan_id_element"),
+    "wan": ("tag_wan_status_view", "tag_wan_status_data"),
+    "topology": ("topo_data_tag",),
+}
+_SUCCESS = ("SUCC", "SUCCESS", "OK")
+_ERROR_STR = re.compile(r"<IF_ERRORSTR>([^<]*)</IF_ERRORSTR>")
+
+# Outcomes of probing a group
+_FOUND = "found"
+_ABSENT = "absent"
+_UNKNOWN = "unknown"
+
+
+def _candidates(model: str, group: str) -> list[dict[str, Any]]:
+    """Return the field values of a group seen in any model, model's first."""
+    fields = _TYPE_FIELDS + _GROUP_FIELDS[group]
+    candidates: list[dict[str, Any]] = []
+    for profile in (MODELS[model], *MODELS.values()):
+        values = {field: getattr(profile, field) for field in fields}
+        if None not in values.values() and values not in candidates:
+            candidates.append(values)
+    return candidates
+
+
+class _Probe:
+    """Requests of one probe run on a logged-in client."""
+
+    def __init__(self, client: zteClient) -> None:
+        self.client = client
+        self.requests = 0
+
+    def get(self, endpoint: Endpoint, headers: dict[str, str] | None = None) -> str:
+        """Request an endpoint and return the reply, raising on HTTP errors."""
+        client = self.client
+        self.requests += 1
+        r = client.session.get(
+            f"{endpoint.prefix(client.base_url)}{client.get_guid()}",
+            headers=headers,
+            verify=client.verify_ssl,
+            timeout=10,
+        )
+        r.raise_for_status()
+        # A router error (an expired session, say) tells nothing about
+        # the endpoint; _is_negative() treats it as unknown.
+        error = _ERROR_STR.search(r.text)
+        if error and error.group(1) not in _SUCCESS:
+            raise RuntimeError(f"Router error: {error.group(1)}")
+        return r.text
+
+    def device_list(self, values: dict[str, Any], group: str) -> bool:
+        """Return True if the list node is in the reply.
+
+        Without it the script may be unknown or the list empty; the
+        model's own script is kept then.
+        """
+        script, node = (values[field] for field in _GROUP_FIELDS[group])
+        self.get(Endpoint(values["type_first_request"], "localNetStatus"))
+        xml = ET.fromstring(self.get(Endpoint(values["type_main_request"], script)))
+        return xml.find(node) is not None
+
+    def wan(self, values: dict[str, Any]) -> bool:
+        self.get(Endpoint(values["type_first_request"], values["tag_wan_status_view"]))
+        text = self.get(
+            Endpoint(values["type_main_request"], values["tag_wan_status_data"])
+        )
+        return bool(self.client._parse_wan_status(text))
+
+    def topology(self, values: dict[str, Any]) -> bool:
+        base_url = self.client.base_url
+        # Topology needs the page load and XHR headers of a browser session
+        self.client.session.get(
+            f"{base_url}/", verify=self.client.verify_ssl, timeout=10
+        )
+        headers = {"X-Requested-With": "XMLHttpRequest", "Referer": f"{base_url}/"}
+        self.get(Endpoint("menuView", "mmTopology&Menu3Location=0"), headers)
+        text = self.get(Endpoint("menuData", values["topo_data_tag"]), headers)
+        data = json.loads(text)
+        return isinstance(data, dict) and isinstance(data.get("ad"), dict)
+
+    def details(self) -> dict[str, Any]:
+        self.get(Endpoint("menuView", "statusMgr&Menu3Location=0"))
+        text = self.get(Endpoint("menuData", "devmgr_statusmgr_lua.lua"))
+        return self.client._parse_router_details(text)
+
+
+def _is_negative(ex: Exception) -> bool:
+    """Return True if a probe error says the endpoint is not served.
+
+    That is an invalid reply (XML or JSON that doesn't parse, such as the
+    empty reply to an unknown script) or a 404. Anything else may be
+    transient.
+    """
+    if isinstance(ex, requests.HTTPError):
+        return ex.response is not None and ex.response.status_code == 404
+    return isinstance(ex, (ET.ParseError, ValueError))
+
+
+def _first_working(
+    check, candidates: list[dict[str, Any]]
+) -> tuple[str, dict[str, Any] | None]:
+    """Return the outcome and the first candidate check() accepts.
+
+    The outcome is _ABSENT only if every candidate was answered and
+    refused; if none worked but one failed otherwise, it is _UNKNOWN.
+    """
+    outcome = _ABSENT
+    for values in candidates:
+        try:
+            if check(values):
+                return _FOUND, values
+        except Exception as ex:  # noqa: BLE001
+            _LOGGER.debug("Probe of %s failed: %s", values, ex)
+            if not _is_negative(ex):
+                outcome = _UNKNOWN
+    return outcome, None
+
+
+def probe_capabilities(client: zteClient) -> dict[str, Any]:
+    """Probe the endpoints of a logged-in client's router.
+
+    Returns the profile fields that differ from the client's model
+    (``overrides``), the feature groups nothing answered (``unsupported``)
+    and the firmware and model names the router reports, if any. The
+    device lists are never marked unsupported; if no candidate answers
+    with a device list, the model's own scripts are kept.
+    """
+    model = client.model
+    probe = _Probe(client)
+    profile = MODELS[model]
+    chosen: dict[str, Any] = {}
+    unsupported: list[str] = []
+    unknown: list[str] = []
+
+    for group in ("lan", "wlan"):
+        candidates = _candidates(model, group)
+        outcome, values = _first_working(
+            lambda v: probe.device_list(v, group), candidates
+        )
+        if values is not None:
+            chosen.update(values)
+        elif outcome == _UNKNOWN:
+            unknown.append(group)
+    types = {
+        field: chosen.get(field, getattr(profile, field)) for field in _TYPE_FIELDS
+    }
+
+    for group, check in (("wan", probe.wan), ("topology", probe.topology)):
+        # Only tags served with the request types of the device lists
+        candidates = [
+            values
+            for values in _candidates(model, group)
+            if all(values[field] == types[field] for field in _TYPE_FIELDS)
+        ]
+        outcome, values = _first_working(check, candidates)
+        if values is not None:
+            chosen.update(values)
+        elif outcome == _ABSENT:
+            unsupported.append(group)
+        else:
+            unknown.append(group)
+
+    details: dict[str, Any] = {}
+    try:
+        details = probe.details()
+    except Exception as ex:  # noqa: BLE001
+        _LOGGER.debug("Probe of router details failed: %s", ex)
+        (unsupported if _is_negative(ex) else unknown).append("details")
+    else:
+        if not details:
+            unsupported.append("details")
+
+    overrides = {
+        field: value
+        for field, value in chosen.items()
+        if getattr(profile, field) != value
+    }
+    capabilities = {
+        "version": CAPABILITIES_VERSION,
+        "model": model,
+        "firmware": details.get("SoftwareVer"),
+        "reported_model": details.get("ModelName"),
+        "probed_at": datetime.now().isoformat(),
+        "overrides": overrides,
+        "unsupported": [group for group in GROUPS if group in unsupported],
+        # Groups whose probe failed without an answer; probed again sooner
+        "unknown": [group for group in GROUPS if group in unknown],
+    }
+    _LOGGER.info(
+        "Probed %s (%s) in %d requests: overrides %s, unsupported %s, unknown %s",
+        client.host,
+        model,
+        probe.requests,
+        overrides,
+        capabilities["unsupported"],
+        capabilities["unknown"],
+    )
+    reported = capabilities["reported_model"]
+    if reported and reported != model and reported in MODELS:
+        _LOGGER.warning(
+            "Router %s reports model %s but is configured as %s",
+            client.host,
+            reported,
+            model,
+        )
+    return capabilities
+
+
+def merge_capabilities(
+    previous: dict[str, Any] | None, probed: dict[str, Any]
+) -> dict[str, Any]:
+    """Return a probe's results with its unknown groups taken from previous.
+
+    A group the new probe couldn't tell (a timeout, say) keeps the
+    overrides and unsupported state of the previous probe of the same
+    model, if it had one for that group.
+    """
+    if not previous or previous.get("model") != probed["model"]:
+        return probed
+    overrides = dict(probed["overrides"])
+    unsupported = set(probed["unsupported"])
+    unknown = set(probed.get("unknown", ()))
+    for group in probed.get("unknown", ()):
+        if group in previous.get("unsupported", ()):
+            unsupported.add(group)
+            unknown.discard(group)
+            continue
+        fields = _GROUP_FIELDS.get(group, ())
+        if group in ("lan", "wlan"):
+            fields += _TYPE_FIELDS
+        overrides.update(
+            (field, value)
+            for field, value in previous.get("overrides", {}).items()
+            if field in fields
+        )
+    return {
+        **probed,
+        "overrides": overrides,
+        "unsupported": [group for group in GROUPS if group in unsupported],
+        "unknown": [group for group in GROUPS if group in unknown],
+    }
@@ -0,0 +1,117 @@
+"""Typed record of one client device, from the parsers to the entities."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, fields, replace
+from enum import StrEnum
+import sys
+from typing import Any
+
+
+class NetworkType(StrEnum):
+    """How a device is attached to the router."""
+
+    LAN = "LAN"
+    WLAN = "WLAN"
+    UNKNOWN = "Unknown"
+
+
+def intern_mesh_node(name: str) -> str:
+    """Return the shared copy of a mesh node name.
+
+    A mesh has a handful of nodes but every device names one, so all
+    records point at the same few strings.
+    """
+    return sys.intern(name) if name else ""
+
+
+# Keys of the dicts DeviceRecord replaced: the parser/topology names
+# ("MACAddress", ...) and the coordinator's device entries ("mac", ...).
+# Mapping-style access through them keeps older callers working.
+_LEGACY_KEYS = {
+    "MACAddress": "mac",
+    "HostName": "name",
+    "IPAddress": "ip",
+    "Active": "active",
+    "IconType": "icon_type",
+    "NetworkType": "network_type",
+    "Port": "port",
+    "LinkTime": "link_time",
+    "ConnectTime": "connect_time",
+    "MeshNode": "mesh_node",
+    "_AccessType": "access_type",
+}
+
+
+@dataclass(slots=True)
+class DeviceRecord:
+    """One device as reported by the router.
+
+    Parsers create a record per device and poll; the coordinator fills in
+    ``last_seen`` and caches it. Once published in coordinator data a
+    record is not modified again: changes are made on a copy.
+    """
+
+    mac: str = ""
+    name: str = ""
+    ip: str = ""
+    active: bool = True
+    icon_type: str | None = None
+    network_type: NetworkType = NetworkType.UNKNOWN
+    port: str = ""  # LAN port or WLAN ESSID
+    link_time: str = ""
+    connect_time: str = ""
+    mesh_node: str = ""
+    access_type: str = ""
+    last_seen: str | None = None
+
+    @classmethod
+    def from_legacy(cls, device: Mapping[str, Any]) -> DeviceRecord:
+        """Build a record from a device dict keyed by any legacy names.
+
+        A dict without Active is inactive, as the coordinator treated it.
+        """
+        record = cls(active=False)
+        for key, value in device.items():
+            attr = _LEGACY_KEYS.get(key, key)
+            if attr in _FIELD_NAMES:
+                setattr(record, attr, value)
+        record.network_type = NetworkType(record.network_type or "Unknown")
+        record.mesh_node = intern_mesh_node(record.mesh_node)
+        return record
+
+    def copy(self) -> DeviceRecord:
+        """Return a shallow copy."""
+        return replace(self)
+
+    # Mapping shim for code written against the device dicts.
+
+    def keys(self) -> frozenset[str]:
+        """Return the field names."""
+        return _FIELD_NAMES
+
+    def __getitem__(self, key: str) -> Any:
+        attr = _LEGACY_KEYS.get(key, key)
+        if attr not in _FIELD_NAMES:
+            raise KeyError(key)
+        return getattr(self, attr)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        attr = _LEGACY_KEYS.get(key, key)
+        if attr not in _FIELD_NAMES:
+            raise KeyError(key)
+        setattr(self, attr, value)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and _LEGACY_KEYS.get(key, key) in _FIELD_NAMES
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a field by current or legacy name, else default."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+_FIELD_NAMES = frozenset(field.name for field in fields(DeviceRecord))
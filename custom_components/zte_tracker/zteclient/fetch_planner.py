@@ -0,0 +1,111 @@
+"""Concurrent execution of the independent request chains of one poll."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+from typing import Any
+
+from ..const import DEFAULT_MAX_CONCURRENT_REQUESTS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Polls in a row where chains failed in parallel but recovered when re-run
+# one at a time before we decide the firmware can't share a SID between
+# concurrent requests and stay sequential for the lifetime of the client.
+PARALLEL_FAILURE_LIMIT = 2
+
+Chain = Callable[[], Awaitable[Any]]
+
+
+class _Failed:
+    """Type of the FAILED sentinel."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "FAILED"
+
+
+# Returned by a chain whose requests the router rejected or that errored.
+# Only these chains are re-run alone; None means the router had no data
+# for the chain and is final.
+FAILED = _Failed()
+
+
+class FetchPlanner:
+    """Run the endpoint chains of a poll concurrently, up to a limit.
+
+    Each chain is one menuView -> menuData sequence (or a single menuData
+    request) whose steps depend on each other; distinct chains don't, so
+    they can share the session concurrently. A chain signals failure by
+    returning FAILED, which the results carry as None.
+
+    Some firmwares keep a single "current menu" per SID and answer
+    interleaved chains with errors. When chains fail in parallel but
+    succeed when re-run sequentially, the planner counts it and, after
+    PARALLEL_FAILURE_LIMIT polls, falls back to sequential mode for good.
+    """
+
+    def __init__(
+        self, max_concurrency: int = DEFAULT_MAX_CONCURRENT_REQUESTS
+    ) -> None:
+        """Initialize the planner."""
+        self.max_concurrency = max_concurrency
+        self.parallel_supported = True
+        self._parallel_failures = 0
+
+    @property
+    def concurrent(self) -> bool:
+        """Return True if chains will run concurrently."""
+        return self.parallel_supported and self.max_concurrency > 1
+
+    async def run(self, chains: dict[str, Chain]) -> dict[str, Any]:
+        """Run all chains and return their results keyed by chain name."""
+        if not self.concurrent or len(chains) < 2:
+            return self._finish(await self._run_sequential(chains))
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _guarded(chain: Chain) -> Any:
+            async with semaphore:
+                return await chain()
+
+        values = await asyncio.gather(*(_guarded(chain) for chain in chains.values()))
+        results = dict(zip(chains, values))
+
+        failed = [name for name, value in results.items() if value is FAILED]
+        if not failed:
+            self._parallel_failures = 0
+            return results
+
+        retried = await self._run_sequential({name: chains[name] for name in failed})
+        results.update(retried)
+        if any(value is not FAILED for value in retried.values()):
+            self._parallel_failures += 1
+            _LOGGER.debug(
+                "Chains %s failed in parallel but recovered sequentially (%d/%d)",
+                failed,
+                self._parallel_failures,
+                PARALLEL_FAILURE_LIMIT,
+            )
+            if self._parallel_failures >= PARALLEL_FAILURE_LIMIT:
+                _LOGGER.warning(
+                    "Router rejects parallel requests on one session; "
+                    "falling back to sequential fetches"
+                )
+                self.parallel_supported = False
+        return self._finish(results)
+
+    @staticmethod
+    def _finish(results: dict[str, Any]) -> dict[str, Any]:
+        """Return the results with failed chains as None."""
+        return {
+            name: None if value is FAILED else value for name, value in results.items()
+        }
+
+    @staticmethod
+    async def _run_sequential(chains: dict[str, Chain]) -> dict[str, Any]:
+        """Run chains one after the other."""
+        return {name: await chain() for name, chain in chains.items()}
@@ -0,0 +1,236 @@
+"""Timing of router requests and poll phases, aggregated into histograms."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+_LOGGER = logging.getLogger(__name__)
+
+# Upper bounds of the histogram buckets, in milliseconds
+BUCKET_BOUNDS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Requests kept for the diagnostics download
+RECENT_REQUESTS = 20
+
+
+class Histogram:
+    """Bucketed distribution of durations, with count, mean and maximum."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Add a duration."""
+        ms = seconds * 1000
+        for index, bound in enumerate(BUCKET_BOUNDS_MS):
+            if ms <= bound:
+                break
+        else:
+            index = len(BUCKET_BOUNDS_MS)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def quantile(self, q: float) -> float | None:
+        """Return the bucket bound (ms) below which a fraction q falls."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                break
+        return BUCKET_BOUNDS_MS[index] if index < len(BUCKET_BOUNDS_MS) else self.max
+
+    def summary(self) -> dict[str, Any]:
+        """Return count, mean, p50, p95 and max in milliseconds."""
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count, 1) if self.count else None,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "max_ms": round(self.max, 1),
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the summary and the bucket counts."""
+        buckets = {
+            f"le_{bound}": count for bound, count in zip(BUCKET_BOUNDS_MS, self.counts)
+        }
+        buckets["inf"] = self.counts[-1]
+        return {**self.summary(), "buckets": buckets}
+
+
+@dataclass(slots=True)
+class RequestTiming:
+    """Timing of one HTTP request to the router, in seconds.
+
+    Transports fill in what they can measure: ttfb is the time until the
+    response headers arrived; dns and connect are None for requests on a
+    reused connection or when the transport can't tell them apart.
+    """
+
+    endpoint: str
+    method: str
+    status: int | None
+    size: int
+    total: float
+    ttfb: float | None = None
+    dns: float | None = None
+    connect: float | None = None
+    error: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the timing with durations in milliseconds."""
+        return {
+            "endpoint": self.endpoint,
+            "method": self.method,
+            "status": self.status,
+            "size": self.size,
+            "error": self.error,
+            **{
+                f"{name}_ms": None if value is None else round(value * 1000, 1)
+                for name, value in (
+                    ("total", self.total),
+                    ("ttfb", self.ttfb),
+                    ("dns", self.dns),
+                    ("connect", self.connect),
+                )
+            },
+        }
+
+
+_REQUEST_PHASES = ("total", "ttfb", "dns", "connect")
+
+
+class EndpointStats:
+    """Aggregated requests to one endpoint."""
+
+    __slots__ = ("requests", "errors", "bytes", "last_status", "histograms")
+
+    def __init__(self) -> None:
+        """Initialize empty stats."""
+        self.requests = 0
+        self.errors = 0
+        self.bytes = 0
+        self.last_status: int | None = None
+        self.histograms: dict[str, Histogram] = {}
+
+    def add(self, timing: RequestTiming) -> None:
+        """Add one request."""
+        self.requests += 1
+        self.bytes += timing.size
+        self.last_status = timing.status
+        if timing.error is not None:
+            self.errors += 1
+        for phase in _REQUEST_PHASES:
+            value = getattr(timing, phase)
+            if value is not None:
+                self.histograms.setdefault(phase, Histogram()).observe(value)
+
+    def as_dict(self, full: bool = False) -> dict[str, Any]:
+        """Return the stats; full adds the histogram buckets."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "last_status": self.last_status,
+            **{
+                phase: histogram.as_dict() if full else histogram.summary()
+                for phase, histogram in self.histograms.items()
+            },
+        }
+
+
+def endpoint_tag(url: str) -> str:
+    """Return a short name for the router endpoint a URL addresses.
+
+    ZTE endpoints are selected by query parameters (``_type`` and
+    ``_tag``) rather than by path.
+    """
+    parts = urlsplit(url)
+    query = parse_qs(parts.query)
+    tag = query.get("_tag", [""])[0]
+    kind = query.get("_type", [""])[0]
+    if tag or kind:
+        return f"{kind}:{tag}" if kind and tag else tag or kind
+    return parts.path or "/"
+
+
+class Instrumentation:
+    """Collects request timings and named phase durations.
+
+    One instance belongs to a client; the coordinator records its own
+    phases (lock wait, merge, listener dispatch, ...) into the same one
+    so a poll can be broken down in one place.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty instrumentation."""
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.phases: dict[str, Histogram] = {}
+        self.last_phases: dict[str, float] = {}
+        self.recent_requests: deque[RequestTiming] = deque(maxlen=RECENT_REQUESTS)
+
+    def record_request(self, timing: RequestTiming) -> None:
+        """Add the timing of one request."""
+        self.endpoints.setdefault(timing.endpoint, EndpointStats()).add(timing)
+        self.recent_requests.append(timing)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Request timing: %s", timing.as_dict())
+
+    def observe(self, phase: str, seconds: float) -> None:
+        """Add a duration of a named phase."""
+        self.phases.setdefault(phase, Histogram()).observe(seconds)
+        self.last_phases[phase] = seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a phase, including awaits inside it."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def summary(self) -> dict[str, Any]:
+        """Return per-phase and per-endpoint summaries."""
+        return {
+            "phases": {
+                name: histogram.summary() for name, histogram in self.phases.items()
+            },
+            "endpoints": {
+                name: stats.as_dict() for name, stats in self.endpoints.items()
+            },
+        }
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return everything collected, including buckets and recent requests."""
+        return {
+            "phases": {
+                name: histogram.as_dict() for name, histogram in self.phases.items()
+            },
+            "last_phases_ms": {
+                name: round(seconds * 1000, 1)
+                for name, seconds in self.last_phases.items()
+            },
+            "endpoints": {
+                name: stats.as_dict(full=True) for name, stats in self.endpoints.items()
+            },
+            "recent_requests": [timing.as_dict() for timing in self.recent_requests],
+        }
@@ -0,0 +1,185 @@
+"""Router models and the endpoints each of them serves.
+
+The models are declared in ``models.json``: per model the scripts and
+node names of its device lists, the WAN status tags, the optional mesh
+topology script and the key its firmware checks reboot requests with. A
+model can extend another and override some of its fields, which is how
+synonyms and firmware variants are declared. A new firmware only needs
+an entry there (or in a file passed to :func:`register_model_file`).
+
+Each endpoint is a ``_type``/``_tag`` pair. A client compiles them once
+into URL prefixes so a request only appends its guid.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, fields, replace
+import json
+from pathlib import Path
+from typing import Any
+
+MODELS_FILE = Path(__file__).parent / "models.json"
+MODELS_VERSION = 1
+
+# Endpoints each feature group needs, in request order. A model supports
+# a group when it declares all of them and does not list it as unsupported.
+GROUPS: dict[str, tuple[str, ...]] = {
+    "lan": ("net_view", "lan"),
+    "wlan": ("net_view", "wlan"),
+    "wan": ("wan_view", "wan"),
+    "details": ("details_view", "details"),
+    "topology": ("topology_view", "topology"),
+    "reboot": ("reboot_view", "reboot"),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Endpoint:
+    """One router endpoint; tag may carry extra query parameters."""
+
+    type: str
+    tag: str
+
+    def prefix(self, base_url: str) -> str:
+        """Return the URL of this endpoint up to its guid."""
+        return f"{base_url}/?_type={self.type}&_tag={self.tag}&_="
+
+
+@dataclass(frozen=True, slots=True)
+class ModelProfile:
+    """The endpoints and reply formats of one router model."""
+
+    name: str
+    lan_script: str
+    lan_id_element: str
+    wlan_script: str
+    wlan_id_element: str
+    type_first_request: str
+    type_main_request: str
+    tag_wan_status_view: str
+    tag_wan_status_data: str
+    reboot_key: str
+    default_scheme: str = "https"
+    topo_data_tag: str | None = None
+    unsupported: frozenset[str] = frozenset()
+
+    def endpoints(self) -> dict[str, Endpoint]:
+        """Return the endpoints of this model by name."""
+        first, main = self.type_first_request, self.type_main_request
+        endpoints = {
+            "net_view": Endpoint(first, "localNetStatus"),
+            "lan": Endpoint(main, self.lan_script),
+            "wlan": Endpoint(main, self.wlan_script),
+            "wan_view": Endpoint(first, self.tag_wan_status_view),
+            "wan": Endpoint(main, self.tag_wan_status_data),
+            "details_view": Endpoint("menuView", "statusMgr&Menu3Location=0"),
+            "details": Endpoint("menuData", "devmgr_statusmgr_lua.lua"),
+            "reboot_view": Endpoint("menuView", "rebootAndReset&Menu3Location=0"),
+            "reboot": Endpoint("menuData", "devmgr_restartmgr_lua.lua"),
+        }
+        if self.topo_data_tag:
+            endpoints["topology_view"] = Endpoint(
+                "menuView", "mmTopology&Menu3Location=0"
+            )
+            endpoints["topology"] = Endpoint("menuData", self.topo_data_tag)
+        return endpoints
+
+    def supports(self, group: str) -> bool:
+        """Return True if the model serves a feature group (see GROUPS)."""
+        if group in self.unsupported:
+            return False
+        endpoints = self.endpoints()
+        return all(name in endpoints for name in GROUPS[group])
+
+    def supported_groups(self) -> list[str]:
+        """Return the feature groups the model serves."""
+        return [group for group in GROUPS if self.supports(group)]
+
+    def compile(self, base_url: str) -> dict[str, str]:
+        """Return the URL prefix of every supported endpoint by name."""
+        endpoints = self.endpoints()
+        names = {name for group in self.supported_groups() for name in GROUPS[group]}
+        return {name: endpoints[name].prefix(base_url) for name in names}
+
+    def with_capabilities(self, capabilities: dict[str, Any] | None) -> ModelProfile:
+        """Return this profile with a probe's results applied.
+
+        Results probed for another model are ignored, as are fields the
+        profile does not have (from a newer or older release).
+        """
+        if not capabilities or capabilities.get("model") != self.name:
+            return self
+        overrides = {
+            field: value
+            for field, value in capabilities.get("overrides", {}).items()
+            if field in _PROBED_FIELDS
+        }
+        unsupported = self.unsupported | {
+            group for group in capabilities.get("unsupported", ()) if group in GROUPS
+        }
+        return replace(self, **overrides, unsupported=unsupported)
+
+
+_FIELDS = {field.name for field in fields(ModelProfile)}
+# Fields a capability probe may override
+_PROBED_FIELDS = _FIELDS - {"name", "reboot_key", "default_scheme", "unsupported"}
+
+
+def load_model_file(
+    path: str | Path, base: dict[str, ModelProfile] | None = None
+) -> dict[str, ModelProfile]:
+    """Return the models declared in a file, by name.
+
+    Models may extend each other or the models of base. Keys starting
+    with an underscore are notes and ignored.
+    """
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if data.get("version") != MODELS_VERSION:
+        raise ValueError(f"Unsupported models file version: {data.get('version')}")
+    keys: dict[str, str] = data.get("reboot_keys", {})
+    raw: dict[str, dict[str, Any]] = {}
+    models: dict[str, ModelProfile] = {}
+
+    for name, entry in data["models"].items():
+        values: dict[str, Any] = {}
+        parent = entry.get("extends")
+        if parent in raw:
+            values.update(raw[parent])
+        elif base and parent in base:
+            parent_profile = base[parent]
+            values.update(
+                {field: getattr(parent_profile, field) for field in _FIELDS}
+            )
+        elif parent is not None:
+            raise ValueError(f"Model {name} extends unknown model {parent}")
+        values.update(
+            (key, value)
+            for key, value in entry.items()
+            if key != "extends" and not key.startswith("_")
+        )
+        raw[name] = values
+
+        unknown = set(values) - _FIELDS
+        if unknown:
+            raise ValueError(f"Model {name} has unknown fields: {sorted(unknown)}")
+        reboot_key = values["reboot_key"]
+        models[name] = ModelProfile(
+            **{
+                **values,
+                "name": name,
+                # Keys are named in the file; a profile carries the PEM
+                "reboot_key": keys.get(reboot_key, reboot_key),
+                "unsupported": frozenset(values.get("unsupported", ())),
+            }
+        )
+    return models
+
+
+MODELS: dict[str, ModelProfile] = load_model_file(MODELS_FILE)
+
+
+def register_model_file(path: str | Path) -> list[str]:
+    """Add or replace the models declared in a file; return their names."""
+    models = load_model_file(path, MODELS)
+    MODELS.update(models)
+    return list(models)
@@ -0,0 +1,260 @@
+"""Record router responses to replay them in tests and benchmarks.
+
+A recording holds the last response of every endpoint a client called,
+keyed by method and endpoint tag (``GET menuData:wlan_client_stat_lua.lua``),
+so it can be served back by a stand-in router. MAC and IP addresses,
+host and network names, serial numbers and WAN credentials are replaced by
+stable placeholders before saving.
+
+Record a router from the command line::
+
+    python -m custom_components.zte_tracker.zteclient.recorder \\
+        192.168.1.1 admin PASSWORD F6640 F6640.json
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import asdict, dataclass
+import ipaddress
+import json
+from pathlib import Path
+import re
+from typing import Any
+
+from .instrumentation import endpoint_tag
+
+RECORDING_VERSION = 1
+
+_MAC_RE = re.compile(r"\b(?:[0-9A-Fa-f]{2}[:-]){5}[0-9A-Fa-f]{2}\b")
+_OCTET = r"(?:25[0-5]|2[0-4]\d|1?\d?\d)"
+_IPV4_RE = re.compile(rf"(?<![\w.]){_OCTET}(?:\.{_OCTET}){{3}}(?![\w.])")
+# Candidates only; ipaddress decides, which also leaves MACs and times alone
+_IPV6_RE = re.compile(
+    r"(?<![\w:])(?:[0-9A-Fa-f]{0,4}:){2,7}[0-9A-Fa-f]{0,4}(?![\w:])"
+)
+
+# Fields whose values are replaced, by ParaName (XML replies) or key (JSON
+# replies), with the prefix of their placeholders. Fields sharing a prefix
+# share the placeholders, so a device keeps its name across endpoints.
+_PRIVATE_FIELDS = {
+    "HostName": "host",
+    "AliasName": "host",
+    "DeviceName": "host",
+    "ESSID": "ssid",
+    "SSID": "ssid",
+    "SerialNumber": "serial",
+    "GponSn": "serial",
+    "UserName": "user",
+    "Username": "user",
+    "Password": "secret",
+    "KeyPassphrase": "secret",
+    "PreSharedKey": "secret",
+}
+_FIELD_NAMES = "|".join(_PRIVATE_FIELDS)
+_FIELD_RES = (
+    re.compile(
+        rf"(<ParaName>({_FIELD_NAMES})</ParaName>\s*<ParaValue>)([^<]*)(</ParaValue>)"
+    ),
+    re.compile(rf'("({_FIELD_NAMES})"\s*:\s*")((?:[^"\\]|\\.)*)(")'),
+)
+
+
+def response_key(method: str, url: str) -> str:
+    """Return the key a response to a request is recorded under."""
+    return f"{method.upper()} {endpoint_tag(url)}"
+
+
+@dataclass(slots=True)
+class RecordedResponse:
+    """One recorded router response."""
+
+    status: int
+    content_type: str | None
+    body: str
+
+
+class Anonymizer:
+    """Replace addresses and private field values with stable placeholders.
+
+    The same value always maps to the same placeholder, so the devices of
+    a recording stay consistent across endpoints. Unspecified addresses
+    and netmasks are kept, as they identify nothing.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty mappings."""
+        self._macs: dict[str, str] = {}
+        self._ipv4: dict[str, str] = {}
+        self._ipv6: dict[str, str] = {}
+        # Placeholder prefix -> value -> placeholder
+        self._fields: dict[str, dict[str, str]] = {}
+
+    def _mac(self, match: re.Match[str]) -> str:
+        mac = match.group(0).upper().replace("-", ":")
+        if mac not in self._macs:
+            index = len(self._macs) + 1
+            # Locally administered unicast range
+            self._macs[mac] = "02:00:00:" + ":".join(
+                f"{(index >> shift) & 0xFF:02X}" for shift in (16, 8, 0)
+            )
+        return self._macs[mac]
+
+    def _ipv4_address(self, match: re.Match[str]) -> str:
+        address = match.group(0)
+        if address == "0.0.0.0" or address.startswith("255."):
+            return address
+        if address not in self._ipv4:
+            index = len(self._ipv4) + 1
+            # Private range
+            self._ipv4[address] = "10." + ".".join(
+                str((index >> shift) & 0xFF) for shift in (16, 8, 0)
+            )
+        return self._ipv4[address]
+
+    def _ipv6_address(self, match: re.Match[str]) -> str:
+        try:
+            address = ipaddress.IPv6Address(match.group(0))
+        except ValueError:
+            return match.group(0)
+        if address.is_unspecified or address.is_loopback:
+            return match.group(0)
+        if address not in self._ipv6:
+            # Unique local range
+            self._ipv6[address] = f"fd00::{len(self._ipv6) + 1:x}"
+        return self._ipv6[address]
+
+    def _field(self, match: re.Match[str]) -> str:
+        value = match.group(3)
+        if not value:
+            return match.group(0)
+        prefix = _PRIVATE_FIELDS[match.group(2)]
+        placeholders = self._fields.setdefault(prefix, {})
+        if value not in placeholders:
+            placeholders[value] = f"{prefix}-{len(placeholders) + 1}"
+        return f"{match.group(1)}{placeholders[value]}{match.group(4)}"
+
+    def __call__(self, body: str) -> str:
+        """Return the body with addresses and private values replaced."""
+        for field_re in _FIELD_RES:
+            body = field_re.sub(self._field, body)
+        body = _IPV6_RE.sub(self._ipv6_address, body)
+        body = _IPV4_RE.sub(self._ipv4_address, body)
+        return _MAC_RE.sub(self._mac, body)
+
+
+class ResponseRecorder:
+    """Keep the last response of every endpoint a client calls."""
+
+    def __init__(self, model: str, anonymize: bool = True) -> None:
+        """Initialize an empty recording for a router model."""
+        self.model = model
+        self.responses: dict[str, RecordedResponse] = {}
+        self._anonymize = Anonymizer() if anonymize else None
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        content_type: str | None,
+        body: bytes,
+    ) -> None:
+        """Add a response, replacing an earlier one of the same endpoint."""
+        text = body.decode("utf-8", errors="replace")
+        if self._anonymize is not None:
+            text = self._anonymize(text)
+        self.responses[response_key(method, url)] = RecordedResponse(
+            status, content_type, text
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the recording in its file format."""
+        return {
+            "version": RECORDING_VERSION,
+            "model": self.model,
+            "responses": {
+                key: asdict(response) for key, response in self.responses.items()
+            },
+        }
+
+    def save(self, path: str | Path) -> None:
+        """Write the recording as JSON."""
+        Path(path).write_text(
+            json.dumps(self.as_dict(), indent=1, ensure_ascii=False) + "\n",
+            encoding="utf-8",
+        )
+
+
+def load_recording(path: str | Path) -> tuple[str, dict[str, RecordedResponse]]:
+    """Return the model and responses of a recording file."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if data.get("version") != RECORDING_VERSION:
+        raise ValueError(f"Unsupported recording version: {data.get('version')}")
+    return data["model"], {
+        key: RecordedResponse(**response)
+        for key, response in data["responses"].items()
+    }
+
+
+def record_router(
+    host: str,
+    username: str,
+    password: str,
+    model: str,
+    path: str | Path,
+    scheme: str = "auto",
+    anonymize: bool = True,
+) -> dict[str, RecordedResponse]:
+    """Poll a router once with every optional query and save the responses."""
+    from .zte_client import zteClient
+
+    client = zteClient(
+        host,
+        username,
+        password,
+        model,
+        query_wan_status=True,
+        query_router_details=True,
+        scheme=scheme,
+    )
+    client.recorder = ResponseRecorder(model, anonymize=anonymize)
+    if not client.login():
+        raise RuntimeError(client.statusmsg or "Login failed")
+    try:
+        client.fetch_all()
+    finally:
+        client.logout()
+    client.recorder.save(path)
+    return client.recorder.responses
+
+
+def main() -> None:
+    """Record a router from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("host")
+    parser.add_argument("username")
+    parser.add_argument("password")
+    parser.add_argument("model")
+    parser.add_argument("output", help="recording file to write")
+    parser.add_argument("--scheme", default="auto", choices=("auto", "http", "https"))
+    parser.add_argument(
+        "--no-anonymize",
+        action="store_true",
+        help="keep real addresses, names and serial numbers",
+    )
+    args = parser.parse_args()
+    responses = record_router(
+        args.host,
+        args.username,
+        args.password,
+        args.model,
+        args.output,
+        scheme=args.scheme,
+        anonymize=not args.no_anonymize,
+    )
+    print(f"Recorded {len(responses)} responses to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Remember which request sequence fetches an endpoint.
+
+Some firmwares answer a menuData request directly; others need its
+menuView (context) request first. Trying the direct request first on
+every poll wastes a round trip on the latter, so the client records the
+sequence that worked and starts with it on later polls. The record is
+dropped when its sequence fails, and expires after REPROBE_INTERVAL so
+a firmware update that no longer needs the context request is noticed.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+import time
+from typing import Any
+
+# Seconds after which a remembered sequence is probed again from the
+# default order.
+REPROBE_INTERVAL = 3600
+
+
+class StrategyCache:
+    """The sequences that last worked, by endpoint group, with hit counts."""
+
+    def __init__(
+        self,
+        reprobe_interval: float = REPROBE_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.reprobe_interval = reprobe_interval
+        self._clock = clock
+        # group -> (strategy, monotonic time it was recorded)
+        self._chosen: dict[str, tuple[str, float]] = {}
+        # Polls that started with a remembered sequence, and polls that
+        # had none (first poll, expired or failed)
+        self.hits = 0
+        self.misses = 0
+
+    def order(self, group: str, strategies: Iterable[str]) -> list[str]:
+        """Return the strategies of a group in the order to try them."""
+        strategies = list(strategies)
+        chosen = self._chosen.get(group)
+        if chosen is not None and (
+            self._clock() - chosen[1] >= self.reprobe_interval
+            or chosen[0] not in strategies
+        ):
+            del self._chosen[group]
+            chosen = None
+        if chosen is None:
+            self.misses += 1
+            return strategies
+        self.hits += 1
+        strategies.remove(chosen[0])
+        return [chosen[0], *strategies]
+
+    def succeeded(self, group: str, strategy: str) -> None:
+        """Remember the strategy that fetched a group."""
+        current = self._chosen.get(group)
+        if current is None or current[0] != strategy:
+            self._chosen[group] = (strategy, self._clock())
+
+    def failed(self, group: str, strategy: str) -> None:
+        """Forget a group's strategy if it is the one that failed."""
+        current = self._chosen.get(group)
+        if current is not None and current[0] == strategy:
+            del self._chosen[group]
+
+    def clear(self) -> None:
+        """Forget every strategy (the endpoints changed)."""
+        self._chosen.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Return the remembered strategies and the hit/miss counts."""
+        return {
+            "strategies": {group: chosen[0] for group, chosen in self._chosen.items()},
+            "hits": self.hits,
+            "misses": self.misses,
+        }
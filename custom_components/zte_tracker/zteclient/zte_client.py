@@ -6,89 +6,231 @@ from os import error
 """ZTE router client with improved security and error handling."""
 
 import base64
+from functools import lru_cache
 import hashlib
 import json
 import logging
+import ssl
 import time
 from typing import Any
 import warnings
+import weakref
 import xml.etree.ElementTree as ET
 
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
 import requests
 from requests import Session
 from requests.adapters import HTTPAdapter
+from requests.cookies import RequestsCookieJar
 from urllib3.exceptions import InsecureRequestWarning
 from urllib3.util.retry import Retry
 
-from ..const import DEFAULT_QUERY_ROUTER_DETAILS, DEFAULT_QUERY_WAN_STATUS
+from ..const import (
+    DEFAULT_CONNECTION_POOL_SIZE,
+    DEFAULT_ISOLATE_COOKIES,
+    DEFAULT_QUERY_ROUTER_DETAILS,
+    DEFAULT_QUERY_WAN_STATUS,
+)
+from .device_record import DeviceRecord, NetworkType, intern_mesh_node
+from .instrumentation import Instrumentation, RequestTiming, endpoint_tag
+from .model_registry import MODELS, ModelProfile
+from .recorder import ResponseRecorder
+from .strategy import StrategyCache
 
 # Suppress InsecureRequestWarning globally
 warnings.simplefilter("ignore", InsecureRequestWarning)
 
 _LOGGER = logging.getLogger(__name__)
 
-_MODELS = {
-    "F6640": {
-        "wlan_script": "wlan_client_stat_lua.lua",
-        "wlan_id_element": "OBJ_WLAN_AD_ID",
-        "lan_script": "accessdev_landevs_lua.lua",
-        "lan_id_element": "OBJ_ACCESSDEV_ID",
-        "type_first_request": "menuView",
-        "type_main_request": "menuData",
-        "tag_wan_status_view": "ethWanStatus&Menu3Location=0",
-        "tag_wan_status_data": "wan_internetstatus_lua.lua&TypeUplink=2&pageType=1",
-        "topo_data_tag": "topo_lua.lua",
-        "default_scheme": "https",
-    },
-    "H288A": {
-        "wlan_script": "accessdev_ssiddev_lua.lua",
-        "wlan_id_element": "OBJ_ACCESSDEV_ID",
-        "lan_script": "accessdev_landevs_lua.lua",
-        "lan_id_element": "OBJ_ACCESSDEV_ID",
-        "type_first_request": "menuView",
-        "type_main_request": "menuData",
-        "tag_wan_status_view": "ethWanStatus&Menu3Location=0",
-        "tag_wan_status_data": "wan_internetstatus_lua.lua&TypeUplink=2&pageType=1",
-        "default_scheme": "https",
-    },
-    "H388X": {
-        "wlan_script": "accessdev_ssiddev_lua.lua",
-        "wlan_id_element": "OBJ_ACCESSDEV_ID",
-        "lan_script": "accessdev_landevs_lua.lua",
-        "lan_id_element": "OBJ_ACCESSDEV_ID",
-        "type_first_request": "menuView",
-        "type_main_request": "menuData",
-        "tag_wan_status_view": "ethWanStatus&Menu3Location=0",
-        "tag_wan_status_data": "wan_internet_lua.lua&TypeUplink=2&pageType=1",  # Reported in #44 wan_internetstatus_lua does not work on H388X
-        "default_scheme": "https",
-    },
-    "E2631": {
-        "wlan_script": "vue_client_data",
-        "wlan_id_element": "OBJ_CLIENTS_ID",
-        "lan_script": "localnet_lan_info_lua",
-        "lan_id_element": "OBJ_LAN_INFO_ID",
-        "type_first_request": "vueData",
-        "type_main_request": "vueData",
-        "tag_wan_status_view": "vue_home_device_data_no_update_sess",
-        "tag_wan_status_data": "vue_mainwan_data",
-        "default_scheme": "https",
-    },
+# parse_devices modes: "stream" walks the body with an XMLPullParser and
+# drops elements as soon as they are consumed; "tree" is the original
+# ET.fromstring + findall parser. Both return identical device records.
+PARSE_MODE_STREAM = "stream"
+PARSE_MODE_TREE = "tree"
+
+# Bytes fed to the pull parser between event drains.
+_STREAM_CHUNK_SIZE = 4 * 1024
+
+# Request sequences that fetch the WLAN list, tried in this order until
+# one has worked (see strategy.py): the direct request relies on the
+# context the LAN fetch just set, some firmwares need their own.
+_WLAN_STRATEGIES: dict[str, tuple[str, ...]] = {
+    "direct": ("wlan",),
+    "view_first": ("net_view", "wlan"),
 }
 
-# Add synonyms
-_MODELS["H169A"] = _MODELS["H288A"]
-_MODELS["H2640"] = _MODELS["H288A"]
-_MODELS["F6645P"] = _MODELS["F6640"]
-_MODELS["F6600P"] = _MODELS["F6640"]
-_MODELS["H3600P"] = _MODELS["H288A"]
-_MODELS["H6645P"] = _MODELS["H288A"]
-_MODELS["H3640"] = _MODELS["H288A"]
-_MODELS["E2631"] = _MODELS["E2631"]
-_MODELS["SR7410"] = _MODELS["E2631"]
-_MODELS["SR7110"] = _MODELS["E2631"]
-_MODELS["F680"] = _MODELS["F6640"]
+
+class _Unchanged:
+    """Type of the UNCHANGED sentinel."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "UNCHANGED"
+
+
+# Returned in place of the device list when the LAN and WLAN replies are
+# byte-identical to the previous poll.
+UNCHANGED = _Unchanged()
+
+
+@lru_cache(maxsize=None)
+def _reboot_public_key(pem: str) -> rsa.RSAPublicKey:
+    """Load a reboot public key once; the firmware keys are a handful."""
+    return serialization.load_pem_public_key(pem.encode("utf-8"))
+
+
+@lru_cache(maxsize=1024)
+def _parse_connect_time(value: str) -> str:
+    """Convert 2025/11/17 Mon 14:23:45 to ISO format, else return as-is.
+
+    Cached because ConnectTime only changes when a client reconnects, so
+    the same strings come back poll after poll.
+    """
+    try:
+        return datetime.datetime.strptime(value, "%Y/%m/%d %a %H:%M:%S").isoformat()
+    except ValueError:
+        return value
+
+
+def _parse_active(value: str) -> bool:
+    return value.lower() in ("1", "true", "yes")
+
+
+# ParaName -> (DeviceRecord field, value converter), for the streaming parser.
+_DEVICE_FIELDS: dict[str, tuple[str, Any]] = {
+    "MACAddress": ("mac", str.upper),
+    "IPAddress": ("ip", None),
+    "HostName": ("name", None),
+    "IconType": ("icon_type", None),
+    "Active": ("active", _parse_active),
+    "LinkTime": ("link_time", None),
+    "ConnectTime": ("connect_time", _parse_connect_time),
+    "AliasName": ("port", None),  # Contains the LAN port.
+}
+
+
+class _TimedSession(Session):
+    """requests Session that records the timing of every request.
+
+    requests doesn't expose connection setup, so only the total time and
+    the time to the response headers (``Response.elapsed``) are recorded.
+    With a recorder, responses are also saved for replay.
+    """
+
+    def __init__(
+        self,
+        instrumentation: Instrumentation,
+        recorder: ResponseRecorder | None = None,
+    ) -> None:
+        super().__init__()
+        self.instrumentation = instrumentation
+        self.recorder = recorder
+
+    def request(self, method: str, url: str, *args: Any, **kwargs: Any):
+        started = time.perf_counter()
+        try:
+            r = super().request(method, url, *args, **kwargs)
+        except Exception as ex:
+            self.instrumentation.record_request(
+                RequestTiming(
+                    endpoint_tag(url),
+                    method,
+                    None,
+                    0,
+                    time.perf_counter() - started,
+                    error=type(ex).__name__,
+                )
+            )
+            raise
+        self.instrumentation.record_request(
+            RequestTiming(
+                endpoint_tag(url),
+                method,
+                r.status_code,
+                len(r.content),
+                time.perf_counter() - started,
+                ttfb=r.elapsed.total_seconds(),
+            )
+        )
+        if self.recorder is not None:
+            self.recorder.record(
+                method, url, r.status_code, r.headers.get("Content-Type"), r.content
+            )
+        return r
+
+
+class _ResumingSSLContext(ssl.SSLContext):
+    """SSLContext that resumes the last TLS session on new connections.
+
+    Routers close idle connections; resuming spares their slow TLS stack
+    the full handshake when the pool opens a new one.
+    """
+
+    tls_session: ssl.SSLSession | None = None
+    handshakes = 0
+    resumed = 0
+    # The newest connection, whose session save_session() keeps
+    _socket: weakref.ref[ssl.SSLSocket] | None = None
+
+    def wrap_socket(self, sock, *args: Any, **kwargs: Any) -> ssl.SSLSocket:
+        if self.tls_session is not None:
+            kwargs.setdefault("session", self.tls_session)
+        ssock = super().wrap_socket(sock, *args, **kwargs)
+        self.handshakes += 1
+        self.resumed += ssock.session_reused
+        self._socket = weakref.ref(ssock)
+        return ssock
+
+    def save_session(self) -> None:
+        """Keep the TLS session of the newest connection for the next one.
+
+        TLS 1.3 session tickets arrive after the handshake, with the first
+        reply, so this runs after each response rather than on connect.
+        """
+        ssock = self._socket() if self._socket is not None else None
+        session = ssock.session if ssock is not None else None
+        if session is not None:
+            self.tls_session = session
+
+
+def _resuming_ssl_context() -> _ResumingSSLContext:
+    """Return a client context for the connection pool."""
+    context = _ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    # urllib3 sets verify_mode per connection and matches host names itself.
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+class _PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections outlive the sessions mounting it.
+
+    Session.close() closes the mounted adapters, so close() keeps the pool
+    open; the client calls close_pool() when it is done with the router.
+    """
+
+    def __init__(self, ssl_context: _ResumingSSLContext, **kwargs: Any) -> None:
+        self.ssl_context = ssl_context
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        kwargs["ssl_context"] = self.ssl_context
+        super().init_poolmanager(*args, **kwargs)
+
+    def send(self, request: Any, *args: Any, **kwargs: Any) -> requests.Response:
+        response = super().send(request, *args, **kwargs)
+        if request.url.startswith("https:"):
+            self.ssl_context.save_session()
+        return response
+
+    def close(self) -> None:
+        """Keep the pooled connections; see close_pool."""
+
+    def close_pool(self) -> None:
+        """Close the pooled connections."""
+        super().close()
 
 
 class zteClient:
@@ -105,6 +247,10 @@ class zteClient:
         query_router_details: bool = DEFAULT_QUERY_ROUTER_DETAILS,
         scheme: str = "auto",
         mesh_topology: bool = False,
+        parse_mode: str = PARSE_MODE_STREAM,
+        pool_size: int = DEFAULT_CONNECTION_POOL_SIZE,
+        isolate_cookies: bool = DEFAULT_ISOLATE_COOKIES,
+        capabilities: dict[str, Any] | None = None,
     ) -> None:
         """Initialize the client."""
         self.statusmsg: str | None = None
@@ -115,40 +261,113 @@ class zteClient:
         self.query_wan_status = bool(query_wan_status)
         self.query_router_details = bool(query_router_details)
         self.mesh_topology = bool(mesh_topology)
+        self.parse_mode = parse_mode
+        # blake2b digest and parsed devices of the last LAN/WLAN replies.
+        self._payload_hashes: dict[str, bytes] = {}
+        self._payload_devices: dict[str, list[DeviceRecord]] = {}
+        self._unchanged_payloads: set[str] = set()
+        # Request and phase timings; the coordinator may share its own.
+        self.instrumentation = Instrumentation()
+        # Set to save every response for replay (see recorder.py).
+        self.recorder: ResponseRecorder | None = None
+        # Request sequences that worked, kept across logins
+        self.strategies = StrategyCache()
+        # Connections to the router, kept across logins (see _setup_session)
+        self.pool_size = max(1, int(pool_size))
+        self.isolate_cookies = bool(isolate_cookies)
+        self._pool: _PooledAdapter | None = None
+        self._cookies = RequestsCookieJar()
         self.session: Session | None = None
         self.login_data: dict[str, Any] | None = None
         self.status = "on"
         self.device_info: dict[str, Any] | None = None
         self.guid = int(time.time() * 1000)
         self.model = model
-        self.paths = _MODELS[model]
+        # The model's endpoints with the probed ones applied (capabilities.py)
+        self.profile: ModelProfile = MODELS[model].with_capabilities(capabilities)
         # Resolve scheme: "auto" uses model default, else user override
         if scheme == "auto":
-            self.scheme = self.paths.get("default_scheme", "https")
+            self.scheme = self.profile.default_scheme
         else:
             self.scheme = scheme
         self.base_url = f"{self.scheme}://{self.host}"
         self.verify_ssl = verify_ssl if self.scheme == "https" else False
+        # URL prefixes of the model's endpoints, compiled for base_url
+        self._urls: dict[str, str] = {}
+        self._urls_base: str | None = None
 
     @staticmethod
     def get_models() -> list[str]:
         """Return the list of supported model keys."""
-        return list(_MODELS.keys())
+        return list(MODELS.keys())
+
+    def supports(self, group: str) -> bool:
+        """Return True if the model serves a feature group (lan, wan, ...)."""
+        return self.profile.supports(group)
+
+    def _browser_session(self) -> bool:
+        """Return True if sessions need the page load and XHR headers."""
+        return self.mesh_topology and self.supports("topology")
+
+    def apply_capabilities(self, capabilities: dict[str, Any] | None) -> None:
+        """Use the endpoints a capability probe found from the next request."""
+        self.profile = MODELS[self.model].with_capabilities(capabilities)
+        self._urls_base = None
+        self.strategies.clear()
+
+    def _url(self, endpoint: str) -> str:
+        """Return the URL of a model endpoint with the next guid."""
+        if self._urls_base != self.base_url:
+            self._urls = self.profile.compile(self.base_url)
+            self._urls_base = self.base_url
+        return f"{self._urls[endpoint]}{self.get_guid()}"
+
+    def _connection_pool(self) -> _PooledAdapter:
+        """Return the adapter pooling the connections to the router."""
+        if self._pool is None:
+            # Retry once when a pooled connection turns out to be closed by
+            # the router; POSTs (login, logout, reboot) are not retried once
+            # sent.
+            retry_strategy = Retry(total=1, connect=1, read=1, status=0, redirect=0)
+            self._pool = _PooledAdapter(
+                _resuming_ssl_context(),
+                pool_connections=1,
+                pool_maxsize=self.pool_size,
+                max_retries=retry_strategy,
+            )
+        return self._pool
+
+    def connection_stats(self) -> dict[str, Any]:
+        """Return the pool size and how many TLS handshakes were resumed."""
+        context = self._pool.ssl_context if self._pool is not None else None
+        return {
+            "pool_size": self.pool_size,
+            "isolate_cookies": self.isolate_cookies,
+            "tls_handshakes": getattr(context, "handshakes", 0),
+            "tls_resumed": getattr(context, "resumed", 0),
+        }
+
+    def close(self) -> None:
+        """Close the pooled connections to the router."""
+        self.session = None
+        self._cookies.clear()
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close_pool()
 
     def _setup_session(self) -> None:
-        """Set up HTTP session with retry strategy and security settings."""
-        self.session = Session()
-
-        # Set up retry strategy
-        retry_strategy = Retry(
-            total=0,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
+        """Set up a session on the pooled connections to the router.
 
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        Each login gets a new session with an empty cookie jar, unless
+        isolate_cookies is off and the cookies of earlier logins are kept.
+        The connections and TLS sessions are kept across logins either way.
+        """
+        self.session = _TimedSession(self.instrumentation, self.recorder)
+        pool = self._connection_pool()
+        self.session.mount("http://", pool)
+        self.session.mount("https://", pool)
+        if not self.isolate_cookies:
+            self.session.cookies = self._cookies
 
         # Set headers
         self.session.headers.update(
@@ -158,7 +377,7 @@ class zteClient:
             }
         )
 
-        if self.mesh_topology:
+        if self._browser_session():
             # Mesh topology requires browser-like session initialization:
             # 1. Page load to set cookies (_TESTCOOKIESUPPORT / SID)
             # 2. XHR headers for subsequent API calls
@@ -224,24 +443,12 @@ class zteClient:
                 return False
 
             # Parse XML response
-            try:
-                xml_response = ET.fromstring(r.content)
-                if xml_response.tag != "ajax_response_xml_root":
-                    self.statusmsg = (
-                        f"Unexpected response format from router: {xml_response.tag}"
-                    )
-                    return False
-                login_token = xml_response.text
-                if not login_token:
-                    self.statusmsg = "Empty login_token received from router."
-                    return False
-            except Exception as e:
-                self.statusmsg = f"Error parsing login token XML: {e}"
+            login_token = self._parse_login_token(r.content)
+            if not login_token:
                 return False
 
             # Step3: Login entry
-            pass_hash = self.password + login_token
-            password_param = hashlib.sha256(pass_hash.encode()).hexdigest()
+            password_param = self._password_param(login_token)
             try:
                 r = self.session.post(
                     f"{self.base_url}/?_type=loginData&_tag=login_entry",
@@ -274,7 +481,7 @@ class zteClient:
             # Handle refresh requirement
             if self.login_data.get("login_need_refresh") == 1:
                 _LOGGER.debug("Login refresh required")
-                if self.mesh_topology:
+                if self._browser_session():
                     try:
                         self.session.get(
                             f"{self.base_url}/",
@@ -283,26 +490,7 @@ class zteClient:
                         )
                     except Exception:
                         pass  # Best-effort reload
-            # Check for error messaging.
-            if self.login_data.get("lockingTime", 0) == -1:
-                self.statusmsg = f"Router is locked: {self.login_data.get('loginErrMsg', 'Unknown error')}"
-                return False
-            if self.login_data.get("lockingTime", 0) > 0:
-                self.statusmsg = f"Router is locked for {self.login_data.get('lockingTime', 0)} seconds: Too many login errors."
-                return False
-
-            # Detect login denied due to bad username or password
-            if (
-                self.login_data is not None
-                and "loginErrMsg" in self.login_data
-                and self.login_data["loginErrMsg"]
-                and "password" in self.login_data["loginErrMsg"].lower()
-            ):
-                self.statusmsg = f"Login denied: {self.login_data['loginErrMsg']}"
-                return False
-
-            self.statusmsg = "Login successful."
-            return True
+            return self._check_login_data()
         except Exception as e:
             self.statusmsg = f"Failed login: {e}"
             _LOGGER.error(self.statusmsg)
@@ -312,6 +500,52 @@ class zteClient:
                 self.session = None
             return False
 
+    def _parse_login_token(self, content: bytes | str) -> str | None:
+        """Extract the login token from the login_token XML reply."""
+        try:
+            xml_response = ET.fromstring(content)
+            if xml_response.tag != "ajax_response_xml_root":
+                self.statusmsg = (
+                    f"Unexpected response format from router: {xml_response.tag}"
+                )
+                return None
+            login_token = xml_response.text
+            if not login_token:
+                self.statusmsg = "Empty login_token received from router."
+                return None
+            return login_token
+        except Exception as e:
+            self.statusmsg = f"Error parsing login token XML: {e}"
+            return None
+
+    def _password_param(self, login_token: str) -> str:
+        """Return the salted password hash expected by login_entry."""
+        pass_hash = self.password + login_token
+        return hashlib.sha256(pass_hash.encode()).hexdigest()
+
+    def _check_login_data(self) -> bool:
+        """Check the login_entry reply for lock-outs and denied logins."""
+        # Check for error messaging.
+        if self.login_data.get("lockingTime", 0) == -1:
+            self.statusmsg = f"Router is locked: {self.login_data.get('loginErrMsg', 'Unknown error')}"
+            return False
+        if self.login_data.get("lockingTime", 0) > 0:
+            self.statusmsg = f"Router is locked for {self.login_data.get('lockingTime', 0)} seconds: Too many login errors."
+            return False
+
+        # Detect login denied due to bad username or password
+        if (
+            self.login_data is not None
+            and "loginErrMsg" in self.login_data
+            and self.login_data["loginErrMsg"]
+            and "password" in self.login_data["loginErrMsg"].lower()
+        ):
+            self.statusmsg = f"Login denied: {self.login_data['loginErrMsg']}"
+            return False
+
+        self.statusmsg = "Login successful."
+        return True
+
     def get_guid(self) -> int:
         """Get next GUID for requests."""
         guid = self.guid
@@ -331,9 +565,11 @@ class zteClient:
         self.log_request(r)
         r.raise_for_status()
 
-        self.status = "on"
-        device_info = r.json()
+        return self._parse_session_token(r.json())
 
+    def _parse_session_token(self, device_info: dict[str, Any]) -> str:
+        """Extract sess_token from the login_entry JSON reply."""
+        self.status = "on"
         if device_info.get("lockingTime", 1) != 0 or not device_info.get("sess_token"):
             raise ValueError("Device is locked or session token unavailable")
 
@@ -364,28 +600,116 @@ class zteClient:
                 self.session = None
             self.login_data = None
 
-    def get_devices_response(self) -> list[dict[str, Any]] | None:
-        """Get the list of devices with connection reuse optimization."""
-        try:
-            lan_devices = self.get_lan_devices()
-            wifi_devices = self.get_wifi_devices()
-
-            if lan_devices is None and wifi_devices is None:
-                return None
-
-            devices: list[dict[str, Any]] = []
-            if lan_devices:
-                devices.extend(lan_devices)
-            if wifi_devices:
-                devices.extend(wifi_devices)
+    def get_devices_response(self) -> list[DeviceRecord] | _Unchanged | None:
+        """Get the list of devices with connection reuse optimization.
 
-            return devices
+        Returns UNCHANGED if both replies match the previous poll.
+        """
+        try:
+            with self.instrumentation.phase("fetch.lan"):
+                lan_devices = self.get_lan_devices()
+            with self.instrumentation.phase("fetch.wlan"):
+                wifi_devices = self.get_wifi_devices()
+            return self._combine_payloads(lan_devices, wifi_devices)
 
         except Exception as e:
             _LOGGER.error("Error getting device response: %s", e)
             return None
 
-    def get_lan_devices(self) -> list[dict[str, Any]] | None:
+    @staticmethod
+    def _combine_devices(
+        lan_devices: list[DeviceRecord] | None,
+        wifi_devices: list[DeviceRecord] | None,
+    ) -> list[DeviceRecord] | None:
+        """Join LAN and WLAN device lists; None if both fetches failed."""
+        if lan_devices is None and wifi_devices is None:
+            return None
+
+        devices: list[DeviceRecord] = []
+        if lan_devices:
+            devices.extend(lan_devices)
+        if wifi_devices:
+            devices.extend(wifi_devices)
+
+        return devices
+
+    def _parse_device_payload(
+        self, key: str, response: Any, node_name: str, network_type: str
+    ) -> list[DeviceRecord]:
+        """Parse a LAN/WLAN reply, reusing the last result if it is unchanged."""
+        digest = hashlib.blake2b(response.content, digest_size=16).digest()
+        if self._payload_hashes.get(key) == digest:
+            self._unchanged_payloads.add(key)
+            return self._payload_devices[key]
+
+        self._forget_payload(key)
+        with self.instrumentation.phase("parse"):
+            devices = self.parse_devices(response.text, node_name, network_type)
+        self._payload_hashes[key] = digest
+        self._payload_devices[key] = devices
+        return devices
+
+    def _forget_payload(self, key: str) -> None:
+        """Drop the cached reply of an endpoint so it is parsed next time."""
+        self._payload_hashes.pop(key, None)
+        self._payload_devices.pop(key, None)
+        self._unchanged_payloads.discard(key)
+
+    def _combine_payloads(
+        self,
+        lan_devices: list[DeviceRecord] | None,
+        wifi_devices: list[DeviceRecord] | None,
+    ) -> list[DeviceRecord] | _Unchanged | None:
+        """Combine LAN and WLAN results, or UNCHANGED if neither changed."""
+        if (
+            lan_devices is not None
+            and wifi_devices is not None
+            and self._unchanged_payloads >= {"lan", "wlan"}
+        ):
+            return UNCHANGED
+        return self._combine_devices(lan_devices, wifi_devices)
+
+    def last_devices(self) -> list[DeviceRecord] | None:
+        """Return the device list parsed from the last good replies."""
+        return self._combine_devices(
+            self._payload_devices.get("lan"), self._payload_devices.get("wlan")
+        )
+
+    def fetch_all(
+        self, topology: bool = False, wan: bool = True, details: bool = True
+    ) -> dict[str, Any]:
+        """Fetch everything a poll needs, one endpoint chain at a time.
+
+        Returns a dict with ``devices``, ``wan``, ``details`` and
+        ``topology`` (only fetched when devices were and ``topology`` is
+        set). ``wan`` and ``details`` are None when their group was not
+        requested this poll. ``devices`` is UNCHANGED when the LAN and WLAN
+        replies match the previous poll, unless topology data needs the
+        device list for enrichment.
+        """
+        phase = self.instrumentation.phase
+        devices = self.get_devices_response()
+        topo = None
+        if topology and devices is not None:
+            with phase("fetch.topology"):
+                topo = self._try_topology()
+        if topo and devices is UNCHANGED:
+            devices = self.last_devices()
+        wan_status = details_status = None
+        if wan:
+            with phase("fetch.wan"):
+                wan_status = self.get_wan_status()
+        if details:
+            with phase("fetch.details"):
+                details_status = self.get_router_details()
+        return {
+            "devices": devices,
+            "wan": wan_status,
+            "details": details_status,
+            "topology": topo,
+        }
+
+    def get_lan_devices(self) -> list[DeviceRecord] | None:
         """Get the list of devices connected to the LAN ports."""
         try:
             if not self.session:
@@ -393,65 +717,66 @@ class zteClient:
 
             # First request to set up context
             r = self.session.get(
-                f"{self.base_url}/?_type={self.paths['type_first_request']}&_tag=localNetStatus&_={self.get_guid()}",
-                verify=self.verify_ssl,
-                timeout=10,
+                self._url("net_view"), verify=self.verify_ssl, timeout=10
             )
             self.log_request(r)
             r.raise_for_status()
 
             # Main request for LAN devices
-            lan_request = f"{self.base_url}/?_type={self.paths['type_main_request']}&_tag={self.paths['lan_script']}&_={self.get_guid()}"
-            r = self.session.get(lan_request, verify=self.verify_ssl, timeout=10)
+            r = self.session.get(self._url("lan"), verify=self.verify_ssl, timeout=10)
             self.log_request(r)
             r.raise_for_status()
 
-            devices = self.parse_devices(r.text, self.paths["lan_id_element"], "LAN")
+            devices = self._parse_device_payload(
+                "lan", r, self.profile.lan_id_element, "LAN"
+            )
             self.statusmsg = "OK"
             return devices
 
         except Exception as e:
+            self._forget_payload("lan")
             self.statusmsg = f"Failed to get LAN devices: {e}"
             _LOGGER.error(self.statusmsg)
             return None
 
-    def get_wifi_devices(self) -> list[dict[str, Any]] | None:
+    def get_wifi_devices(self) -> list[DeviceRecord] | None:
         """Get the list of devices connected to the wifi."""
         try:
             if not self.session:
                 raise RuntimeError("Session not initialized")
 
-            # Since we might have already called the menu view for LAN,
-            # we can try to skip it for efficiency, but keep it for safety
-            try:
-                # Try direct request first
-                wlan_request = f"{self.base_url}/?_type={self.paths['type_main_request']}&_tag={self.paths['wlan_script']}&_={self.get_guid()}"
-                r = self.session.get(wlan_request, verify=self.verify_ssl, timeout=10)
-                r.raise_for_status()
-            except Exception:
-                # Fallback to full setup if direct request fails
-                r = self.session.get(
-                    f"{self.base_url}/?_type={self.paths['type_first_request']}&_tag=localNetStatus&_={self.get_guid()}",
-                    verify=self.verify_ssl,
-                    timeout=10,
-                )
-                r.raise_for_status()
-
-                wlan_request = f"{self.base_url}/?_type={self.paths['type_main_request']}&_tag={self.paths['wlan_script']}&_={self.get_guid()}"
-                r = self.session.get(wlan_request, verify=self.verify_ssl, timeout=10)
-                r.raise_for_status()
+            # Start with the sequence that worked last time
+            error: Exception | None = None
+            for strategy in self.strategies.order("wlan", _WLAN_STRATEGIES):
+                try:
+                    for endpoint in _WLAN_STRATEGIES[strategy]:
+                        r = self.session.get(
+                            self._url(endpoint), verify=self.verify_ssl, timeout=10
+                        )
+                        r.raise_for_status()
+                except Exception as ex:
+                    self.strategies.failed("wlan", strategy)
+                    error = ex
+                    continue
+                self.strategies.succeeded("wlan", strategy)
+                break
+            else:
+                raise error
 
             self.log_request(r)
-            devices = self.parse_devices(r.text, self.paths["wlan_id_element"], "WLAN")
+            devices = self._parse_device_payload(
+                "wlan", r, self.profile.wlan_id_element, "WLAN"
+            )
             self.statusmsg = "OK"
             return devices
 
         except Exception as e:
+            self._forget_payload("wlan")
             self.statusmsg = f"Failed to get WiFi devices: {e}"
             _LOGGER.error(self.statusmsg)
             return None
 
-    def _try_topology(self) -> list[dict[str, Any]] | None:
+    def _try_topology(self) -> list[DeviceRecord] | None:
         """Fetch all devices via the mesh topology endpoint.
 
         Uses the existing session to navigate to the topology page
@@ -463,28 +788,38 @@ class zteClient:
         Includes a circuit breaker: disables topology after 3
         consecutive failures, resets after 5-minute cooldown.
         """
-        topo_tag = self.paths.get("topo_data_tag")
-        if not topo_tag:
+        allowed = self._topology_allowed()
+        if allowed is None:
             return None
 
+        if self.session:
+            return self._fetch_topology_inline(*allowed)
+        else:
+            return None
+
+    def _topology_allowed(self) -> tuple[str, int] | None:
+        """Return ``(topo_tag, failures)`` if a topology fetch may run now.
+
+        Returns None when the model has no topology endpoint or the circuit
+        breaker is open.
+        """
+        if not self.supports("topology"):
+            return None
+        topo_tag = self.profile.topo_data_tag
+
         # Circuit breaker
         failures = getattr(self, "_topo_failures", 0)
         if failures >= 3:
-            import time as _time
             last_fail = getattr(self, "_topo_last_fail", 0)
-            if _time.time() - last_fail < 300:
+            if time.time() - last_fail < 300:
                 return None
             failures = 0
             self._topo_failures = 0
-
-        if self.session:
-            return self._fetch_topology_inline(topo_tag, failures)
-        else:
-            return None
+        return topo_tag, failures
 
     def _fetch_topology_inline(
         self, topo_tag: str, failures: int
-    ) -> list[dict[str, Any]] | None:
+    ) -> list[DeviceRecord] | None:
         """Fetch topology using the existing session (no extra login).
 
         Navigates to the topology page via menuView, then fetches the
@@ -493,48 +828,54 @@ class zteClient:
         try:
             # Navigate to topology context (like clicking "Topology" tab)
             self.session.get(
-                f"{self.base_url}/?_type=menuView&_tag=mmTopology"
-                f"&Menu3Location=0&_={self.get_guid()}",
-                verify=self.verify_ssl,
-                timeout=10,
+                self._url("topology_view"), verify=self.verify_ssl, timeout=10
             )
 
             r = self.session.get(
-                f"{self.base_url}/?_type=menuData&_tag={topo_tag}"
-                f"&_={self.get_guid()}",
-                verify=self.verify_ssl,
-                timeout=10,
+                self._url("topology"), verify=self.verify_ssl, timeout=10
             )
             self.log_request(r)
 
-            text = r.text
-            if "SessionTimeout" in text or "<html" in text[:500].lower():
-                _LOGGER.debug("Topology inline: error response (len=%d)", len(text))
-                self._topo_failures = failures + 1; self._topo_last_fail = time.time()
-                return None
+            return self._handle_topology_text(r.text, failures)
 
-            data = json.loads(text)
-            devices = self._parse_topology_json(data)
-            if devices:
-                _LOGGER.info("Topology returned %d mesh devices (inline)", len(devices))
-                self._topo_failures = 0
-                self.statusmsg = "OK"
-                return devices
+        except Exception as ex:
+            _LOGGER.debug("Topology inline failed: %s", ex)
+            self._topology_failed(failures)
+            return None
 
-            _LOGGER.debug("Topology inline: valid JSON but no devices")
-            self._topo_failures = failures + 1; self._topo_last_fail = time.time()
+    def _topology_failed(self, failures: int) -> None:
+        """Record a topology failure for the circuit breaker."""
+        self._topo_failures = failures + 1
+        self._topo_last_fail = time.time()
+
+    def _handle_topology_text(
+        self, text: str, failures: int
+    ) -> list[DeviceRecord] | None:
+        """Parse a topo_lua.lua body and update the circuit breaker."""
+        if "SessionTimeout" in text or "<html" in text[:500].lower():
+            _LOGGER.debug("Topology inline: error response (len=%d)", len(text))
+            self._topology_failed(failures)
             return None
 
+        try:
+            data = json.loads(text)
         except json.JSONDecodeError:
             _LOGGER.debug("Topology inline: non-JSON response")
-            self._topo_failures = failures + 1; self._topo_last_fail = time.time()
-            return None
-        except Exception as ex:
-            _LOGGER.debug("Topology inline failed: %s", ex)
-            self._topo_failures = failures + 1; self._topo_last_fail = time.time()
+            self._topology_failed(failures)
             return None
 
-    def _parse_topology_json(self, data: dict) -> list[dict[str, Any]] | None:
+        devices = self._parse_topology_json(data)
+        if devices:
+            _LOGGER.info("Topology returned %d mesh devices (inline)", len(devices))
+            self._topo_failures = 0
+            self.statusmsg = "OK"
+            return devices
+
+        _LOGGER.debug("Topology inline: valid JSON but no devices")
+        self._topology_failed(failures)
+        return None
+
+    def _parse_topology_json(self, data: dict) -> list[DeviceRecord] | None:
         """Parse mesh topology JSON into the standard device list format.
 
         Expected JSON structure from ``topo_lua.lua``::
@@ -567,9 +908,13 @@ class zteClient:
                 inst = slave.get("instID", "")
                 node_names[inst] = slave.get("DeviceName", inst)
 
-        access_type_map = {"0": "LAN", "1": "WLAN", "2": "WLAN"}
+        access_type_map = {
+            "0": NetworkType.LAN,
+            "1": NetworkType.WLAN,
+            "2": NetworkType.WLAN,
+        }
 
-        devices: list[dict[str, Any]] = []
+        devices: list[DeviceRecord] = []
         for key, entry in ad.items():
             if not isinstance(entry, dict):
                 continue  # skip MGET_INST_NUM and other non-device entries
@@ -582,19 +927,16 @@ class zteClient:
             access = str(entry.get("AccessType", ""))
 
             devices.append(
-                {
-                    "MACAddress": mac.upper(),
-                    "HostName": entry.get("HostName", ""),
-                    "IPAddress": entry.get("IpAddr", ""),
-                    "Active": True,
-                    "IconType": "",
-                    "NetworkType": access_type_map.get(access, "Unknown"),
-                    "_AccessType": access,
-                    "Port": "",
-                    "LinkTime": "",
-                    "ConnectTime": "",
-                    "MeshNode": node_names.get(parent_id, parent_id),
-                }
+                DeviceRecord(
+                    mac=mac.upper(),
+                    name=entry.get("HostName", ""),
+                    ip=entry.get("IpAddr", ""),
+                    active=True,
+                    icon_type="",
+                    network_type=access_type_map.get(access, NetworkType.UNKNOWN),
+                    access_type=access,
+                    mesh_node=intern_mesh_node(node_names.get(parent_id, parent_id)),
+                )
             )
 
         return devices if devices else None
@@ -604,118 +946,144 @@ class zteClient:
         if not getattr(self, "query_router_details", True):
             _LOGGER.debug("Router details query disabled by client flag")
             return {}
+        if not self.supports("details"):
+            return {}
         try:
             if not self.session:
                 raise RuntimeError("Session not initialized")
 
             # call first: https://10.0.0.1/?_type=menuView&_tag=statusMgr&Menu3Location=0&_=1756620757061
-            url = f"{self.base_url}/?_type=menuView&_tag=statusMgr&Menu3Location=0&_={self.get_guid()}"
-            r = self.session.get(url, verify=self.verify_ssl, timeout=10)
+            r = self.session.get(
+                self._url("details_view"), verify=self.verify_ssl, timeout=10
+            )
             r.raise_for_status()
             self.log_request(r)
 
-            url = f"{self.base_url}/?_type=menuData&_tag=devmgr_statusmgr_lua.lua&_={self.get_guid()}"
-            r = self.session.get(url, verify=self.verify_ssl, timeout=10)
+            r = self.session.get(
+                self._url("details"), verify=self.verify_ssl, timeout=10
+            )
             r.raise_for_status()
             self.log_request(r)
-            # Router details.
-            router_details = {}
-
-            # Parse XML response (see routers/RouterDetail.md)
-            xml = ET.fromstring(r.text)
-
-            # node OBJ_CPUMEMUSAGE_ID has CpuUsage1 to CpuUsage4, MemUsage.
-            cpu_node = xml.find("OBJ_CPUMEMUSAGE_ID/Instance")
-            if cpu_node:
-                # ElementTree elements do not provide getnext(), so iterate children in pairs:
-                children = list(cpu_node)
-                for i in range(0, len(children), 2):
-                    name_elem = children[i]
-                    value_elem = children[i + 1] if i + 1 < len(children) else None
-                    pname = name_elem.text if name_elem is not None else None
-                    pvalue = value_elem.text if value_elem is not None else None
-                    if pname and pvalue and pname != "_InstID":
+            return self._parse_router_details(r.text)
+
+        except Exception as e:
+            _LOGGER.error("Error fetching router details: %s", e)
+            return None
+
+    def _parse_router_details(self, text: str) -> dict[str, Any]:
+        """Parse the devmgr_statusmgr_lua.lua reply into router attributes."""
+        # Router details.
+        router_details = {}
+
+        # Parse XML response (see routers/RouterDetail.md)
+        xml = ET.fromstring(text)
+
+        # node OBJ_CPUMEMUSAGE_ID has CpuUsage1 to CpuUsage4, MemUsage.
+        cpu_node = xml.find("OBJ_CPUMEMUSAGE_ID/Instance")
+        if cpu_node:
+            # ElementTree elements do not provide getnext(), so iterate children in pairs:
+            children = list(cpu_node)
+            for i in range(0, len(children), 2):
+                name_elem = children[i]
+                value_elem = children[i + 1] if i + 1 < len(children) else None
+                pname = name_elem.text if name_elem is not None else None
+                pvalue = value_elem.text if value_elem is not None else None
+                if pname and pvalue and pname != "_InstID":
+                    router_details[pname] = (
+                        int(pvalue)
+                        if pvalue is not None and pvalue.isdigit()
+                        else pvalue
+                    )
+        # node OBJ_POWERONTIME_ID has PowerOnTime.
+        power_node = xml.find("OBJ_POWERONTIME_ID/Instance")
+        if power_node:
+            # ElementTree elements do not provide getnext(), so iterate children in pairs:
+            children = list(power_node)
+            for i in range(0, len(children), 2):
+                name_elem = children[i]
+                value_elem = children[i + 1] if i + 1 < len(children) else None
+                pname = name_elem.text if name_elem is not None else None
+                pvalue = value_elem.text if value_elem is not None else None
+                if pname and pvalue and pname != "_InstID":
+                    if pname == "PowerOnTime":
                         router_details[pname] = (
                             int(pvalue)
                             if pvalue is not None and pvalue.isdigit()
                             else pvalue
                         )
-            # node OBJ_POWERONTIME_ID has PowerOnTime.
-            power_node = xml.find("OBJ_POWERONTIME_ID/Instance")
-            if power_node:
-                # ElementTree elements do not provide getnext(), so iterate children in pairs:
-                children = list(power_node)
-                for i in range(0, len(children), 2):
-                    name_elem = children[i]
-                    value_elem = children[i + 1] if i + 1 < len(children) else None
-                    pname = name_elem.text if name_elem is not None else None
-                    pvalue = value_elem.text if value_elem is not None else None
-                    if pname and pvalue and pname != "_InstID":
-                        if pname == "PowerOnTime":
-                            router_details[pname] = (
-                                int(pvalue)
-                                if pvalue is not None and pvalue.isdigit()
-                                else pvalue
-                            )
-                        else:
-                            router_details[pname] = pvalue
-            return router_details
-
-        except Exception as e:
-            _LOGGER.error("Error fetching router details: %s", e)
-            return None
+                    else:
+                        router_details[pname] = pvalue
+        # node OBJ_DEVINFO_ID has the firmware and model names, which tell
+        # when the endpoints need probing again (see capabilities.py).
+        info_node = xml.find("OBJ_DEVINFO_ID/Instance")
+        if info_node is not None:
+            children = list(info_node)
+            for i in range(0, len(children) - 1, 2):
+                pname = children[i].text
+                pvalue = children[i + 1].text
+                if pname in ("SoftwareVer", "HardwareVer", "ModelName") and pvalue:
+                    router_details[pname] = pvalue
+        return router_details
 
     def get_wan_status(self) -> dict[str, Any]:
         """Fetch WAN status and return relevant attributes."""
         if not getattr(self, "query_wan_status", True):
             _LOGGER.debug("WAN status query disabled by client flag")
             return {}
+        if not self.supports("wan"):
+            return {}
 
         wan_attrs = {}
         try:
             # # Fetch MenuView first.
-            url = f"{self.base_url}/?_type={self.paths['type_first_request']}&_tag={self.paths['tag_wan_status_view']}&_={self.get_guid()}"
-            r = self.session.get(url, verify=self.verify_ssl, timeout=10)
+            r = self.session.get(
+                self._url("wan_view"), verify=self.verify_ssl, timeout=10
+            )
             r.raise_for_status()
             # Fetch MenuData.
-            url = f"{self.base_url}/?_type={self.paths['type_main_request']}&_tag={self.paths['tag_wan_status_data']}&_={self.get_guid()}"
-            r = self.session.get(url, verify=self.verify_ssl, timeout=10)
+            r = self.session.get(self._url("wan"), verify=self.verify_ssl, timeout=10)
             r.raise_for_status()
             self.log_request(r)
-            xml = ET.fromstring(r.text)
-            instances = xml.findall("ID_WAN_COMFIG/Instance")
-            # Check error in response.
-            error_str = xml.findtext("IF_ERRORSTR")
-            if error_str and error_str not in ("SUCC", "SUCCESS", "OK"):
-                _LOGGER.error("Router error: %s", error_str)
-                raise Exception(f"Router error: {error_str}")
+            wan_attrs = self._parse_wan_status(r.text)
+        except Exception as ex:
+            _LOGGER.warning(f"Failed to fetch WAN status: {ex}")
+        return wan_attrs
 
-            wan_node = None
-            for inst in instances:
-                for i in range(0, len(inst) // 2):
-                    pname = inst[i * 2].text
-                    pvalue = inst[i * 2 + 1].text
-                    if pname == "WANCName" and pvalue == "WAN_internet":
-                        wan_node = inst
-                        break
-                if wan_node:
+    def _parse_wan_status(self, text: str) -> dict[str, Any]:
+        """Parse the WAN status reply into WAN_* attributes."""
+        wan_attrs = {}
+        xml = ET.fromstring(text)
+        instances = xml.findall("ID_WAN_COMFIG/Instance")
+        # Check error in response.
+        error_str = xml.findtext("IF_ERRORSTR")
+        if error_str and error_str not in ("SUCC", "SUCCESS", "OK"):
+            _LOGGER.error("Router error: %s", error_str)
+            raise Exception(f"Router error: {error_str}")
+
+        wan_node = None
+        for inst in instances:
+            for i in range(0, len(inst) // 2):
+                pname = inst[i * 2].text
+                pvalue = inst[i * 2 + 1].text
+                if pname == "WANCName" and pvalue == "WAN_internet":
+                    wan_node = inst
                     break
-            if wan_node is None and instances:
-                wan_node = instances[0]
             if wan_node:
-                for i in range(0, len(wan_node) // 2):
-                    pname = wan_node[i * 2].text
-                    pvalue = wan_node[i * 2 + 1].text
-                    if pname == "UpTime":
-                        wan_attrs["WAN_uptime"] = int(pvalue)
-                    elif pname == "ConnError":
-                        wan_attrs["WAN_error_message"] = pvalue
-                    elif pname == "RemainLeaseTime":
-                        wan_attrs["WAN_remain_leasetime"] = int(pvalue)
-                    elif pname == "ConnStatus":
-                        wan_attrs["WAN_connected"] = pvalue == "Connected"
-        except Exception as ex:
-            _LOGGER.warning(f"Failed to fetch WAN status: {ex}")
+                break
+        if wan_node is None and instances:
+            wan_node = instances[0]
+        if wan_node:
+            for i in range(0, len(wan_node) // 2):
+                pname = wan_node[i * 2].text
+                pvalue = wan_node[i * 2 + 1].text
+                if pname == "UpTime":
+                    wan_attrs["WAN_uptime"] = int(pvalue)
+                elif pname == "ConnError":
+                    wan_attrs["WAN_error_message"] = pvalue
+                elif pname == "RemainLeaseTime":
+                    wan_attrs["WAN_remain_leasetime"] = int(pvalue)
+                elif pname == "ConnStatus":
+                    wan_attrs["WAN_connected"] = pvalue == "Connected"
         return wan_attrs
 
     def log_request(self, r):
@@ -738,8 +1106,142 @@ class zteClient:
         xml_response: str,
         node_name: str = "OBJ_WLAN_AD_ID",
         network_type: str = "WLAN",
-    ) -> list[dict[str, Any]]:
+    ) -> list[DeviceRecord]:
         """Parse the xml response and return a list of devices."""
+        if self.parse_mode == PARSE_MODE_TREE:
+            return self._parse_devices_tree(xml_response, node_name, network_type)
+        return self._parse_devices_stream(xml_response, node_name, network_type)
+
+    def _parse_devices_stream(
+        self,
+        xml_response: str,
+        node_name: str = "OBJ_WLAN_AD_ID",
+        network_type: str = "WLAN",
+    ) -> list[DeviceRecord]:
+        """Parse devices incrementally with an XMLPullParser.
+
+        Reads each Instance's ParaName/ParaValue pairs as they complete,
+        dispatches them through _DEVICE_FIELDS and discards the elements
+        straight away, so memory stays flat however many clients the
+        router reports. Produces the same records as _parse_devices_tree.
+        """
+        devices: list[DeviceRecord] = []
+        if not xml_response.strip():
+            _LOGGER.warning("Empty XML response received")
+            return devices
+
+        net_type = NetworkType(network_type)
+        fields = _DEVICE_FIELDS
+        wlanap_map: dict[str, str] = {}
+        parser = ET.XMLPullParser(("start", "end"))
+        stack: list[ET.Element] = []
+        # Texts of the direct children of the Instance being read.
+        texts: list[str | None] = []
+        instances = 0
+
+        try:
+            for offset in range(0, len(xml_response), _STREAM_CHUNK_SIZE):
+                parser.feed(xml_response[offset : offset + _STREAM_CHUNK_SIZE])
+                for event, elem in parser.read_events():
+                    if event == "start":
+                        if not stack and elem.tag != "ajax_response_xml_root":
+                            _LOGGER.warning("Unexpected XML root tag: %s", elem.tag)
+                            raise Exception("Invalid XML format")
+                        stack.append(elem)
+                        if len(stack) == 3:
+                            texts = []
+                        continue
+
+                    stack.pop()
+                    depth = len(stack)
+                    if depth == 3:
+                        texts.append(elem.text)
+                        continue
+                    if depth == 1:
+                        # Top-level node done: report errors, release it.
+                        if elem.tag == "IF_ERRORSTR":
+                            error_str = elem.text
+                            if error_str and error_str not in ("SUCC", "SUCCESS", "OK"):
+                                _LOGGER.warning("Router error: %s", error_str)
+                                raise Exception(f"Router error: {error_str}")
+                        stack[0].remove(elem)
+                        continue
+                    if depth != 2 or elem.tag != "Instance":
+                        continue
+
+                    parent_tag = stack[1].tag
+                    stack[1].remove(elem)
+                    if parent_tag == "OBJ_WLANAP_ID":
+                        ap_id = None
+                        essid = None
+                        for i in range(0, len(texts) - 1, 2):
+                            if texts[i] == "_InstID":
+                                ap_id = texts[i + 1]
+                            elif texts[i] == "ESSID":
+                                essid = texts[i + 1]
+                        if ap_id and essid:
+                            wlanap_map[ap_id] = essid
+                        continue
+                    if parent_tag != node_name:
+                        continue
+
+                    instances += 1
+                    if len(texts) % 2 != 0:
+                        _LOGGER.warning(
+                            "Unexpected device XML structure, child count: %d",
+                            len(texts),
+                        )
+                        continue
+                    device_info = DeviceRecord(network_type=net_type)
+                    for i in range(0, len(texts), 2):
+                        param_name = texts[i]
+                        param_value = texts[i + 1]
+                        if not param_name or not param_value:
+                            continue
+                        field = fields.get(param_name.strip())
+                        if field is None:
+                            continue
+                        attr, convert = field
+                        pvalue = param_value.strip()
+                        if convert is not None:
+                            pvalue = convert(pvalue)
+                        setattr(device_info, attr, pvalue)
+
+                    # Only add devices with valid MAC addresses
+                    if device_info.mac:
+                        devices.append(device_info)
+                    else:
+                        _LOGGER.debug(
+                            "Skipping device without MAC address: %s", device_info
+                        )
+            parser.close()
+            # Drain events produced by close() (none for well-formed input).
+            for _ in parser.read_events():
+                pass
+
+        except ET.ParseError as e:
+            _LOGGER.error("Failed to parse XML response: %s", e)
+            _LOGGER.debug("XML content: %s", xml_response[:500])
+            raise e
+
+        # Remap Port from WLAN AP map; the AP table may follow the devices.
+        if wlanap_map:
+            for device_info in devices:
+                port = device_info.port
+                if port and port in wlanap_map:
+                    device_info.port = wlanap_map[port]
+
+        _LOGGER.debug("Found %d device instances in XML", instances)
+        _LOGGER.debug("Parsed %d valid devices", len(devices))
+        return devices
+
+    def _parse_devices_tree(
+        self,
+        xml_response: str,
+        node_name: str = "OBJ_WLAN_AD_ID",
+        network_type: str = "WLAN",
+    ) -> list[DeviceRecord]:
+        """Parse the whole xml response as a tree (original parser)."""
         devices = []
 
         try:
@@ -775,18 +1277,9 @@ class zteClient:
             instances = xml.findall(f"{node_name}/Instance")
             _LOGGER.debug("Found %d device instances in XML", len(instances))
 
+            net_type = NetworkType(network_type)
             for device in instances:
-                device_info = {
-                    "Active": True,
-                    "IconType": None,
-                    "NetworkType": network_type,
-                    "MACAddress": "",
-                    "IPAddress": "",
-                    "HostName": "",
-                    "Port": "",  # LAN port or WLAN ESSID
-                    "LinkTime": "",
-                    "ConnectTime": "",
-                }
+                device_info = DeviceRecord(network_type=net_type)
 
                 # Parse device parameters
                 child_count = len(device)
@@ -805,43 +1298,43 @@ class zteClient:
                             pname = param_name.strip()
                             pvalue = param_value.strip()
                             if pname == "MACAddress":
-                                device_info["MACAddress"] = pvalue.upper()
+                                device_info.mac = pvalue.upper()
                             elif pname == "IPAddress":
-                                device_info["IPAddress"] = pvalue
+                                device_info.ip = pvalue
                             elif pname == "HostName":
-                                device_info["HostName"] = pvalue
+                                device_info.name = pvalue
                             elif pname == "IconType":
-                                device_info["IconType"] = pvalue
+                                device_info.icon_type = pvalue
                             elif pname == "Active":
-                                device_info["Active"] = pvalue.lower() in (
+                                device_info.active = pvalue.lower() in (
                                     "1",
                                     "true",
                                     "yes",
                                 )
                             elif pname == "LinkTime":
-                                device_info["LinkTime"] = pvalue
+                                device_info.link_time = pvalue
                             elif pname == "ConnectTime":
                                 # Parse pvalue 2025/11/17 Mon 14:23:45 into HA datetime ISO Format.
                                 try:
                                     dt = datetime.datetime.strptime(
                                         pvalue, "%Y/%m/%d %a %H:%M:%S"
                                     )
-                                    device_info["ConnectTime"] = dt.isoformat()
+                                    device_info.connect_time = dt.isoformat()
                                 except ValueError:
-                                    device_info["ConnectTime"] = pvalue
+                                    device_info.connect_time = pvalue
                             elif pname == "AliasName":  # Contains the LAN port.
-                                device_info["Port"] = pvalue
+                                device_info.port = pvalue
 
                     except (IndexError, AttributeError) as e:
                         _LOGGER.warning("Error parsing device parameter %d: %s", i, e)
                         continue
 
                 # Remap Port from WLAN AP map
-                if device_info["Port"] and device_info["Port"] in wlanap_map:
-                    device_info["Port"] = wlanap_map[device_info["Port"]]
+                if device_info.port and device_info.port in wlanap_map:
+                    device_info.port = wlanap_map[device_info.port]
 
                 # Only add devices with valid MAC addresses
-                if device_info["MACAddress"]:
+                if device_info.mac:
                     devices.append(device_info)
                 else:
                     _LOGGER.debug(
@@ -864,8 +1357,9 @@ class zteClient:
                 return False
 
             # First load menuView url https://10.0.0.1/?_type=menuView&_tag=rebootAndReset&Menu3Location=0&_=1756621946066
-            menu_view_url = f"{self.base_url}/?_type=menuView&_tag=rebootAndReset&Menu3Location=0&_={self.get_guid()}"
-            r = self.session.get(menu_view_url, verify=self.verify_ssl, timeout=30)
+            r = self.session.get(
+                self._url("reboot_view"), verify=self.verify_ssl, timeout=30
+            )
             self.log_request(r)
             r.raise_for_status()
 
@@ -876,63 +1370,18 @@ class zteClient:
                 _LOGGER.error(self.statusmsg)
                 return False
 
-            post_data = f"IF_ACTION=Restart&Btn_restart=&_sessionTOKEN={session_token}"
-            digest_str = hashlib.sha256(post_data.encode("utf-8")).hexdigest()
-            # F6600P uses a 4096-bit RSA key, other models use 2048-bit
-            if self.model == "F6600P":
-                pub_key_pem = (
-                    "-----BEGIN PUBLIC KEY-----\n"
-                    "MIICIjANBgkqhkiG9w0BAQEFAAOCAg8AMIICCgKCAgEAwlo/vZBnSJ2MyJ0dbNcw\n"
-                    "DvzPqBN+O/BPvLX93GIJVSZmquJHD9X6Xn6VYeM9mRKzjEbXPlv73Dj/gjjtNj9j\n"
-                    "Tq2QVyW2Sd4ZkY9e3h1ALCCCfkbjnmSqedyrcvXriTeW+J65jhBje6lTJbafmC5q\n"
-                    "bGiItjt0OeOkT+Vb4S7hYPSWIjeYYBh+7Y/fg25Rt2a+RgC8dahvJ3ttB1LHXADr\n"
-                    "oCm6q7G+lpbRAlpC8jjc0rZdS0c6HcBoYgzW8vxjj2fTuFy3CZZTrpPyTv/C8K6B\n"
-                    "hjTnjRe6ocgFVyQ0RIYfx2hxSJcuauR57OzfMzlgFQv3RAXguDZtuVUFLO2sAiwL\n"
-                    "ELph3Acfy9Eh58SHcswZvsOSXY0JNb0XeRM9gxpntLRfM6TB7f9hYtYTDw5oKdyN\n"
-                    "BY+nnEa/IpBUjndGDrSs3Z4BxRbYcJEwkKQZkvw/5TpQYbkD6sTRVSlZPaXSjeCl\n"
-                    "0hsLCttqwJqRZcjbWXrINBYFw8PYE14Xr9BCyPgqocdQh7FgvasVgG6u5mLR1PBZ\n"
-                    "o4EFF/LdY0yvMG5rl9egBk1XD/UMayhRtmSQEUzYt3eEWLBbqJB6MbVJ2ygcv5EL\n"
-                    "ReDY0SWXw1PIEbHeP51A/MyB6kwSgZwdoQW3JiaPnGHMaE0NqfAYPNiGJLMsmvT/\n"
-                    "rNUI/8iSCW+WvSzx9tByUxsCAwEAAQ==\n"
-                    "-----END PUBLIC KEY-----"
-                )
-            else:
-                pub_key_pem = (
-                    "-----BEGIN PUBLIC KEY-----\n"
-                    "MIIBIjANBgkqhkiG9w0BAQEFAAOCAQ8AMIIBCgKCAQEAodPTerkUVCYmv28SOfRV\n"
-                    "7UKHVujx/HjCUTAWy9l0L5H0JV0LfDudTdMNPEKloZsNam3YrtEnq6jqMLJV4ASb\n"
-                    "1d6axmIgJ636wyTUS99gj4BKs6bQSTUSE8h/QkUYv4gEIt3saMS0pZpd90y6+B/9\n"
-                    "hZxZE/RKU8e+zgRqp1/762TB7vcjtjOwXRDEL0w71Jk9i8VUQ59MR1Uj5E8X3WIc\n"
-                    "fYSK5RWBkMhfaTRM6ozS9Bqhi40xlSOb3GBxCmliCifOJNLoO9kFoWgAIw5hkSIb\n"
-                    "GH+4Csop9Uy8VvmmB+B3ubFLN35qIa5OG5+SDXn4L7FeAA5lRiGxRi8tsWrtew8w\n"
-                    "nwIDAQAB\n"
-                    "-----END PUBLIC KEY-----"
-                )
-
-            public_key = serialization.load_pem_public_key(pub_key_pem.encode("utf-8"))
-            encrypted_digest = public_key.encrypt(
-                digest_str.encode("utf-8"), padding.PKCS1v15()
-            )
-            check_header = base64.b64encode(encrypted_digest).decode("utf-8")
-
-            headers = {
-                "Check": check_header,
-                "Content-Type": "application/x-www-form-urlencoded",
-            }
+            post_data, headers = self._build_reboot_request(session_token)
 
-            url = f"{self.base_url}/?_type=menuData&_tag=devmgr_restartmgr_lua.lua&_={self.get_guid()}"
             r = self.session.post(
-                url, data=post_data, headers=headers, verify=self.verify_ssl, timeout=30
+                self._url("reboot"),
+                data=post_data,
+                headers=headers,
+                verify=self.verify_ssl,
+                timeout=30,
             )
             self.log_request(r)
             r.raise_for_status()
-            # Check error in response.
-            xml = ET.fromstring(r.content)
-            error_str = xml.findtext("IF_ERRORSTR")
-            if error_str and error_str not in ("SUCC", "SUCCESS", "OK"):
-                _LOGGER.error("Router error: %s", error_str)
-                _LOGGER.debug("Reboot response XML: %s", r.text)
-                raise Exception(f"Router error: {error_str}")
+            self._check_reboot_response(r.content)
 
             self.statusmsg = "Reboot command sent successfully."
             return True
@@ -942,3 +1391,29 @@ class zteClient:
             return False
         finally:
             self.logout()
+
+    def _build_reboot_request(self, session_token: str) -> tuple[str, dict[str, str]]:
+        """Return the signed ``(post_data, headers)`` for a restart request."""
+        post_data = f"IF_ACTION=Restart&Btn_restart=&_sessionTOKEN={session_token}"
+        digest_str = hashlib.sha256(post_data.encode("utf-8")).hexdigest()
+        public_key = _reboot_public_key(self.profile.reboot_key)
+        encrypted_digest = public_key.encrypt(
+            digest_str.encode("utf-8"), padding.PKCS1v15()
+        )
+        check_header = base64.b64encode(encrypted_digest).decode("utf-8")
+
+        headers = {
+            "Check": check_header,
+            "Content-Type": "application/x-www-form-urlencoded",
+        }
+        return post_data, headers
+
+    def _check_reboot_response(self, content: bytes | str) -> None:
+        """Raise if the restart reply carries a router error."""
+        # Check error in response.
+        xml = ET.fromstring(content)
+        error_str = xml.findtext("IF_ERRORSTR")
+        if error_str and error_str not in ("SUCC", "SUCCESS", "OK"):
+            _LOGGER.error("Router error: %s", error_str)
+            _LOGGER.debug("Reboot response XML: %s", content)
+            raise Exception(f"Router error: {error_str}")